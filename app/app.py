@@ -2,14 +2,38 @@
 
 import reflex as rx
 
-# Pages
-from app.pages.landing import landing_page
-from app.pages.dashboard import dashboard_page
-from app.pages.admin import admin_page
-from app.pages.settings import settings_page
+# Pages (registered lazily; page modules load when first evaluated)
+from app.pages.registry import register_pages
+from app.pages.dashboard.stats import register_stats_jobs
+from app.pages.settings.persistence import settings_writer
+
+# Components
+from app.components.shared import ui_prefs_script
 
 # Routers
-from app.server.api import register_health_routes
+from app.server.api import (
+    register_health_routes,
+    register_metrics_routes,
+    register_profiling_routes,
+    register_session_routes,
+    register_state_memory_routes,
+)
+from app.server.api.routes.v1 import (
+    agent_queue,
+    register_agent_routes,
+    register_db_routes,
+    register_file_routes,
+    register_tool_routes,
+    tool_pool,
+)
+
+# Services
+from app.server.utils import appwrite_lifespan, ordered_lifespan
+from app.server.utils.asset_cache import register_asset_cache_jobs
+from app.server.utils.metrics import MetricsMiddleware, state_delta_metrics
+from app.server.utils.realtime import realtime_bridge
+from app.server.utils.scheduler import scheduler
+from app.server.utils.state_memory import session_activity, state_evictor
 
 # Config
 from app.config import settings
@@ -21,17 +45,49 @@ def create_app():
         stylesheets=[
             "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap"
         ],
+        # Restores client-side UI preferences before first paint.
+        head_components=[ui_prefs_script()],
     )
 
     # Attach custom API routes to Reflex's internal Starlette app.
     register_health_routes(app._api)
+    register_state_memory_routes(app._api)
+    register_agent_routes(app._api)
+    register_tool_routes(app._api)
+    register_file_routes(app._api)
+    register_db_routes(app._api)
+    register_metrics_routes(app._api)
+    register_profiling_routes(app._api)
+    register_session_routes(app._api)
+
+    # Request count/latency for every API route, exposed at /api/metrics.
+    app._api.add_middleware(MetricsMiddleware)
 
+    # Track per-session activity for idle-state eviction, and delta sizes.
+    app.add_middleware(session_activity)
+    app.add_middleware(state_delta_metrics)
+
+    # Periodic jobs; shared work runs only on the worker holding the lease.
+    register_stats_jobs(scheduler)
+    register_asset_cache_jobs(scheduler)
+
+    # Shared services live for the whole app lifespan; they start in this
+    # order and stop in reverse, so dependents shut down before the client.
+    app.register_lifespan_task(
+        ordered_lifespan(
+            settings.lifespan,
+            appwrite_lifespan,
+            realtime_bridge.lifespan,
+            scheduler.lifespan,
+            settings_writer.lifespan,
+            state_evictor.lifespan,
+            agent_queue.lifespan,
+            tool_pool.lifespan,
+        )
+    )
 
     # Register pages
-    app.add_page(landing_page, route="/", title="Landing")
-    app.add_page(dashboard_page, route="/dashboard", title="Dashboard")
-    app.add_page(admin_page, route="/admin", title="Admin")
-    app.add_page(settings_page, route="/settings", title="Settings")
+    register_pages(app)
 
     return app  
 
@@ -1,7 +1,23 @@
 """Shared components exports."""
 
+from app.components.shared.activity import activity_feed
 from app.components.shared.header import header
+from app.components.shared.layout import app_shell
 from app.components.shared.sidebar import sidebar
 from app.components.shared.theme_toggle import theme_toggle
+from app.components.shared.ui_prefs import (
+    toggle_sidebar,
+    ui_prefs_script,
+    when_collapsed,
+)
 
-__all__ = ["header", "sidebar", "theme_toggle"]
+__all__ = [
+    "activity_feed",
+    "app_shell",
+    "header",
+    "sidebar",
+    "theme_toggle",
+    "toggle_sidebar",
+    "ui_prefs_script",
+    "when_collapsed",
+]
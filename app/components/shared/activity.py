@@ -0,0 +1,33 @@
+"""Live activity feed fed by the realtime bridge."""
+
+import reflex as rx
+
+
+def activity_feed(title: str, rows: rx.Var[list[dict[str, str]]]) -> rx.Component:
+    """Card listing recent realtime events, newest first."""
+    return rx.box(
+        rx.flex(
+            rx.icon("radio", size=16, class_name="light:text-gray-600 dark:text-gray-400"),
+            rx.text(title, class_name="text-sm font-semibold light:text-gray-900 dark:text-white"),
+            gap="2",
+            align="center",
+            class_name="mb-2",
+        ),
+        rx.cond(
+            rows.length() > 0,
+            rx.foreach(rows, _activity_row),
+            rx.text("Waiting for events…", class_name="text-sm light:text-gray-500 dark:text-gray-400"),
+        ),
+        class_name="rounded-md border light:border-gray-500 dark:border-black-900 px-4 py-3 mt-2",
+    )
+
+
+def _activity_row(row: rx.Var[dict[str, str]]) -> rx.Component:
+    return rx.flex(
+        rx.text(row["time"], class_name="text-xs font-mono light:text-gray-500 dark:text-gray-400 w-16 shrink-0"),
+        rx.badge(row["action"], variant="soft", size="1"),
+        rx.text(row["resource"], class_name="text-xs truncate light:text-gray-700 dark:text-gray-300"),
+        gap="2",
+        align="center",
+        class_name="py-1",
+    )
@@ -3,10 +3,10 @@
 import reflex as rx
 
 from app.components.shared.theme_toggle import theme_toggle
-from app.states.base import BaseState
+from app.components.shared.ui_prefs import toggle_sidebar, when_collapsed
 
 
-def header(title: str = "Dashboard") -> rx.Component:
+def header(title: str | rx.Var[str] = "Dashboard") -> rx.Component:
     """Page header with title, sidebar toggle, and theme toggle."""
     return rx.box(
         rx.flex(
@@ -14,15 +14,16 @@ def header(title: str = "Dashboard") -> rx.Component:
                 # Header - Left side - Sidebar toggle
                 rx.button(
                     rx.icon(
-                        rx.cond(
-                            BaseState.sidebar_collapsed,
-                            "panel-left-open",
-                            "panel-left-close",
-                        ),
+                        "panel-left-close",
                         size=20,
-                        class_name="overflow-visible",
+                        class_name=when_collapsed("overflow-visible", "hidden"),
                     ),
-                    on_click=BaseState.toggle_sidebar,
+                    rx.icon(
+                        "panel-left-open",
+                        size=20,
+                        class_name=when_collapsed("overflow-visible hidden", "block"),
+                    ),
+                    on_click=toggle_sidebar(),
                     variant="ghost",
                     class_name="pl-2 light:text-gray-600 dark:text-gray-400 light:hover:bg-gray-100 dark:hover:bg-gray-800",
                 ),
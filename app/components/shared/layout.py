@@ -0,0 +1,34 @@
+"""Shared application layout shell."""
+
+import reflex as rx
+
+from app.components.shared.header import header
+from app.components.shared.sidebar import sidebar
+from app.components.shared.ui_prefs import when_collapsed
+
+
+# Memoized: the sidebar and header trees are compiled once into the shared
+# components module, so each page only emits `<AppSidebar/>` and
+# `<AppHeader title=.../>` around its own content.
+@rx.memo
+def app_sidebar() -> rx.Component:
+    """Sidebar navigation; the active item follows the browser route."""
+    return sidebar()
+
+
+@rx.memo
+def app_header(title: rx.Var[str]) -> rx.Component:
+    """Top bar with the page title."""
+    return header(title)
+
+
+def app_shell(*children: rx.Component, title: str) -> rx.Component:
+    """Sidebar, header and a content column holding `children`."""
+    return rx.fragment(
+        app_sidebar(),
+        rx.box(
+            app_header(title=title),
+            *children,
+            class_name=when_collapsed("ml-64 transition-all duration-300 ease-in-out", "ml-16"),
+        ),
+    )
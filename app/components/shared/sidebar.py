@@ -1,12 +1,30 @@
 """Collapsible sidebar navigation component."""
 
 import reflex as rx
+from reflex.vars import Var, VarData
 
-from app.states.base import BaseState
+from app.components.shared.ui_prefs import when_collapsed
 
+# Current route from React Router, so the active item is derived in the
+# browser and the nav tree is identical (and memoizable) across pages.
+current_path = Var(
+    _js_expr="currentPathname",
+    _var_type=str,
+    _var_data=VarData(
+        imports={"react-router": "useLocation"},
+        hooks={"const { pathname: currentPathname } = useLocation();": None},
+    ),
+).to(str)
 
-def nav_item(name: str, icon_name: str, href: str, is_active: bool = False) -> rx.Component:
-    """Navigation item with icon and label."""
+
+def is_active_route(href: str) -> Var[bool]:
+    """True when the current route is `href` or below it."""
+    return (current_path == href) | current_path.startswith(f"{href}/")
+
+
+def nav_item(name: str, icon_name: str, href: str) -> rx.Component:
+    """Navigation item with icon and label, highlighted on its own route."""
+    is_active = is_active_route(href)
     return rx.link(
         rx.flex(
             # Sidebar Link - Icon (wrapped to normalize alignment across glyphs)
@@ -34,15 +52,13 @@ def nav_item(name: str, icon_name: str, href: str, is_active: bool = False) -> r
                     ),
                 ),
                 # Sidebar Link - Label - Collapsed state
-                class_name=rx.cond(
-                    BaseState.sidebar_collapsed,
-                    "max-w-0 opacity-0 -translate-x-1 overflow-hidden whitespace-nowrap transition-all duration-300 ease-in-out",
+                class_name=when_collapsed(
                     "max-w-[160px] opacity-100 translate-x-0 overflow-hidden whitespace-nowrap transition-all duration-300 ease-in-out",
+                    "max-w-0 opacity-0 -translate-x-1",
                 ),
             ),
             align="center",
-            gap=rx.cond(BaseState.sidebar_collapsed, "0", "3"),
-            class_name=rx.cond(BaseState.sidebar_collapsed, "justify-center", "justify-start"),
+            class_name=when_collapsed("gap-3 justify-start", "gap-0 justify-center"),
         ),
         href=href,
 
@@ -64,10 +80,9 @@ def sidebar_section(title: str, children: list[rx.Component]) -> rx.Component:
                 title,
                 class_name="text-xs font-semibold text-gray-400 dark:text-gray-500 uppercase tracking-wider mb-1 pl-5 pr-3",
             ),
-            class_name=rx.cond(
-                BaseState.sidebar_collapsed,
-                "max-h-0 opacity-0 overflow-hidden transition-all duration-300 ease-in-out",
+            class_name=when_collapsed(
                 "max-h-8 opacity-100 overflow-hidden transition-all duration-300 ease-in-out",
+                "max-h-0 opacity-0",
             ),
         ),
         # Children
@@ -95,29 +110,22 @@ def sidebar_logo() -> rx.Component:
                     "Reflex App",
                     class_name="text-lg pl-2 font-bold leading-none light:text-gray-900 dark:text-white",
                 ),
-                class_name=rx.cond(
-                    BaseState.sidebar_collapsed,
-                    "max-w-0 opacity-0 -translate-x-1 overflow-hidden whitespace-nowrap transition-all duration-300 ease-in-out",
+                class_name=when_collapsed(
                     "max-w-[250px] opacity-100 translate-x-0 overflow-hidden whitespace-nowrap transition-all duration-300 ease-in-out",
+                    "max-w-0 opacity-0 -translate-x-1",
                 ),
             ),
             align="center",
-            gap=rx.cond(BaseState.sidebar_collapsed, "0", "3"),
-            class_name=rx.cond(
-                BaseState.sidebar_collapsed,
-                "w-full justify-center",
-                "w-full justify-start",
-            ),
+            class_name=when_collapsed("w-full gap-3 justify-start", "gap-0 justify-center"),
         ),
-        class_name=rx.cond(
-            BaseState.sidebar_collapsed,
-            "h-14 px-0 flex items-center border-b light:border-gray-200 dark:border-black-900",
+        class_name=when_collapsed(
             "h-14 px-4 flex items-center border-b light:border-gray-200 dark:border-black-900",
+            "px-0",
         ),
     )
 
 
-def sidebar(current_page: str = "dashboard") -> rx.Component:
+def sidebar() -> rx.Component:
     """Collapsible sidebar navigation."""
     return rx.box(
         rx.flex(
@@ -128,8 +136,8 @@ def sidebar(current_page: str = "dashboard") -> rx.Component:
             sidebar_section(
                 "Main",
                 [
-                    nav_item("Dashboard", "layout-dashboard", "/dashboard", current_page == "dashboard"),
-                    nav_item("Admin", "shield", "/admin", current_page == "admin"),
+                    nav_item("Dashboard", "layout-dashboard", "/dashboard"),
+                    nav_item("Admin", "shield", "/admin"),
                 ],
             ),
 
@@ -137,16 +145,15 @@ def sidebar(current_page: str = "dashboard") -> rx.Component:
             sidebar_section(
                 "System",
                 [
-                    nav_item("Settings", "settings", "/settings", current_page == "settings"),
+                    nav_item("Settings", "settings", "/settings"),
                 ],
             ),
 
             direction="column",
             class_name="h-full text-sm",
         ),
-        class_name=rx.cond(
-            BaseState.sidebar_collapsed,
-            "fixed left-0 top-0 h-screen w-16 light:bg-white/80 dark:bg-gray-900/80 border-r light:border-gray-200 dark:border-black-900 transition-all duration-300 ease-in-out z-20",
+        class_name=when_collapsed(
             "fixed left-0 top-0 h-screen w-64 light:bg-white/80 dark:bg-gray-900/80 border-r light:border-gray-200 dark:border-black-900 transition-all duration-300 ease-in-out z-20",
+            "w-16",
         ),
     )
@@ -0,0 +1,51 @@
+"""Client-side UI preferences.
+
+Purely presentational flags (like the collapsed sidebar) live on the
+`<html>` element as `data-*` attributes and in `localStorage`, never in
+server state. Toggling runs entirely in the browser, and Tailwind variants
+keyed on the attribute restyle the page without any websocket traffic.
+"""
+
+import json
+
+import reflex as rx
+
+from app.config import settings
+
+SIDEBAR_STORAGE_KEY = "ui.sidebar"
+SIDEBAR_ATTR = "sidebar"
+
+# Tailwind arbitrary variant: applies when <html data-sidebar="collapsed">.
+_COLLAPSED_VARIANT = f"[[data-{SIDEBAR_ATTR}=collapsed]_&]:"
+
+
+def when_collapsed(expanded: str, collapsed: str) -> str:
+    """Class string using `expanded` normally and `collapsed` when the sidebar is collapsed."""
+    return " ".join([expanded, *(_COLLAPSED_VARIANT + cls for cls in collapsed.split())])
+
+
+def _set_sidebar_js(value: str) -> str:
+    return (
+        f"document.documentElement.dataset.{SIDEBAR_ATTR} = {value};"
+        f"localStorage.setItem({json.dumps(SIDEBAR_STORAGE_KEY)}, document.documentElement.dataset.{SIDEBAR_ATTR});"
+    )
+
+
+def toggle_sidebar() -> rx.event.EventSpec:
+    """Client-only event that flips the sidebar between collapsed and expanded."""
+    return rx.call_script(
+        _set_sidebar_js(
+            f"document.documentElement.dataset.{SIDEBAR_ATTR} === 'collapsed' ? 'expanded' : 'collapsed'"
+        )
+    )
+
+
+def ui_prefs_script() -> rx.Component:
+    """Inline `<head>` script restoring stored preferences before first paint."""
+    default = "collapsed" if settings.sidebar_default_collapsed else "expanded"
+    return rx.el.script(
+        "try{"
+        f"document.documentElement.dataset.{SIDEBAR_ATTR}="
+        f"localStorage.getItem({json.dumps(SIDEBAR_STORAGE_KEY)})||{json.dumps(default)};"
+        f"}}catch(e){{document.documentElement.dataset.{SIDEBAR_ATTR}={json.dumps(default)};}}"
+    )
@@ -1,13 +1,28 @@
-"""Application configuration using Pydantic Settings."""
+"""Application configuration using Pydantic Settings.
+
+`settings` is a `SettingsProvider`: attribute reads go to the current
+immutable `Settings` snapshot. The provider's lifespan polls `.env.local`;
+when the file changes it validates a whole new snapshot, swaps it in with a
+single assignment and notifies subscribers of the fields that changed. An
+invalid file is logged and ignored, so the running snapshot stays intact.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import inspect
+import logging
+import os
+from collections.abc import AsyncIterator, Callable
 from typing import Any, ClassVar
 
 import reflex as rx
-from pydantic import Field
+from pydantic import Field, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -16,6 +31,7 @@ class Settings(BaseSettings):
         env_file=".env.local",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     # App
@@ -32,6 +48,119 @@ class Settings(BaseSettings):
     appwrite_database_id: str | None = Field(default=None, validation_alias="APPWRITE_DATABASE_ID")
     appwrite_storage_id: str | None = Field(default=None, validation_alias="APPWRITE_STORAGE_ID")
 
+    # Appwrite client pool
+    appwrite_max_connections: int = 100
+    appwrite_max_keepalive: int = 20
+    appwrite_keepalive_expiry: float = 30.0
+    appwrite_connect_timeout: float = 5.0
+    appwrite_timeout: float = 10.0
+    appwrite_max_retries: int = 3
+    appwrite_backoff_base: float = 0.1
+    appwrite_backoff_max: float = 2.0
+
+    # Health checks
+    readiness_cache_ttl: float = 2.0
+    readiness_probe_timeout: float = 2.0
+
+    # Dashboard stats
+    dashboard_stats_interval: float = 30.0
+    dashboard_stats_window: float = 86400.0
+    dashboard_active_window: float = 900.0
+    dashboard_stats_sync_interval: float = 2.0  # workers pick up the leader's snapshot
+
+    # Admin
+    admin_users_page_size: int = 50
+
+    # Settings persistence
+    settings_collection_id: str = "user_settings"
+    settings_write_debounce: float = 2.0
+    settings_write_max_delay: float = 10.0
+    settings_write_batch_size: int = 100
+    settings_write_concurrency: int = 8
+    settings_write_max_attempts: int = 10
+
+    # Database read cache (TTL 0 disables)
+    query_cache_ttl: float = 30.0
+    query_cache_negative_ttl: float = 5.0
+    query_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Realtime bridge (one Appwrite Realtime socket per process)
+    realtime_session: str | None = None  # session secret; unset connects as a guest
+    realtime_heartbeat: float = 20.0
+    realtime_resubscribe_delay: float = 0.5
+    realtime_queue_size: int = 100
+    realtime_dashboard_channels: list[str] = ["documents", "files"]
+    realtime_admin_channels: list[str] = ["documents", "files", "teams", "memberships", "executions"]
+
+    # Bulk NDJSON export/import (/api/v1/db)
+    db_export_page_size: int = 500
+    db_import_batch_size: int = 100
+    db_import_concurrency: int = 4
+    db_import_max_line_bytes: int = 1024 * 1024
+
+    # Session state memory
+    state_idle_ttl: float = 1800.0
+    state_eviction_interval: float = 60.0
+    state_max_sessions: int = 0  # 0 = unlimited
+
+    # Agent jobs
+    agent_workers: int = 4
+    agent_queue_size: int = 100
+    agent_tenant_limit: int = 2
+    agent_event_buffer: int = 256
+    agent_detach_timeout: float = 300.0
+    agent_job_ttl: float = 3600.0
+
+    # Tool execution
+    tool_pool_workers: int = 0  # 0 = one per CPU core
+    tool_max_tasks_per_worker: int = 500
+    tool_default_timeout: float = 30.0
+    tool_shm_threshold: int = 1024 * 1024
+    tool_caller_limit: int = 4  # calls in flight per user
+
+    # Admin API (Bearer token for /api/admin/*; unset disables those routes)
+    admin_api_token: str | None = Field(default=None, validation_alias="ADMIN_API_TOKEN")
+
+    # Session verification (X-Appwrite-JWT). With the self-hosted server's
+    # _APP_OPENSSL_KEY_V1 tokens are checked locally; unset asks Appwrite on a miss.
+    auth_jwt_secret: str | None = Field(default=None, validation_alias="APPWRITE_JWT_SECRET")
+    auth_cache_size: int = 10_000
+    auth_clock_leeway: float = 5.0
+    auth_token_max_age: float = 900.0  # Appwrite's JWT lifetime
+
+    # Handler profiling
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.01
+    profiling_mode: str = "stack"  # "stack" (folded stacks) or "cprofile" (.prof)
+    profiling_interval: float = 0.001
+    profiling_dir: str = ".profiles"
+    profiling_keep: int = 50
+
+    # Startup (scripts/benchmarks/startup.py fails above this)
+    startup_budget_ms: float = 4000.0
+
+    # Load test (scripts/benchmarks/load_test.py fails past these at any session count)
+    load_test_event_p99_ms: float = 1000.0
+    load_test_http_p99_ms: float = 1000.0
+    load_test_rss_per_session_kb: float = 512.0
+    load_test_max_error_rate: float = 0.0
+
+    # Frontend build
+    compile_cache_dir: str = ".compile_cache"
+
+    # Derived asset cache (storage previews)
+    asset_cache_dir: str = ".asset_cache"
+    asset_cache_max_bytes: int = 512 * 1024 * 1024
+    asset_cache_trim_interval: float = 300.0
+
+    # Background jobs (leader-only jobs run on the worker holding scheduler_dir/leader.lock)
+    scheduler_enabled: bool = True
+    scheduler_dir: str = ".scheduler"
+    scheduler_lease_interval: float = 5.0
+    scheduler_job_timeout: float = 300.0
+
+    # Config reload (polls the env file; 0 disables)
+    settings_reload_interval: float = 2.0
 
     # UI Defaults
     sidebar_default_collapsed: bool = False
@@ -45,5 +174,117 @@ class Settings(BaseSettings):
     )
 
 
+Subscriber = Callable[[Settings, Settings], Any]
+
+
+class SettingsProvider:
+    """Holds the current `Settings` snapshot and swaps it on reload.
+
+    The snapshot's field values are installed as the provider's instance
+    `__dict__` with a single assignment, so `provider.x` is a plain attribute
+    read with no lock, and a reader never sees a mix of old and new values.
+    Anything else (methods, class variables) is looked up on `current`. Code
+    that needs several fields to agree across an `await` should read
+    `provider.current` once and use that snapshot.
+    """
+
+    __slots__ = ("__dict__", "_factory", "_subscribers")
+
+    current: Settings
+    version: int
+
+    def __init__(self, factory: Callable[[], Settings] = Settings) -> None:
+        self._factory = factory
+        self._subscribers: list[tuple[frozenset[str] | None, Subscriber]] = []
+        self._install(factory(), version=1)
+
+    def _install(self, snapshot: Settings, version: int) -> None:
+        self.__dict__ = {**snapshot.__dict__, "current": snapshot, "version": version}
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "current":  # not installed yet
+            raise AttributeError(name)
+        return getattr(self.current, name)
+
+    @property
+    def env_file(self) -> str | None:
+        env_file = Settings.model_config.get("env_file")
+        return env_file if isinstance(env_file, str) else None
+
+    def subscribe(self, callback: Subscriber, *fields: str) -> Callable[[], None]:
+        """Call `callback(old, new)` after a reload that changes any of `fields`.
+
+        With no fields the callback runs on every effective reload. It may
+        be a coroutine function. Returns a function that unsubscribes.
+        """
+        entry = (frozenset(fields) or None, callback)
+        self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            with contextlib.suppress(ValueError):
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    async def reload(self) -> frozenset[str]:
+        """Re-read the environment and swap in the new snapshot.
+
+        Returns the names of the fields that changed (empty if none did, or
+        if the new values failed validation).
+        """
+        try:
+            new = self._factory()
+        except ValidationError as e:
+            logger.error("Ignoring invalid settings reload:\n%s", e)
+            return frozenset()
+        old = self.current
+        changed = frozenset(
+            name for name in type(new).model_fields if getattr(new, name) != getattr(old, name)
+        )
+        if not changed:
+            return changed
+        self._install(new, self.version + 1)
+        logger.info("Settings reloaded; changed: %s", ", ".join(sorted(changed)))
+        for fields, callback in list(self._subscribers):
+            if fields is not None and not fields & changed:
+                continue
+            try:
+                result = callback(old, new)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Settings subscriber %r failed", callback)
+        return changed
+
+    def _env_stamp(self) -> tuple[float, int] | None:
+        try:
+            stat = os.stat(self.env_file) if self.env_file else None
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size) if stat else None
+
+    async def watch(self) -> None:
+        """Reload whenever the env file's mtime or size changes."""
+        stamp = self._env_stamp()
+        while (interval := self.current.settings_reload_interval) > 0:
+            await asyncio.sleep(interval)
+            if (current := self._env_stamp()) != stamp:
+                stamp = current
+                await self.reload()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Watch the env file for the app's lifetime."""
+        if self.current.settings_reload_interval <= 0:
+            yield
+            return
+        task = asyncio.create_task(self.watch(), name="settings_watcher")
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
 
-settings = Settings()
+settings = SettingsProvider()
@@ -1,6 +1,10 @@
-"""Admin page exports."""
+"""Admin page exports (resolved on first access; see app.pages.registry)."""
 
-from app.pages.admin.index import admin_page
-from app.pages.admin.state import AdminState
+from app.pages.registry import lazy_exports
 
-__all__ = ["admin_page", "AdminState"]
+__getattr__ = lazy_exports(
+    __name__,
+    {"admin_page": "index", "admin_users_page": "users", "AdminState": "state"},
+)
+
+__all__ = ["admin_page", "admin_users_page", "AdminState"]
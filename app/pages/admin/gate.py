@@ -0,0 +1,41 @@
+"""Admin token prompt shown until a session unlocks the admin pages."""
+
+import reflex as rx
+
+from app.pages.admin.state import AdminState
+
+
+def admin_gate(content: rx.Component) -> rx.Component:
+    """`content` once this session has entered the admin token; the token form until then."""
+    return rx.cond(AdminState.admin_unlocked, content, _unlock_form())
+
+
+def _unlock_form() -> rx.Component:
+    """Password field for `ADMIN_API_TOKEN`."""
+    return rx.box(
+        rx.form(
+            rx.flex(
+                rx.flex(
+                    rx.icon("lock", size=20, class_name="text-gray-600 dark:text-gray-400"),
+                    rx.text("Admin access", class_name="font-semibold text-gray-900 dark:text-white"),
+                    gap="2",
+                    align="center",
+                ),
+                rx.text(
+                    "Enter the admin API token to continue.",
+                    class_name="text-sm text-gray-500 dark:text-gray-400",
+                ),
+                rx.input(name="token", type="password", placeholder="Admin API token", required=True),
+                rx.cond(
+                    AdminState.admin_error != "",
+                    rx.text(AdminState.admin_error, class_name="text-sm text-red-500"),
+                ),
+                rx.button("Unlock", type="submit"),
+                direction="column",
+                gap="3",
+            ),
+            on_submit=AdminState.unlock_admin,
+            reset_on_submit=True,
+        ),
+        class_name="m-1 max-w-md bg-white dark:bg-gray-800 rounded-lg border border-gray-200 dark:border-gray-700 px-6 py-5",
+    )
@@ -2,78 +2,80 @@
 
 import reflex as rx
 
-from app.components.shared import header, sidebar
-from app.states.base import BaseState
+from app.components.shared import activity_feed, app_shell
+from app.pages.admin.gate import admin_gate
+from app.pages.admin.state import AdminState
 
 
 def admin_page() -> rx.Component:
     """Admin dashboard page."""
     return rx.box(
-        sidebar(current_page="admin"),
-        rx.box(
-            header("Admin"),
+        app_shell(
             # Main content
+            admin_gate(_overview()),
+            title="Admin",
+        ),
+        class_name="min-h-screen bg-white dark:bg-gray-950",
+        style={"font-size": "14px", "overflow": "hidden"},
+    )
+
+
+def _overview() -> rx.Component:
+    """Header, quick links and the live events feed."""
+    return rx.box(
+        rx.flex(
+            # Admin header card
             rx.box(
                 rx.flex(
-                    # Admin header card
                     rx.box(
-                        rx.flex(
-                            rx.box(
-                                rx.icon("shield", size=24, class_name="text-purple-600"),
-                                class_name="w-8 h-8 rounded bg-purple-100 dark:bg-purple-900/30 flex items-center justify-center",
-                            ),
-                            rx.box(
-                                rx.heading("Admin Dashboard", size="5", class_name="text-gray-900 dark:text-white"),
-                                rx.text(
-                                    "Manage users, teams, and system settings.",
-                                    class_name="text-gray-500 dark:text-gray-400 mt-[2px] px-1",
-                                ),
-                                class_name="ml-2",
-                            ),
-                            gap="4",
-                            align="start",
-                        ),
-                        class_name="bg-white dark:bg-gray-800 rounded-lg border border-gray-200 dark:border-gray-700 px-6 py-5",
+                        rx.icon("shield", size=24, class_name="text-purple-600"),
+                        class_name="w-8 h-8 rounded bg-purple-100 dark:bg-purple-900/30 flex items-center justify-center",
                     ),
-                    # Quick links grid
                     rx.box(
-                        rx.grid(
-                            _admin_card("Users", "Manage user accounts", "users", "/admin/users"),
-                            _admin_card("Teams", "Manage teams and permissions", "users-round", "/admin/teams"),
-                            _admin_card("System", "System configuration", "settings-2", "/admin/system"),
-                            columns="3",
-                            gap="2",
-                            width="100%",
-                            style={"row-gap": "8px", "column-gap": "8px"},
+                        rx.heading("Admin Dashboard", size="5", class_name="text-gray-900 dark:text-white"),
+                        rx.text(
+                            "Manage users, teams, and system settings.",
+                            class_name="text-gray-500 dark:text-gray-400 mt-[2px] px-1",
                         ),
-                        class_name="mt-3",
-                        style={
-                            "display": "flex",
-                            "flex-wrap": "wrap",
-                        },
+                        class_name="ml-2",
                     ),
-                    direction="column",
-                    width="100%",
-                    gap="2",
-                    style={
-                        "font-size": "14px",
-                        "border-width": "0.5px",
-                        "border-color": "rgba(0, 0, 0, 0)",
-                        "border-image": "none",
-                        "margin-left": "0px",
-                        "margin-right": "0px",
-                    },
+                    gap="4",
+                    align="start",
                 ),
-                class_name="p-1 m-1",
+                class_name="bg-white dark:bg-gray-800 rounded-lg border border-gray-200 dark:border-gray-700 px-6 py-5",
             ),
-            class_name=rx.cond(
-                BaseState.sidebar_collapsed,
-                "ml-16 transition-all duration-300 ease-in-out",
-                "ml-64 transition-all duration-300 ease-in-out",
+            # Quick links grid
+            rx.box(
+                rx.grid(
+                    _admin_card("Users", "Manage user accounts", "users", "/admin/users"),
+                    _admin_card("Teams", "Manage teams and permissions", "users-round", "/admin/teams"),
+                    _admin_card("System", "System configuration", "settings-2", "/admin/system"),
+                    columns="3",
+                    gap="2",
+                    width="100%",
+                    style={"row-gap": "8px", "column-gap": "8px"},
+                ),
+                class_name="mt-3",
+                style={
+                    "display": "flex",
+                    "flex-wrap": "wrap",
+                },
             ),
+            # Live project events
+            activity_feed("Live events", AdminState.live_events),
+            direction="column",
+            width="100%",
+            gap="2",
+            style={
+                "font-size": "14px",
+                "border-width": "0.5px",
+                "border-color": "rgba(0, 0, 0, 0)",
+                "border-image": "none",
+                "margin-left": "0px",
+                "margin-right": "0px",
+            },
         ),
-        class_name="min-h-screen bg-white dark:bg-gray-950",
-        style={"font-size": "14px", "overflow": "hidden"},
+        class_name="p-1 m-1",
     )
 
 
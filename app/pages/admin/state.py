@@ -2,11 +2,206 @@
 
 import reflex as rx
 
+from app.config import settings
+from app.server.utils import queries
+from app.server.utils.appwrite import get_appwrite
+from app.server.utils.auth import admin_key, is_admin_key
+from app.server.utils.realtime import realtime_bridge
+from app.server.utils.sessions import is_connected
 from app.states.base import BaseState
 
+PAGE_SIZE = settings.admin_users_page_size
+# Rows kept in the live events feed.
+LIVE_EVENT_ROWS = 20
+
+
+def _user_row(user: dict) -> dict[str, str]:
+    """Flatten an Appwrite user document into the fields the table shows."""
+    return {
+        "id": user["$id"],
+        "name": user.get("name") or "—",
+        "email": user.get("email") or "—",
+        "status": "Active" if user.get("status", True) else "Blocked",
+        "joined": (user.get("registration") or user.get("$createdAt") or "")[:10],
+    }
+
+
+async def fetch_users_page(
+    after: str | None = None, before: str | None = None
+) -> tuple[list[dict[str, str]], int]:
+    """Fetch one page of users by cursor.
+
+    Forward pages request one extra row so the caller can tell whether
+    another page exists without a second round trip.
+    """
+    page_queries = [queries.limit(PAGE_SIZE if before else PAGE_SIZE + 1)]
+    if after:
+        page_queries.append(queries.cursor_after(after))
+    elif before:
+        page_queries.append(queries.cursor_before(before))
+    body = await get_appwrite().get("/users", params=queries.params(*page_queries))
+    return [_user_row(user) for user in body.get("users", [])], int(body.get("total", 0))
+
 
 class AdminState(BaseState):
-    """State for the admin page."""
+    """State for the admin page.
+
+    Nothing is fetched or streamed until the session has entered
+    `ADMIN_API_TOKEN` (the same token `/api/admin/*` requires). Only its digest
+    is kept, and it is checked against the current setting on every event,
+    so rotating the token locks existing sessions out.
+    """
+
+    admin_unlocked: bool = False
+    admin_error: str = ""
+
+    # Users table: only the visible page is ever held in state.
+    users: list[dict[str, str]] = []
+    users_total: int = 0
+    users_page: int = 1
+    users_has_next: bool = False
+    users_loading: bool = False
+    users_error: str = ""
+
+    # Live project events (pushed from the shared realtime connection)
+    live_events: list[dict[str, str]] = []
+
+    # Prefetched next page (backend-only, never sent to the client)
+    _prefetched: list[dict[str, str]] = []
+    _prefetched_after: str = ""
+    _live_watcher: int = 0
+    _admin_key: str = ""
+
+    def _authorized(self) -> bool:
+        """Whether this session holds the current admin token; drops admin data if not."""
+        self.admin_unlocked = is_admin_key(self._admin_key)
+        if not self.admin_unlocked:
+            self.users, self.users_total, self.live_events = [], 0, []
+            self._prefetched, self._prefetched_after = [], ""
+        return self.admin_unlocked
+
+    def _show_page(self, rows: list[dict[str, str]], total: int, page: int) -> None:
+        self.users = rows[:PAGE_SIZE]
+        self.users_has_next = len(rows) > PAGE_SIZE
+        self.users_total = total
+        self.users_page = page
+        self.users_error = ""
+        self._prefetched = []
+        self._prefetched_after = ""
+
+    @rx.var
+    def users_has_prev(self) -> bool:
+        return self.users_page > 1
+
+    @rx.event
+    def unlock_admin(self, form_data: dict):
+        """Unlock the admin pages with `ADMIN_API_TOKEN`, then load the current one."""
+        self._admin_key = admin_key(str(form_data.get("token", "")))
+        if not self._authorized():
+            self._admin_key = ""
+            self.admin_error = "Invalid admin token" if settings.admin_api_token else "Admin access is disabled"
+            return None
+        self.admin_error = ""
+        return AdminState.load_users if self.router.url.path == "/admin/users" else AdminState.load_live_events
+
+    @rx.event
+    async def load_users(self):
+        """Load the first page of users."""
+        if not self._authorized():
+            return
+        self.users_loading = True
+        yield
+        try:
+            rows, total = await fetch_users_page()
+        except Exception as e:
+            self.users_error = str(e)
+        else:
+            self._show_page(rows, total, 1)
+            yield AdminState.prefetch_next_users
+        finally:
+            self.users_loading = False
+
+    @rx.event
+    async def next_users_page(self):
+        """Advance one page, using the prefetched rows when available."""
+        if not self._authorized() or not self.users_has_next or not self.users:
+            return
+        after = self.users[-1]["id"]
+        if self._prefetched and self._prefetched_after == after:
+            rows, total = self._prefetched, self.users_total
+        else:
+            self.users_loading = True
+            yield
+            try:
+                rows, total = await fetch_users_page(after=after)
+            except Exception as e:
+                self.users_error = str(e)
+                return
+            finally:
+                self.users_loading = False
+        self._show_page(rows, total, self.users_page + 1)
+        yield AdminState.prefetch_next_users
+
+    @rx.event
+    async def prev_users_page(self):
+        """Go back one page via a `cursorBefore` query on the first visible row."""
+        if not self._authorized() or self.users_page <= 1 or not self.users:
+            return
+        self.users_loading = True
+        yield
+        try:
+            rows, total = await fetch_users_page(before=self.users[0]["id"])
+        except Exception as e:
+            self.users_error = str(e)
+            return
+        finally:
+            self.users_loading = False
+        self._show_page(rows, total, self.users_page - 1)
+        # The page we just left comes after this one.
+        self.users_has_next = True
+        yield AdminState.prefetch_next_users
+
+    @rx.event(background=True)
+    async def prefetch_next_users(self):
+        """Fetch the next page in the background so paging forward is instant."""
+        async with self:
+            if not self._authorized() or not self.users_has_next or not self.users:
+                return
+            after = self.users[-1]["id"]
+        try:
+            rows, _ = await fetch_users_page(after=after)
+        except Exception:
+            return
+        async with self:
+            if self.users and self.users[-1]["id"] == after:
+                self._prefetched = rows
+                self._prefetched_after = after
+
+    @rx.event
+    def load_live_events(self):
+        """Start streaming project events to the admin overview."""
+        if not self._authorized():
+            return None
+        self._live_watcher += 1
+        return AdminState.watch_live_events
+
+    @rx.event(background=True)
+    async def watch_live_events(self):
+        """Push realtime events to this session until it leaves the admin overview."""
+        async with self:
+            if not self._authorized():
+                return
+            watcher = self._live_watcher
+            token = self.router.session.client_token
 
-    # Admin-specific state variables can be added here
-    pass
+        with realtime_bridge.subscribe(settings.realtime_admin_channels) as events:
+            while True:
+                batch = await events.next_batch(timeout=30.0)
+                if not is_connected(token):
+                    return
+                async with self:
+                    if not self._authorized() or self._live_watcher != watcher or self.router.url.path != "/admin":
+                        return
+                    if batch:
+                        rows = [event.summary() for event in reversed(batch)]
+                        self.live_events = (rows + self.live_events)[:LIVE_EVENT_ROWS]
@@ -0,0 +1,121 @@
+"""Admin users page."""
+
+import reflex as rx
+
+from app.components.shared import app_shell
+from app.pages.admin.gate import admin_gate
+from app.pages.admin.state import AdminState
+
+ROW_HEIGHT = "44px"
+
+
+def admin_users_page() -> rx.Component:
+    """Cursor-paginated list of Appwrite users."""
+    return rx.box(
+        app_shell(
+            # Main content
+            admin_gate(_users_panel()),
+            title="Users",
+        ),
+        class_name="min-h-screen bg-white dark:bg-gray-950",
+        style={"font-size": "14px", "overflow": "hidden"},
+    )
+
+
+def _users_panel() -> rx.Component:
+    """The users table with its toolbar and pager."""
+    return rx.box(
+        rx.box(
+            _users_toolbar(),
+            _users_header(),
+            # Only the current page is rendered; off-screen rows skip
+            # layout and paint via content-visibility.
+            rx.scroll_area(
+                rx.foreach(AdminState.users, _user_row),
+                type="auto",
+                scrollbars="vertical",
+                style={"height": "calc(100vh - 12rem)"},
+            ),
+            _users_pager(),
+            class_name="bg-white dark:bg-gray-800 rounded-lg border border-gray-200 dark:border-gray-700",
+        ),
+        class_name="p-1 m-1",
+    )
+
+
+def _users_toolbar() -> rx.Component:
+    """Title row with the total user count and loading indicator."""
+    return rx.flex(
+        rx.flex(
+            rx.icon("users", size=20, class_name="text-gray-600 dark:text-gray-400"),
+            rx.text("Users", class_name="font-semibold text-gray-900 dark:text-white"),
+            rx.badge(AdminState.users_total, variant="soft"),
+            gap="2",
+            align="center",
+        ),
+        rx.cond(AdminState.users_loading, rx.spinner(size="2")),
+        justify="between",
+        align="center",
+        class_name="px-4 py-3 border-b border-gray-200 dark:border-gray-700",
+    )
+
+
+def _users_header() -> rx.Component:
+    """Column headings."""
+    return rx.grid(
+        rx.text("Name"),
+        rx.text("Email"),
+        rx.text("Status"),
+        rx.text("Joined"),
+        columns="4",
+        class_name="px-4 py-2 text-xs font-semibold uppercase tracking-wider text-gray-400 dark:text-gray-500",
+    )
+
+
+def _user_row(user: rx.Var[dict[str, str]]) -> rx.Component:
+    """Single user row."""
+    return rx.grid(
+        rx.text(user["name"], class_name="truncate text-gray-900 dark:text-white"),
+        rx.text(user["email"], class_name="truncate text-gray-500 dark:text-gray-400"),
+        rx.text(user["status"], class_name="text-gray-500 dark:text-gray-400"),
+        rx.text(user["joined"], class_name="text-gray-500 dark:text-gray-400"),
+        columns="4",
+        align="center",
+        class_name="px-4 border-t border-gray-100 dark:border-gray-700",
+        style={
+            "height": ROW_HEIGHT,
+            "content-visibility": "auto",
+            "contain-intrinsic-size": f"auto {ROW_HEIGHT}",
+        },
+    )
+
+
+def _users_pager() -> rx.Component:
+    """Previous/next cursor controls."""
+    return rx.flex(
+        rx.cond(
+            AdminState.users_error != "",
+            rx.text(AdminState.users_error, class_name="text-sm text-red-500"),
+            rx.text(f"Page {AdminState.users_page}", class_name="text-sm text-gray-500 dark:text-gray-400"),
+        ),
+        rx.flex(
+            rx.button(
+                rx.icon("chevron-left", size=16),
+                "Previous",
+                on_click=AdminState.prev_users_page,
+                disabled=~AdminState.users_has_prev | AdminState.users_loading,
+                variant="outline",
+            ),
+            rx.button(
+                "Next",
+                rx.icon("chevron-right", size=16),
+                on_click=AdminState.next_users_page,
+                disabled=~AdminState.users_has_next | AdminState.users_loading,
+                variant="outline",
+            ),
+            gap="2",
+        ),
+        justify="between",
+        align="center",
+        class_name="px-4 py-3 border-t border-gray-200 dark:border-gray-700",
+    )
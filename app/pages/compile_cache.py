@@ -0,0 +1,209 @@
+"""Build cache for the frontend bundle.
+
+`reflex export` (the JS bundler, by far the slowest step of a deploy)
+rebuilds the whole bundle from the sources Reflex generates into `.web`.
+The bundle key hashes those sources, emitted by a dry-run compile that
+writes nothing: every page module, the shared memo and stateful components
+modules (the `rx.memo` sidebar and header), the contexts module with the
+state defaults, the theme, stylesheets, document root and plugin output.
+It also covers the build inputs outside Python (rxconfig, lockfile,
+assets). `deploy-frontend.sh` runs `check` and skips `reflex export` when
+the key matches the last successful build:
+
+    python -m app.pages.compile_cache check    # exit 0: build is current
+    python -m app.pages.compile_cache record   # after a successful export
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.metadata
+import io
+import json
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import reflex as rx
+
+BUNDLE_INPUTS = ("rxconfig.py", "uv.lock", "assets")
+STATIC_DIR = Path(".web/_static")
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    """Hash of a file, or of every file under a directory (by relative path)."""
+    h = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        if file.exists():
+            h.update(str(file.relative_to(path) if path.is_dir() else file.name).encode())
+            h.update(file.read_bytes())
+    return h.hexdigest()
+
+
+def source_digest(code: str) -> str:
+    """Hash of a generated module, ignoring the order of its import lines.
+
+    Reflex collects imports in sets, so their order changes from one
+    process to the next (string hashing is randomized) with no effect on
+    the bundle.
+    """
+    lines = code.splitlines()
+    imports = sorted(line for line in lines if line.startswith("import "))
+    rest = [line for line in lines if not line.startswith("import ")]
+    return _digest(imports, rest)
+
+
+class CompileCache:
+    """The bundle key of the last successful build and its per-file digests."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.bundle_path = self.directory / "bundle.json"
+
+    def _read_json(self, path: Path) -> dict[str, Any]:
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def bundle_key(self, sources: dict[str, str], root: Path = Path(".")) -> str:
+        """Key of the bundle built from `sources` (path -> digest) and the build inputs."""
+        inputs = {name: _file_digest(root / name) for name in BUNDLE_INPUTS if (root / name).exists()}
+        return _digest(importlib.metadata.version("reflex"), sorted(sources.items()), inputs)
+
+    def last_bundle_key(self) -> str | None:
+        return self._read_json(self.bundle_path).get("key")
+
+    def changed_sources(self, sources: dict[str, str]) -> list[str]:
+        """Generated files that differ from the last recorded build."""
+        previous = self._read_json(self.bundle_path).get("sources", {})
+        return sorted(path for path in sources.keys() | previous.keys() if previous.get(path) != sources.get(path))
+
+    def record_bundle(self, key: str, sources: dict[str, str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.bundle_path.write_text(json.dumps({"key": key, "sources": sources}, indent=2, sort_keys=True))
+
+
+compile_cache = CompileCache(settings.compile_cache_dir)
+
+
+def _record(outputs: dict[str, str], result: Any) -> None:
+    """Add a compiler result: a `(path, code, ...)` tuple, a list of them, or None."""
+    for path, code, *_ in result if isinstance(result, list) else [result] if result else []:
+        outputs[str(path)] = code
+
+
+def _recording(outputs: dict[str, str], fn: Callable[..., Any]) -> Callable[..., Any]:
+    def recorded(*args: Any, **kwargs: Any) -> Any:
+        result = fn(*args, **kwargs)
+        _record(outputs, result)
+        return result
+
+    return recorded
+
+
+@contextlib.contextmanager
+def capture_outputs() -> Iterator[dict[str, str]]:
+    """Collect every `.web` source a compile emits, as path -> code.
+
+    Wraps each compiler step `App._compile` collects results from, and the
+    save and modify tasks of the configured plugins. Modify tasks are
+    applied to the captured code once the block exits.
+    """
+    from reflex import app as app_module
+    from reflex.compiler import compiler
+    from reflex.compiler.compiler import ExecutorSafeFunctions
+    from reflex.config import get_config
+
+    outputs: dict[str, str] = {}
+    modifications: list[tuple[str, Callable[[str], str]]] = []
+    patched: list[tuple[Any, str, Any]] = []
+    missing = object()
+
+    def patch(owner: Any, name: str, value: Any) -> None:
+        # Saved from `vars()` so a classmethod goes back as the descriptor.
+        patched.append((owner, name, vars(owner).get(name, missing)))
+        setattr(owner, name, value)
+
+    for name in (
+        "compile_memo_components",
+        "compile_stateful_components",
+        "compile_document_root",
+        "compile_root_stylesheet",
+        "compile_contexts",
+        "compile_app",
+    ):
+        patch(compiler, name, _recording(outputs, getattr(compiler, name)))
+    patch(app_module, "compile_theme", _recording(outputs, app_module.compile_theme))
+    page = ExecutorSafeFunctions.compile_page.__func__
+    patch(ExecutorSafeFunctions, "compile_page", classmethod(_recording(outputs, page)))
+
+    def plugin_hook(pre_compile: Callable[..., None]) -> Callable[..., None]:
+        def hooked(*, add_save_task: Callable[..., Any], add_modify_task: Callable[..., Any], **context: Any) -> None:
+            def save(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+                add_save_task(_recording(outputs, fn), *args, **kwargs)
+
+            def modify(path: str, fn: Callable[[str], str]) -> None:
+                modifications.append((str(path), fn))
+                add_modify_task(path, fn)
+
+            pre_compile(add_save_task=save, add_modify_task=modify, **context)
+
+        return hooked
+
+    for plugin in get_config().plugins:
+        patch(plugin, "pre_compile", plugin_hook(plugin.pre_compile))
+    try:
+        yield outputs
+    finally:
+        for owner, name, original in reversed(patched):
+            if original is missing:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+    for path, fn in modifications:
+        if path in outputs:
+            outputs[path] = fn(outputs[path])
+
+
+def compiled_sources(app: rx.App) -> dict[str, str]:
+    """Compile `app` without writing `.web`; returns every generated source by path."""
+    with capture_outputs() as outputs, contextlib.redirect_stdout(io.StringIO()):  # progress output
+        app._compile(dry_run=True, use_rich=False)
+    return outputs
+
+
+def main(argv: list[str]) -> int:
+    command = argv[0] if argv else "check"
+    if command not in ("check", "record", "status"):
+        print("usage: python -m app.pages.compile_cache [check|record|status]", file=sys.stderr)
+        return 2
+    from reflex.utils import prerequisites
+
+    app = prerequisites.get_and_validate_app().app
+    sources = {path: source_digest(code) for path, code in compiled_sources(app).items()}
+    key = compile_cache.bundle_key(sources)
+    if command == "record":
+        compile_cache.record_bundle(key, sources)
+        print(f"recorded bundle {key[:12]} ({len(sources)} generated files)")
+        return 0
+    changed = compile_cache.changed_sources(sources)
+    print(f"generated files: {len(sources)}, changed since last build: {changed or 'none'}")
+    current = key == compile_cache.last_bundle_key() and STATIC_DIR.is_dir()
+    print(f"bundle {key[:12]}: {'up to date' if current else 'needs build'}")
+    return 0 if current or command == "status" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
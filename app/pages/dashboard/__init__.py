@@ -1,6 +1,15 @@
-"""Dashboard page exports."""
+"""Dashboard page exports (resolved on first access; see app.pages.registry)."""
 
-from app.pages.dashboard.index import dashboard_page
-from app.pages.dashboard.state import DashboardState
+from app.pages.registry import lazy_exports
 
-__all__ = ["dashboard_page", "DashboardState"]
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "dashboard_page": "index",
+        "DashboardState": "state",
+        "stats_engine": "stats",
+        "register_stats_jobs": "stats",
+    },
+)
+
+__all__ = ["dashboard_page", "DashboardState", "register_stats_jobs", "stats_engine"]
@@ -2,16 +2,14 @@
 
 import reflex as rx
 
-from app.components.shared import header, sidebar
-from app.states.base import BaseState
+from app.components.shared import activity_feed, app_shell
+from app.pages.dashboard.state import DashboardState
 
 
 def dashboard_page() -> rx.Component:
     """Main dashboard page."""
     return rx.box(
-        sidebar(current_page="dashboard"),
-        rx.box(
-            header("Dashboard"),
+        app_shell(
             # Main content
             rx.box(
                 rx.flex(
@@ -39,9 +37,9 @@ def dashboard_page() -> rx.Component:
                     # Stats grid
                     rx.box(
                         rx.grid(
-                            _stat_card("Total Users", "1,234", "users", "+12%"),
-                            _stat_card("Active Sessions", "56", "activity", "+3%"),
-                            _stat_card("API Calls", "89.2k", "zap", "-2%"),
+                            _stat_card("Total Users", DashboardState.total_users, "users", DashboardState.total_users_change),
+                            _stat_card("Active Sessions", DashboardState.active_sessions, "activity", DashboardState.active_sessions_change),
+                            _stat_card("API Calls", DashboardState.api_calls, "zap", DashboardState.api_calls_change),
                             columns="3",
                             gap="2",
                             width="100%",
@@ -53,6 +51,9 @@ def dashboard_page() -> rx.Component:
                             "flex-wrap": "wrap",
                         },
                     ),
+
+                    # Live activity
+                    activity_feed("Recent activity", DashboardState.recent_activity),
                     direction="column",
                     width="100%",
                     gap="2",
@@ -67,20 +68,15 @@ def dashboard_page() -> rx.Component:
                 ),
                 class_name="p-1 m-1",
             ),
-            class_name=rx.cond(
-                BaseState.sidebar_collapsed,
-                "ml-16 transition-all duration-300 ease-in-out",
-                "ml-64 transition-all duration-300 ease-in-out",
-            ),
+            title="Dashboard",
         ),
         class_name="min-h-screen",
         style={"font-size": "14px", "overflow": "hidden"},
     )
 
 
-def _stat_card(title: str, value: str, icon_name: str, change: str) -> rx.Component:
+def _stat_card(title: str, value: rx.Var[str], icon_name: str, change: rx.Var[str]) -> rx.Component:
     """Stat card component."""
-    is_positive = change.startswith("+")
     return rx.box(
         rx.flex(
             rx.box(
@@ -93,7 +89,11 @@ def _stat_card(title: str, value: str, icon_name: str, change: str) -> rx.Compon
                     rx.text(value, class_name="text-xl font-semibold light:text-gray-900 dark:text-white"),
                     rx.text(
                         change,
-                        class_name=f"text-sm {'text-emerald-600' if is_positive else 'text-red-500'} ml-2",
+                        class_name=rx.cond(
+                            change.startswith("+"),
+                            "text-sm text-emerald-600 ml-2",
+                            "text-sm text-red-500 ml-2",
+                        ),
                     ),
                     align="baseline",
                     class_name="mt-1",
@@ -2,11 +2,88 @@
 
 import reflex as rx
 
+from app.config import settings
+from app.pages.dashboard.stats import format_count, stats_engine
+from app.server.utils.realtime import realtime_bridge
+from app.server.utils.sessions import is_connected
 from app.states.base import BaseState
 
+# Rows kept in the live activity feed.
+ACTIVITY_ROWS = 8
+
 
 class DashboardState(BaseState):
     """State for the dashboard page."""
 
-    # Dashboard-specific state variables can be added here
-    pass
+    # Stat cards (pushed from the shared stats snapshot)
+    total_users: str = "—"
+    active_sessions: str = "—"
+    api_calls: str = "—"
+    total_users_change: str = "+0%"
+    active_sessions_change: str = "+0%"
+    api_calls_change: str = "+0%"
+
+    # Live activity feed (pushed from the shared realtime connection)
+    recent_activity: list[dict[str, str]] = []
+
+    # Backend-only bookkeeping for the live watchers
+    _stats_version: int = -1
+    _stats_watcher: int = 0
+    _activity_watcher: int = 0
+
+    def _apply_stats(self) -> None:
+        """Copy the latest in-process snapshot into the stat card vars."""
+        snapshot = stats_engine.snapshot
+        self.total_users = format_count(snapshot.total_users)
+        self.active_sessions = format_count(snapshot.active_sessions)
+        self.api_calls = format_count(snapshot.api_calls)
+        self.total_users_change = stats_engine.changes["total_users"]
+        self.active_sessions_change = stats_engine.changes["active_sessions"]
+        self.api_calls_change = stats_engine.changes["api_calls"]
+        self._stats_version = stats_engine.version
+
+    @rx.event
+    def load_stats(self):
+        """Show the current snapshot and start watching for updates and activity."""
+        self._apply_stats()
+        self._stats_watcher += 1
+        self._activity_watcher += 1
+        return [DashboardState.watch_stats, DashboardState.watch_activity]
+
+    @rx.event(background=True)
+    async def watch_stats(self):
+        """Push new snapshots to this session until it leaves the dashboard."""
+        async with self:
+            watcher = self._stats_watcher
+            version = self._stats_version
+            token = self.router.session.client_token
+
+        while True:
+            updated = await stats_engine.wait_for_update(version, timeout=30.0)
+            if not is_connected(token):
+                return
+            async with self:
+                if self._stats_watcher != watcher or self.router.url.path != "/dashboard":
+                    return
+                if updated:
+                    self._apply_stats()
+                    version = self._stats_version
+
+    @rx.event(background=True)
+    async def watch_activity(self):
+        """Push realtime events to this session until it leaves the dashboard."""
+        async with self:
+            watcher = self._activity_watcher
+            token = self.router.session.client_token
+
+        with realtime_bridge.subscribe(settings.realtime_dashboard_channels) as events:
+            while True:
+                batch = await events.next_batch(timeout=30.0)
+                if not is_connected(token):
+                    return
+                async with self:
+                    if self._activity_watcher != watcher or self.router.url.path != "/dashboard":
+                        return
+                    if batch:
+                        rows = [event.summary() for event in reversed(batch)]
+                        self.recent_activity = (rows + self.recent_activity)[:ACTIVITY_ROWS]
@@ -0,0 +1,173 @@
+"""Background aggregation for the dashboard stat cards.
+
+The aggregation queries run as a leader-only scheduler job, so with several
+workers only one of them queries Appwrite. It publishes an immutable
+`StatsSnapshot` and shares it through a file in `scheduler_dir`, which every
+worker's `StatsEngine` picks up. Dashboard sessions only ever read the
+latest snapshot, so page loads never hit Appwrite.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.config import settings
+from app.server.utils import queries
+from app.server.utils.appwrite import AppwriteError, get_appwrite
+from app.server.utils.scheduler import Scheduler
+
+STAT_FIELDS = ("total_users", "active_sessions", "api_calls")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class StatsSnapshot:
+    """Point-in-time dashboard numbers."""
+
+    total_users: int = 0
+    active_sessions: int = 0
+    api_calls: int = 0
+    taken_at: float = 0.0
+
+
+def format_count(value: int) -> str:
+    """Format a count for a stat card (`1,234`, `89.2k`, `1.5M`)."""
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 100_000:
+        return f"{value / 1_000:.1f}k"
+    return f"{value:,}"
+
+
+def format_change(current: int, previous: int) -> str:
+    """Percentage change between two windows, e.g. `+12%`."""
+    if previous <= 0:
+        return "+0%"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+class StatsEngine:
+    """Holds this process's dashboard stats and computes them on the leader."""
+
+    def __init__(self, shared_path: str | Path, window: float, active_window: float) -> None:
+        self.shared_path = Path(shared_path)
+        self.window = window
+        self.active_window = active_window
+        self.snapshot = StatsSnapshot()
+        self.changes: dict[str, str] = dict.fromkeys(STAT_FIELDS, "+0%")
+        self.version = 0
+        self._history: deque[StatsSnapshot] = deque()
+        self._updated = asyncio.Event()
+        self._synced_mtime = 0
+
+    async def _count_users(self, *extra: str) -> int:
+        body = await get_appwrite().get("/users", params=queries.params(queries.limit(1), *extra))
+        return int(body.get("total", 0))
+
+    async def _count_api_calls(self) -> int:
+        now = datetime.now(timezone.utc)
+        try:
+            body = await get_appwrite().get(
+                "/project/usage",
+                params={
+                    "startDate": (now - timedelta(seconds=self.window)).isoformat(),
+                    "endDate": now.isoformat(),
+                    "period": "1d",
+                },
+            )
+        except AppwriteError:
+            # Usage metrics need console scope; keep the last known value.
+            return self.snapshot.api_calls
+        return int(body.get("requestsTotal", 0))
+
+    async def aggregate(self) -> StatsSnapshot:
+        """Run the aggregation queries concurrently."""
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.active_window)
+        total_users, active_sessions, api_calls = await asyncio.gather(
+            self._count_users(),
+            self._count_users(queries.greater_than("accessedAt", since.isoformat())),
+            self._count_api_calls(),
+        )
+        return StatsSnapshot(total_users, active_sessions, api_calls, time.time())
+
+    def _baseline(self, now: float) -> StatsSnapshot | None:
+        """Newest stored snapshot that is at least one window old.
+
+        Older entries are dropped; if history is younger than a window, the
+        oldest entry is used so deltas are available from the second sample.
+        """
+        cutoff = now - self.window
+        while len(self._history) > 1 and self._history[1].taken_at <= cutoff:
+            self._history.popleft()
+        return self._history[0] if self._history else None
+
+    def publish(self, snapshot: StatsSnapshot) -> None:
+        """Install a new snapshot and wake up every waiting session."""
+        baseline = self._baseline(snapshot.taken_at)
+        if baseline is not None:
+            self.changes = {
+                name: format_change(getattr(snapshot, name), getattr(baseline, name))
+                for name in STAT_FIELDS
+            }
+        self._history.append(snapshot)
+        self.snapshot = snapshot
+        self.version += 1
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def wait_for_update(self, version: int, timeout: float) -> bool:
+        """Wait until a snapshot newer than `version` is published."""
+        if self.version > version:
+            return True
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._updated.wait(), timeout)
+        return self.version > version
+
+    async def refresh(self) -> None:
+        """Aggregate, publish and share a new snapshot with the other workers."""
+        snapshot = await self.aggregate()
+        self.publish(snapshot)
+        self.shared_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.shared_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(dataclasses.asdict(snapshot)))
+        os.replace(tmp, self.shared_path)
+
+    async def sync(self) -> None:
+        """Publish the snapshot the leader shared, if it is newer than ours."""
+        try:
+            mtime = self.shared_path.stat().st_mtime_ns
+            if mtime == self._synced_mtime:
+                return
+            snapshot = StatsSnapshot(**json.loads(self.shared_path.read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return
+        self._synced_mtime = mtime
+        if snapshot.taken_at > self.snapshot.taken_at:
+            self.publish(snapshot)
+
+
+stats_engine = StatsEngine(
+    Path(settings.scheduler_dir) / "dashboard_stats.json",
+    settings.dashboard_stats_window,
+    settings.dashboard_active_window,
+)
+
+
+def register_stats_jobs(scheduler: Scheduler) -> None:
+    """Aggregate on the leader; every worker picks up the shared snapshot."""
+    if not settings.appwrite_endpoint:
+        return
+    scheduler.add("dashboard_stats", stats_engine.refresh, every=settings.dashboard_stats_interval)
+    scheduler.add(
+        "dashboard_stats_sync",
+        stats_engine.sync,
+        every=settings.dashboard_stats_sync_interval,
+        leader_only=False,
+    )
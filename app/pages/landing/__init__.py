@@ -1,6 +1,7 @@
-"""Landing page exports."""
+"""Landing page exports (resolved on first access; see app.pages.registry)."""
 
-from app.pages.landing.index import landing_page
-from app.pages.landing.state import LandingState
+from app.pages.registry import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {"landing_page": "index", "LandingState": "state"})
 
 __all__ = ["landing_page", "LandingState"]
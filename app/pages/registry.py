@@ -0,0 +1,97 @@
+"""Lazy page registration.
+
+Pages are declared by import path and registered with stub component
+functions, so `create_app` imports no page modules. A page package is
+imported the first time Reflex evaluates its component: at compile time, or
+at backend startup for pages Reflex recorded as stateful (those whose
+evaluation defined state classes). On-load handlers resolve on first
+hydrate through a lambda, which Reflex calls before dispatching.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib
+from collections.abc import Callable
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import reflex as rx
+
+
+@dataclasses.dataclass(frozen=True)
+class PageSpec:
+    """A page declared by name within its package.
+
+    `component` and `on_load` are attribute paths inside `package`, e.g.
+    `"dashboard_page"` and `"DashboardState.load_stats"`.
+    """
+
+    route: str
+    package: str
+    component: str
+    title: str
+    on_load: str | None = None
+
+
+PAGES: tuple[PageSpec, ...] = (
+    PageSpec("/", "app.pages.landing", "landing_page", "Landing"),
+    PageSpec("/dashboard", "app.pages.dashboard", "dashboard_page", "Dashboard", "DashboardState.load_stats"),
+    PageSpec("/admin", "app.pages.admin", "admin_page", "Admin", "AdminState.load_live_events"),
+    PageSpec("/admin/users", "app.pages.admin", "admin_users_page", "Users", "AdminState.load_users"),
+    PageSpec("/settings", "app.pages.settings", "settings_page", "Settings", "SettingsState.load_settings"),
+)
+
+
+def load_page_package(package: str) -> ModuleType:
+    """Import a page package and everything it exports (page, state, services)."""
+    module = importlib.import_module(package)
+    for name in getattr(module, "__all__", ()):
+        getattr(module, name)
+    return module
+
+
+def resolve(package: str, path: str) -> Any:
+    """Resolve a dotted attribute path inside a page package."""
+    target: Any = load_page_package(package)
+    for part in path.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def lazy_component(spec: PageSpec) -> Callable[[], rx.Component]:
+    """A component function that imports the page only when evaluated."""
+
+    def component() -> rx.Component:
+        return resolve(spec.package, spec.component)()
+
+    component.__name__ = spec.component
+    component.__qualname__ = f"lazy:{spec.package}.{spec.component}"
+    return component
+
+
+def register_pages(app: rx.App, pages: tuple[PageSpec, ...] = PAGES) -> None:
+    """Add every page to the app without importing any page module."""
+    for spec in pages:
+        on_load = None
+        if spec.on_load is not None:
+            # A lambda, not a def: Reflex only calls callables named "<lambda>".
+            on_load = lambda spec=spec: resolve(spec.package, spec.on_load)  # noqa: E731
+        app.add_page(lazy_component(spec), route=spec.route, title=spec.title, on_load=on_load)
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """Module `__getattr__` that imports `exports[name]` (a submodule) on first access.
+
+    Lets a page package re-export its page, state and services without
+    importing all of them whenever one submodule is imported.
+    """
+
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(importlib.import_module(f"{package}.{submodule}"), name)
+
+    return __getattr__
@@ -1,6 +1,14 @@
-"""Settings page exports."""
+"""Settings page exports (resolved on first access; see app.pages.registry)."""
 
-from app.pages.settings.index import settings_page
-from app.pages.settings.state import SettingsState
+from app.pages.registry import lazy_exports
 
-__all__ = ["settings_page", "SettingsState"]
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "settings_page": "index",
+        "settings_writer": "persistence",
+        "SettingsState": "state",
+    },
+)
+
+__all__ = ["settings_page", "SettingsState", "settings_writer"]
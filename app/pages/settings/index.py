@@ -2,17 +2,14 @@
 
 import reflex as rx
 
-from app.components.shared import header, sidebar
+from app.components.shared import app_shell, toggle_sidebar, when_collapsed
 from app.pages.settings.state import SettingsState
-from app.states.base import BaseState
 
 
 def settings_page() -> rx.Component:
     """Settings page."""
     return rx.box(
-        sidebar(current_page="settings"),
-        rx.box(
-            header("Settings"),
+        app_shell(
             # Main content
             rx.box(
                 rx.flex(
@@ -53,11 +50,7 @@ def settings_page() -> rx.Component:
                 ),
                 class_name="p-1 m-1",
             ),
-            class_name=rx.cond(
-                BaseState.sidebar_collapsed,
-                "ml-16 transition-all duration-300 ease-in-out",
-                "ml-64 transition-all duration-300 ease-in-out",
-            ),
+            title="Settings",
         ),
         class_name="min-h-screen bg-white dark:bg-gray-950",
         style={"font-size": "14px", "overflow": "hidden"},
@@ -205,11 +198,24 @@ def _appearance_settings() -> rx.Component:
             align="center",
             width="100%",
         ),
-        _toggle_setting(
-            "Compact Sidebar",
-            "Use a collapsed sidebar by default",
-            BaseState.sidebar_collapsed,
-            BaseState.set_sidebar_collapsed,
+        rx.flex(
+            rx.box(
+                rx.text("Compact Sidebar", class_name="font-medium text-gray-900 dark:text-white"),
+                rx.text("Use a collapsed sidebar by default", class_name="text-sm text-gray-500 dark:text-gray-400"),
+            ),
+            # Client-side preference: no backend event, remembered in localStorage.
+            rx.button(
+                rx.icon("panel-left-close", size=18, class_name=when_collapsed("", "hidden")),
+                rx.icon("panel-left-open", size=18, class_name=when_collapsed("hidden", "block")),
+                rx.text("Collapse", class_name=when_collapsed("", "hidden")),
+                rx.text("Expand", class_name=when_collapsed("hidden", "block")),
+                on_click=toggle_sidebar(),
+                variant="outline",
+                class_name="gap-2",
+            ),
+            justify="between",
+            align="center",
+            width="100%",
         ),
         rx.flex(
             rx.box(
@@ -0,0 +1,73 @@
+"""Appwrite-backed storage for per-user settings."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from app.config import settings
+from app.server.utils.appwrite import AppwriteError, get_appwrite
+from app.server.utils.documents import documents_path, get_document
+from app.server.utils.query_cache import query_cache
+from app.server.utils.write_behind import WriteBehindQueue
+
+# Fields persisted for each user; anything else on SettingsState stays in memory.
+PERSISTED_FIELDS = (
+    "profile_name",
+    "profile_email",
+    "email_alerts",
+    "push_notifications",
+    "weekly_digest",
+)
+
+
+def settings_document_id(owner: str) -> str:
+    """Stable Appwrite document id (max 36 chars) for a settings owner."""
+    return hashlib.sha256(owner.encode()).hexdigest()[:32]
+
+
+async def read_user_settings(owner: str) -> dict[str, Any]:
+    """Load persisted settings, overlaid with writes still waiting in the queue."""
+    stored: dict[str, Any] = {}
+    if settings.appwrite_database_id:
+        document = await get_document(settings.settings_collection_id, settings_document_id(owner))
+        if document is not None:
+            stored = {field: document[field] for field in PERSISTED_FIELDS if field in document}
+    stored.update(settings_writer.pending(owner) or {})
+    return stored
+
+
+async def write_user_settings(owner: str, fields: dict[str, Any]) -> None:
+    """Upsert a user's settings document (update, falling back to create)."""
+    if not settings.appwrite_database_id:
+        return
+    client = get_appwrite()
+    collection = settings.settings_collection_id
+    document_id = settings_document_id(owner)
+    try:
+        await client.patch(f"{documents_path(collection)}/{document_id}", json={"data": fields})
+    except AppwriteError as e:
+        if e.status_code != 404:
+            raise
+        await client.post(documents_path(collection), json={"documentId": document_id, "data": fields})
+    finally:
+        query_cache.invalidate(collection, document_id)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Client errors a retry cannot fix (bad data, missing permission, ...)."""
+    if not isinstance(error, AppwriteError):
+        return False
+    return 400 <= error.status_code < 500 and error.status_code not in (408, 409, 429)
+
+
+settings_writer = WriteBehindQueue(
+    write_user_settings,
+    debounce=settings.settings_write_debounce,
+    max_delay=settings.settings_write_max_delay,
+    batch_size=settings.settings_write_batch_size,
+    concurrency=settings.settings_write_concurrency,
+    max_attempts=settings.settings_write_max_attempts,
+    is_permanent=_is_permanent,
+    name="settings_writer",
+)
@@ -1,7 +1,11 @@
 """Settings page state."""
 
+import uuid
+from typing import Any
+
 import reflex as rx
 
+from app.pages.settings.persistence import read_user_settings, settings_writer
 from app.states.base import BaseState
 
 
@@ -17,24 +21,55 @@ class SettingsState(BaseState):
     push_notifications: bool = False
     weekly_digest: bool = True
 
+    # Persisted settings are keyed by this random id, kept in the browser's
+    # localStorage and shared by its tabs. It follows the browser profile,
+    # not an account: clearing site data starts from defaults, and nothing
+    # stops a client from presenting another id. Key on the verified
+    # Appwrite user id once the pages sign users in.
+    settings_owner_id: str = rx.LocalStorage(name="settings_owner_id", sync=True)
+
+    def _settings_owner(self) -> str:
+        """Key the persisted settings belong to, minted on first use."""
+        if not self.settings_owner_id:
+            self.settings_owner_id = uuid.uuid4().hex
+        return self.settings_owner_id
+
+    def _persist(self, **fields: Any) -> None:
+        """Queue changed fields for a debounced write-behind to Appwrite."""
+        settings_writer.enqueue(self._settings_owner(), fields)
+
+    @rx.event
+    async def load_settings(self):
+        """Load persisted settings for the current user."""
+        try:
+            stored = await read_user_settings(self._settings_owner())
+        except Exception:
+            return rx.toast.error("Could not load saved settings", position="bottom-right")
+        for field, value in stored.items():
+            setattr(self, field, value)
+
     @rx.event
     def update_profile(self, form_data: dict):
         """Update profile information."""
         self.profile_name = form_data.get("name", self.profile_name)
         self.profile_email = form_data.get("email", self.profile_email)
+        self._persist(profile_name=self.profile_name, profile_email=self.profile_email)
         return rx.toast.success("Profile updated", position="bottom-right")
 
     @rx.event
     def toggle_email_alerts(self, value: bool):
         """Toggle email alerts setting."""
         self.email_alerts = value
+        self._persist(email_alerts=value)
 
     @rx.event
     def toggle_push_notifications(self, value: bool):
         """Toggle push notifications setting."""
         self.push_notifications = value
+        self._persist(push_notifications=value)
 
     @rx.event
     def toggle_weekly_digest(self, value: bool):
         """Toggle weekly digest setting."""
         self.weekly_digest = value
+        self._persist(weekly_digest=value)
@@ -1,5 +1,15 @@
 """API routes exports."""
 
 from app.server.api.health import register_health_routes
+from app.server.api.metrics import register_metrics_routes
+from app.server.api.profiling import register_profiling_routes
+from app.server.api.sessions import register_session_routes
+from app.server.api.state_memory import register_state_memory_routes
 
-__all__ = ["register_health_routes"]
+__all__ = [
+    "register_health_routes",
+    "register_metrics_routes",
+    "register_profiling_routes",
+    "register_session_routes",
+    "register_state_memory_routes",
+]
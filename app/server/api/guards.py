@@ -0,0 +1,68 @@
+"""Access guards for API endpoints."""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.server.api.responses import JSONResponse, constant
+from app.server.utils.appwrite import AppwriteError
+from app.server.utils.auth import AuthError, admin_key, is_admin_key, session_verifier
+
+Endpoint = Callable[[Request], Awaitable[Response]]
+
+ADMIN_DISABLED = constant({"error": "admin API disabled"}, status_code=403)
+ADMIN_UNAUTHORIZED = constant({"error": "unauthorized"}, status_code=401, headers={"WWW-Authenticate": "Bearer"})
+SESSION_MISSING = constant({"error": "unauthorized"}, status_code=401)
+
+
+def _presented_token(request: Request) -> str:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" else ""
+
+
+def admin_only(endpoint: Endpoint) -> Endpoint:
+    """Require `Authorization: Bearer <ADMIN_API_TOKEN>`.
+
+    Without a configured token the endpoint is disabled (403) rather than
+    open.
+    """
+
+    @functools.wraps(endpoint)
+    async def guarded(request: Request) -> Response:
+        if not settings.admin_api_token:
+            return ADMIN_DISABLED
+        if not is_admin_key(admin_key(_presented_token(request))):
+            return ADMIN_UNAUTHORIZED
+        return await endpoint(request)
+
+    return guarded
+
+
+def session_required(endpoint: Endpoint) -> Endpoint:
+    """Require a valid Appwrite JWT in `X-Appwrite-JWT`.
+
+    The verified session is put on `request.state.session` and the raw token
+    on `request.state.jwt`, for handlers that call Appwrite as the user.
+    Tokens already seen are answered from `session_verifier`'s cache.
+    """
+
+    @functools.wraps(endpoint)
+    async def guarded(request: Request) -> Response:
+        token = request.headers.get("x-appwrite-jwt", "")
+        if not token:
+            return SESSION_MISSING
+        try:
+            request.state.session = await session_verifier.verify(token)
+            request.state.jwt = token
+        except AuthError as e:
+            return JSONResponse({"error": str(e)}, status_code=401)
+        except AppwriteError as e:
+            return JSONResponse({"error": f"session check failed: {e.message}"}, status_code=503)
+        return await endpoint(request)
+
+    return guarded
@@ -2,19 +2,124 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response
+
+from app.config import Settings, settings
+from app.server.api.responses import PreencodedResponse, constant
+from app.server.utils.appwrite import CLIENT_FIELDS, get_appwrite
+
+Probe = Callable[[], Awaitable[object]]
 
 
-async def health_check(_: Request) -> JSONResponse:
+HEALTH_OK = constant({"status": "ok", "message": "API is running"})
+
+
+async def health_check(_: Request) -> Response:
     """Basic health check endpoint."""
-    return JSONResponse({"status": "ok", "message": "API is running"})
+    return HEALTH_OK
+
+
+def _readiness_probes() -> dict[str, Probe | None]:
+    """Dependency probes keyed by name; `None` means not configured."""
+    probes: dict[str, Probe | None] = {"appwrite": None, "database": None, "storage": None}
+    if not (settings.appwrite_endpoint and settings.appwrite_project_id):
+        return probes
+    probes["appwrite"] = lambda: get_appwrite().get("/health/version")
+    if settings.appwrite_database_id:
+        probes["database"] = lambda: get_appwrite().get(f"/databases/{settings.appwrite_database_id}")
+    if settings.appwrite_storage_id:
+        probes["storage"] = lambda: get_appwrite().get(f"/storage/buckets/{settings.appwrite_storage_id}")
+    return probes
+
+
+async def _run_probe(probe: Probe | None, timeout: float) -> dict[str, object]:
+    """Run one probe under its own timeout and report status and latency."""
+    if probe is None:
+        return {"status": "skipped"}
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout)
+    except asyncio.TimeoutError:
+        status, error = "fail", f"timed out after {timeout}s"
+    except Exception as e:
+        status, error = "fail", str(e) or type(e).__name__
+    else:
+        status, error = "pass", None
+    result: dict[str, object] = {
+        "status": status,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+class ReadinessCache:
+    """Caches the encoded readiness response for a short TTL.
+
+    Concurrent polls during a refresh share the same in-flight probe run, so a
+    load balancer polling every second costs at most one upstream round per TTL.
+    """
+
+    def __init__(self, ttl: float, probe_timeout: float) -> None:
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+        self._response = constant({"status": "not_ready", "checks": {}}, status_code=503)
+        self._expires_at = 0.0
+        self._refresh: asyncio.Task[None] | None = None
+
+    async def _probe_all(self) -> None:
+        probes = _readiness_probes()
+        results = await asyncio.gather(*(_run_probe(p, self.probe_timeout) for p in probes.values()))
+        checks = dict(zip(probes, results))
+        ready = all(check["status"] != "fail" for check in checks.values())
+        self._response = constant(
+            {"status": "ready" if ready else "not_ready", "checks": checks},
+            status_code=200 if ready else 503,
+        )
+        self._expires_at = time.monotonic() + self.ttl
+
+    async def get(self) -> PreencodedResponse:
+        """Return the readiness response, refreshing at most once per TTL."""
+        if time.monotonic() >= self._expires_at:
+            if self._refresh is None or self._refresh.done():
+                self._refresh = asyncio.create_task(self._probe_all())
+            await asyncio.shield(self._refresh)
+        return self._response
+
+    def invalidate(self) -> None:
+        """Force the next call to re-probe dependencies."""
+        self._expires_at = 0.0
+
+
+readiness_cache = ReadinessCache(settings.readiness_cache_ttl, settings.readiness_probe_timeout)
+
+
+def _reconfigure_readiness(_: Settings, new: Settings) -> None:
+    readiness_cache.ttl = new.readiness_cache_ttl
+    readiness_cache.probe_timeout = new.readiness_probe_timeout
+    readiness_cache.invalidate()
+
+
+settings.subscribe(
+    _reconfigure_readiness,
+    "readiness_cache_ttl",
+    "readiness_probe_timeout",
+    *CLIENT_FIELDS,
+    "appwrite_database_id",
+    "appwrite_storage_id",
+)
 
 
-async def readiness_check(_: Request) -> JSONResponse:
-    """Readiness check - can add DB/service checks here."""
-    return JSONResponse({"status": "ready"})
+async def readiness_check(_: Request) -> Response:
+    """Readiness check - probes Appwrite, the database and the storage bucket."""
+    return await readiness_cache.get()
 
 
 def register_health_routes(app: Starlette) -> None:
@@ -0,0 +1,21 @@
+"""Prometheus metrics route."""
+
+from __future__ import annotations
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.server.utils.metrics import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def metrics_endpoint(_: Request) -> Response:
+    """All registered metrics in Prometheus text exposition format."""
+    return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def register_metrics_routes(app: Starlette) -> None:
+    """Register the metrics endpoint on the given Starlette app."""
+    app.add_route("/api/metrics", metrics_endpoint, methods=["GET"])
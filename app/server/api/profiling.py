@@ -0,0 +1,81 @@
+"""Admin routes for runtime handler profiling."""
+
+from __future__ import annotations
+
+import io
+import zipfile
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+from app.server.api.guards import admin_only
+from app.server.api.responses import Body, BodyError, JSONResponse, read_body
+from app.server.utils.profiling import handler_profiler
+
+
+class ProfilingChange(Body):
+    enabled: bool | None = None
+    sample_rate: float | None = None
+    mode: str | None = None
+
+
+@admin_only
+async def profiling_status(_: Request) -> JSONResponse:
+    """Sampling settings and the profiles on disk, newest first."""
+    return JSONResponse(handler_profiler.status())
+
+
+@admin_only
+async def configure_profiling(request: Request) -> JSONResponse:
+    """Switch sampling on or off; optionally change `sample_rate` and `mode`."""
+    try:
+        body = await read_body(request, ProfilingChange)
+    except BodyError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    try:
+        handler_profiler.configure(**body.model_dump(exclude_none=True))
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(handler_profiler.status())
+
+
+@admin_only
+async def download_profile(request: Request) -> Response:
+    """Download one profile file by name."""
+    path = handler_profiler.get_profile(request.path_params["name"])
+    if path is None:
+        return JSONResponse({"error": "profile not found"}, status_code=404)
+    return FileResponse(path, filename=path.name, media_type="application/octet-stream")
+
+
+@admin_only
+async def download_latest_profiles(request: Request) -> Response:
+    """Zip of the newest `count` profiles (default 10)."""
+    try:
+        count = max(1, int(request.query_params.get("count", "10")))
+    except ValueError:
+        return JSONResponse({"error": "count must be an integer"}, status_code=400)
+    profiles = handler_profiler.profiles()[:count]
+    if not profiles:
+        return JSONResponse({"error": "no profiles recorded"}, status_code=404)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in profiles:
+            try:
+                archive.write(path, path.name)
+            except FileNotFoundError:  # pruned since it was listed
+                continue
+    return Response(
+        buffer.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="profiles.zip"'},
+    )
+
+
+def register_profiling_routes(app: Starlette) -> None:
+    """Register admin profiling endpoints on the given Starlette app."""
+    app.add_route("/api/admin/profiling", profiling_status, methods=["GET"])
+    app.add_route("/api/admin/profiling", configure_profiling, methods=["POST"])
+    app.add_route("/api/admin/profiling/latest.zip", download_latest_profiles, methods=["GET"])
+    app.add_route("/api/admin/profiling/profiles/{name}", download_profile, methods=["GET"])
@@ -0,0 +1,144 @@
+"""JSON responses and typed request bodies for the API routes.
+
+Everything is encoded by pydantic-core's serializer, several times faster
+than the standard-library encoder Starlette uses, and it also handles
+models, dates and UUIDs. Output is compact UTF-8, and NaN and infinities
+become `null`.
+
+- `JSONResponse` is a drop-in for Starlette's.
+- `constant()` encodes a fixed payload once, at import, and the same
+  response is sent to every request.
+- `JSONListResponse` streams a large list as a JSON array, one batch of
+  items at a time, so the whole encoded list is never held in memory.
+- `read_body()` validates a request body into a `Body` model straight from
+  the raw bytes, without building an intermediate dict.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+from pydantic_core import to_json
+from starlette import responses
+from starlette.requests import Request
+from starlette.types import Receive, Scope, Send
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Items encoded per chunk of a streamed list.
+STREAM_BATCH_SIZE = 500
+
+
+def encode(content: Any) -> bytes:
+    """`content` as compact UTF-8 JSON."""
+    return to_json(content, inf_nan_mode="null")
+
+
+class JSONResponse(responses.JSONResponse):
+    """Starlette's `JSONResponse`, encoded by pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        return encode(content)
+
+
+class PreencodedResponse(responses.Response):
+    """A response built once and sent unchanged to every request."""
+
+    media_type = JSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Middleware may append to the headers in the message, so never hand out our list.
+        await send({"type": "http.response.start", "status": self.status_code, "headers": list(self.raw_headers)})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+def constant(
+    content: Any, status_code: int = 200, headers: Mapping[str, str] | None = None
+) -> PreencodedResponse:
+    """Encode `content` once; return it from a handler as often as needed."""
+    return PreencodedResponse(encode(content), status_code=status_code, headers=headers)
+
+
+async def _items(items: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class JSONListResponse(responses.StreamingResponse):
+    """Streams `items` as a JSON array, encoding `batch_size` items at a time.
+
+    With `field`, the array is that key's value in an object that also holds
+    `extra`, e.g. `{"total": 1200, "documents": [...]}`. `items` may be a
+    plain or an async iterable.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        *,
+        field: str | None = None,
+        extra: Mapping[str, Any] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> None:
+        if field is None:
+            head, tail = b"[", b"]"
+        else:
+            extra = dict(extra or {})
+            if field in extra:
+                raise ValueError(f"{field!r} is both the list field and an extra key")
+            head = encode(extra)[:-1] + (b"," if extra else b"") + encode(field) + b":["
+            tail = b"]}"
+        super().__init__(
+            self._encode(items, head, tail, batch_size), status_code, headers, JSON_MEDIA_TYPE
+        )
+
+    @staticmethod
+    async def _encode(
+        items: Iterable[Any] | AsyncIterable[Any], head: bytes, tail: bytes, batch_size: int
+    ) -> AsyncIterator[bytes]:
+        chunk, batch = head, []
+        async for item in _items(items):
+            batch.append(item)
+            if len(batch) == batch_size:
+                # One encoder call per batch; its brackets are replaced by ours.
+                yield chunk + encode(batch)[1:-1]
+                chunk, batch = b",", []
+        yield (chunk + encode(batch)[1:-1] if batch else chunk.rstrip(b",")) + tail
+
+
+class Body(BaseModel):
+    """Base for request body models: strict types, unknown keys ignored."""
+
+    model_config = ConfigDict(strict=True, frozen=True)
+
+
+BodyT = TypeVar("BodyT", bound=Body)
+
+
+class BodyError(ValueError):
+    """The request body is not JSON or does not fit its model."""
+
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors(include_url=False)[0]
+    if first["type"] == "json_invalid":
+        return "invalid JSON body"
+    if not first["loc"]:
+        return "expected a JSON object"
+    return f"{'.'.join(map(str, first['loc']))}: {first['msg']}"
+
+
+async def read_body(request: Request, model: type[BodyT]) -> BodyT:
+    """Validate the JSON body into `model`; raises `BodyError` with a short reason."""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise BodyError(_describe(e)) from None
@@ -1,5 +1,21 @@
 """API routes exports."""
 
 from app.server.api.health import register_health_routes
+from app.server.api.routes.v1 import (
+    agent_queue,
+    register_agent_routes,
+    register_db_routes,
+    register_file_routes,
+    register_tool_routes,
+    tool_pool,
+)
 
-__all__ = ["register_health_routes"]
+__all__ = [
+    "agent_queue",
+    "register_agent_routes",
+    "register_db_routes",
+    "register_file_routes",
+    "register_health_routes",
+    "register_tool_routes",
+    "tool_pool",
+]
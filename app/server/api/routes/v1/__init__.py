@@ -1,5 +1,15 @@
-"""API routes exports."""
+"""v1 API routes exports."""
 
-from app.server.api.health import register_health_routes
+from app.server.api.routes.v1.agent_routes import agent_queue, register_agent_routes
+from app.server.api.routes.v1.db_routes import register_db_routes
+from app.server.api.routes.v1.file_routes import register_file_routes
+from app.server.api.routes.v1.tool_routes import register_tool_routes, tool_pool
 
-__all__ = ["register_health_routes"]
+__all__ = [
+    "agent_queue",
+    "register_agent_routes",
+    "register_db_routes",
+    "register_file_routes",
+    "register_tool_routes",
+    "tool_pool",
+]
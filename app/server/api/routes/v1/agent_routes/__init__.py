@@ -1,5 +1,6 @@
-"""API routes exports."""
+"""Agent API routes exports."""
 
-from app.server.api.health import register_health_routes
+from app.server.api.routes.v1.agent_routes.jobs import agent_queue, register_agent
+from app.server.api.routes.v1.agent_routes.routes import register_agent_routes
 
-__all__ = ["register_health_routes"]
+__all__ = ["agent_queue", "register_agent", "register_agent_routes"]
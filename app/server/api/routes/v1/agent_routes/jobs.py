@@ -0,0 +1,297 @@
+"""Bounded job queue for long-running agent runs."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[str, Any], Awaitable[None]]
+Agent = Callable[[dict[str, Any], Emit], Awaitable[Any]]
+
+AGENTS: dict[str, Agent] = {}
+
+_reader_ids = itertools.count()
+
+TERMINAL = frozenset({"succeeded", "failed", "cancelled"})
+
+# Longest pause, in seconds, the echo agent takes between steps.
+ECHO_MAX_DELAY = 5.0
+
+
+class QueueFull(Exception):
+    """The global job queue has no free slots."""
+
+
+class TenantLimitExceeded(Exception):
+    """The tenant already has its maximum number of jobs in flight."""
+
+
+class JobStalled(Exception):
+    """No client read the job's events for longer than the detach timeout."""
+
+
+def register_agent(name: str) -> Callable[[Agent], Agent]:
+    """Register an agent coroutine under `name`."""
+
+    def decorator(fn: Agent) -> Agent:
+        AGENTS[name] = fn
+        return fn
+
+    return decorator
+
+
+@register_agent("echo")
+async def echo_agent(payload: dict[str, Any], emit: Emit) -> Any:
+    """Reference agent: streams each item of `payload["steps"]` back as progress."""
+    steps = payload.get("steps", [])
+    delay = payload.get("delay", 0)
+    delay = min(max(float(delay), 0.0), ECHO_MAX_DELAY) if isinstance(delay, int | float) else 0.0
+    for i, step in enumerate(steps):
+        await emit("progress", {"step": i + 1, "of": len(steps), "data": step})
+        await asyncio.sleep(delay)
+    return {"steps": len(steps)}
+
+
+@dataclasses.dataclass(eq=False)
+class AgentJob:
+    """One agent run and its replayable event log.
+
+    Events live in a ring of `buffer_size` entries. The producer blocks in
+    `emit` once it is a full buffer ahead of the slowest attached reader, so a
+    slow client throttles the agent instead of growing memory.
+    """
+
+    agent: str
+    tenant: str
+    payload: dict[str, Any]
+    buffer_size: int
+    detach_timeout: float
+    id: str = dataclasses.field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"
+    result: Any = None
+    error: str | None = None
+    created_at: float = dataclasses.field(default_factory=time.time)
+    finished_at: float | None = None
+    task: asyncio.Task[None] | None = None
+
+    def __post_init__(self) -> None:
+        self._events: deque[tuple[int, str, Any]] = deque(maxlen=self.buffer_size)
+        self._seq = 0
+        self._readers: dict[int, int] = {}  # reader id -> last seq delivered
+        self._delivered = 0  # highest seq any reader has received
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "agent": self.agent,
+            "tenant": self.tenant,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "last_event_id": self._seq,
+        }
+
+    def _min_cursor(self) -> int:
+        return min(self._readers.values()) if self._readers else self._delivered
+
+    async def emit(self, event: str, data: Any) -> None:
+        """Append an event, waiting while readers are a full buffer behind."""
+        async with self._changed:
+            deadline = time.monotonic() + self.detach_timeout
+            while self._seq - self._min_cursor() >= self.buffer_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise JobStalled(f"no reader for {self.detach_timeout}s")
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+            self._seq += 1
+            self._events.append((self._seq, event, data))
+            self._changed.notify_all()
+
+    async def _finish(self, status: str) -> None:
+        async with self._changed:
+            self.status = status
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    async def events(self, last_event_id: int = 0) -> AsyncIterator[tuple[int, str, Any]]:
+        """Yield events after `last_event_id` until the job finishes.
+
+        Events older than the ring are gone; a reader that resumes too far
+        back continues from the oldest retained event.
+        """
+        reader = next(_reader_ids)
+        cursor = max(last_event_id, 0)
+        async with self._changed:
+            self._readers[reader] = cursor
+        try:
+            while True:
+                async with self._changed:
+                    pending = [e for e in self._events if e[0] > cursor]
+                    if not pending:
+                        if self.done:
+                            return
+                        await self._changed.wait()
+                        continue
+                for event in pending:
+                    yield event
+                    cursor = event[0]
+                    async with self._changed:
+                        self._readers[reader] = cursor
+                        self._delivered = max(self._delivered, cursor)
+                        self._changed.notify_all()
+        finally:
+            async with self._changed:
+                self._readers.pop(reader, None)
+                self._changed.notify_all()
+
+
+class JobQueue:
+    """Runs agent jobs on a fixed pool of workers fed by a bounded queue."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        queue_size: int,
+        tenant_limit: int,
+        event_buffer: int,
+        detach_timeout: float,
+        job_ttl: float,
+    ) -> None:
+        self.workers = workers
+        self.tenant_limit = tenant_limit
+        self.event_buffer = event_buffer
+        self.detach_timeout = detach_timeout
+        self.job_ttl = job_ttl
+        self.jobs: dict[str, AgentJob] = {}
+        self._queue: asyncio.Queue[AgentJob] = asyncio.Queue(maxsize=queue_size)
+        self._in_flight: dict[str, int] = {}
+        self._workers: list[asyncio.Task[None]] = []
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self.jobs.values() if j.done and (j.finished_at or 0) < cutoff]:
+            del self.jobs[job_id]
+
+    def submit(self, agent: str, tenant: str, payload: dict[str, Any]) -> AgentJob:
+        """Enqueue a job without waiting.
+
+        Raises:
+            KeyError: If `agent` is not registered.
+            TenantLimitExceeded: If the tenant is at its in-flight limit.
+            QueueFull: If the global queue is full.
+        """
+        if agent not in AGENTS:
+            raise KeyError(agent)
+        if self._in_flight.get(tenant, 0) >= self.tenant_limit:
+            raise TenantLimitExceeded(tenant)
+        self._prune()
+        job = AgentJob(agent, tenant, payload, self.event_buffer, self.detach_timeout)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull from None
+        self._in_flight[tenant] = self._in_flight.get(tenant, 0) + 1
+        self.jobs[job.id] = job
+        return job
+
+    async def cancel(self, job: AgentJob) -> None:
+        """Cancel a queued or running job."""
+        if job.done:
+            return
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            # Still queued: the worker skips it when dequeued.
+            await job._finish("cancelled")
+
+    def _release(self, job: AgentJob) -> None:
+        remaining = self._in_flight.get(job.tenant, 1) - 1
+        if remaining > 0:
+            self._in_flight[job.tenant] = remaining
+        else:
+            self._in_flight.pop(job.tenant, None)
+
+    async def _run(self, job: AgentJob) -> None:
+        job.status = "running"
+        await job.emit("status", {"status": "running"})
+        job.result = await AGENTS[job.agent](job.payload, job.emit)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.done:
+                    continue
+                job.task = asyncio.create_task(self._run(job), name=f"agent_job|{job.id}")
+                try:
+                    await job.task
+                except asyncio.CancelledError:
+                    if not job.task.cancelled():
+                        raise  # the worker itself is shutting down
+                    await job._finish("cancelled")
+                except Exception as e:
+                    job.error = str(e) or type(e).__name__
+                    logger.exception("Agent job %s failed", job.id)
+                    await job._finish("failed")
+                else:
+                    await job._finish("succeeded")
+            finally:
+                self._release(job)
+                self._queue.task_done()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Start the worker pool for the app's lifetime."""
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"agent_worker|{i}") for i in range(self.workers)
+        ]
+        try:
+            yield
+        finally:
+            for job in list(self.jobs.values()):
+                if job.task is not None and not job.done:
+                    job.task.cancel()
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
+
+agent_queue = JobQueue(
+    workers=settings.agent_workers,
+    queue_size=settings.agent_queue_size,
+    tenant_limit=settings.agent_tenant_limit,
+    event_buffer=settings.agent_event_buffer,
+    detach_timeout=settings.agent_detach_timeout,
+    job_ttl=settings.agent_job_ttl,
+)
+
+
+def _reconfigure_agent_queue(_: Settings, new: Settings) -> None:
+    # Worker count and queue size are fixed once the queue has started.
+    agent_queue.tenant_limit = new.agent_tenant_limit
+    agent_queue.detach_timeout = new.agent_detach_timeout
+    agent_queue.job_ttl = new.agent_job_ttl
+
+
+settings.subscribe(_reconfigure_agent_queue, "agent_tenant_limit", "agent_detach_timeout", "agent_job_ttl")
@@ -0,0 +1,115 @@
+"""v1 agent API routes."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from app.server.api.guards import session_required
+from app.server.api.responses import Body, BodyError, JSONResponse, constant, read_body
+from app.server.api.routes.v1.agent_routes.jobs import (
+    AGENTS,
+    AgentJob,
+    QueueFull,
+    TenantLimitExceeded,
+    agent_queue,
+)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _tenant(request: Request) -> str:
+    """The verified caller; jobs are scoped and rate-limited per user."""
+    return request.state.session.user_id
+
+
+def _get_job(request: Request) -> AgentJob | None:
+    job = agent_queue.jobs.get(request.path_params["job_id"])
+    if job is None or job.tenant != _tenant(request):
+        return None
+    return job
+
+
+JOB_NOT_FOUND = constant({"error": "job not found"}, status_code=404)
+
+
+class AgentRunRequest(Body):
+    agent: str | None = None
+    input: dict[str, Any] | None = None
+
+
+@session_required
+async def create_agent_run(request: Request) -> JSONResponse:
+    """Queue an agent run and return immediately with its id."""
+    try:
+        body = await read_body(request, AgentRunRequest)
+    except BodyError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    agent = body.agent
+    if agent not in AGENTS:
+        return JSONResponse({"error": f"unknown agent: {agent}", "agents": sorted(AGENTS)}, status_code=400)
+    try:
+        job = agent_queue.submit(agent, _tenant(request), body.input or {})
+    except TenantLimitExceeded:
+        return JSONResponse({"error": "tenant concurrency limit reached"}, status_code=429)
+    except QueueFull:
+        return JSONResponse({"error": "job queue is full"}, status_code=503, headers={"Retry-After": "5"})
+    return JSONResponse(
+        {**job.summary(), "events_url": f"/api/v1/agents/{job.id}/events"},
+        status_code=202,
+    )
+
+
+@session_required
+async def get_agent_run(request: Request) -> JSONResponse:
+    """Current status of an agent run."""
+    job = _get_job(request)
+    return JSONResponse(job.summary()) if job else JOB_NOT_FOUND
+
+
+@session_required
+async def cancel_agent_run(request: Request) -> JSONResponse:
+    """Cancel a queued or running agent run."""
+    job = _get_job(request)
+    if job is None:
+        return JOB_NOT_FOUND
+    await agent_queue.cancel(job)
+    return JSONResponse(job.summary(), status_code=202)
+
+
+async def _sse(job: AgentJob, last_event_id: int) -> AsyncIterator[bytes]:
+    async for seq, event, data in job.events(last_event_id):
+        yield f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode()
+    yield f"event: end\ndata: {json.dumps(job.summary())}\n\n".encode()
+
+
+@session_required
+async def stream_agent_events(request: Request) -> Response:
+    """Server-Sent Events stream of a run, resumable via `Last-Event-ID`.
+
+    Each chunk is only produced after the previous one was sent, so a slow
+    client holds back the agent (see `AgentJob.emit`) instead of piling up
+    output in memory.
+    """
+    job = _get_job(request)
+    if job is None:
+        return JOB_NOT_FOUND
+    raw = request.headers.get("last-event-id") or request.query_params.get("last_event_id") or "0"
+    try:
+        last_event_id = int(raw)
+    except ValueError:
+        return JSONResponse({"error": "invalid Last-Event-ID"}, status_code=400)
+    return StreamingResponse(_sse(job, last_event_id), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def register_agent_routes(app: Starlette) -> None:
+    """Register v1 agent endpoints on the given Starlette app."""
+    app.add_route("/api/v1/agents", create_agent_run, methods=["POST"])
+    app.add_route("/api/v1/agents/{job_id}", get_agent_run, methods=["GET"])
+    app.add_route("/api/v1/agents/{job_id}", cancel_agent_run, methods=["DELETE"])
+    app.add_route("/api/v1/agents/{job_id}/events", stream_agent_events, methods=["GET"])
@@ -0,0 +1,5 @@
+"""Database API routes exports."""
+
+from app.server.api.routes.v1.db_routes.routes import register_db_routes
+
+__all__ = ["register_db_routes"]
@@ -0,0 +1,80 @@
+"""v1 database routes: bulk NDJSON export and import of a collection.
+
+`GET /api/v1/db/{collection}/export` streams every document in the
+collection as NDJSON. `POST /api/v1/db/{collection}/import` reads an NDJSON
+body (an export, for example) and writes it in concurrent batches, then
+returns a report of rows imported, rejected and failed. `?mode=upsert`
+replaces existing documents instead of rejecting their batch. Both routes
+need the admin API token.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from app.config import settings
+from app.server.api.guards import admin_only
+from app.server.api.responses import JSONResponse, constant
+from app.server.utils.appwrite import AppwriteError
+from app.server.utils.documents import export_documents, import_documents, is_valid_id
+
+NDJSON = "application/x-ndjson"
+IMPORT_MODES = ("create", "upsert")
+INVALID_COLLECTION = constant({"error": "invalid collection id"}, status_code=400)
+
+
+async def _chain(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    if first:
+        yield first
+    async for chunk in rest:
+        yield chunk
+
+
+@admin_only
+async def export_collection(request: Request) -> Response:
+    """Stream every document in the collection as NDJSON."""
+    collection = request.path_params["collection"]
+    if not is_valid_id(collection):
+        return INVALID_COLLECTION
+    rows = export_documents(collection, settings.db_export_page_size)
+    try:
+        # Read the first page up front so a missing collection is a clean 404.
+        first = await anext(rows, b"")
+    except AppwriteError as e:
+        return JSONResponse({"error": e.message}, status_code=e.status_code)
+    return StreamingResponse(
+        _chain(first, rows),
+        media_type=NDJSON,
+        headers={"Content-Disposition": f'attachment; filename="{collection}.ndjson"'},
+    )
+
+
+@admin_only
+async def import_collection(request: Request) -> JSONResponse:
+    """Write an NDJSON body to the collection; returns a per-batch report."""
+    collection = request.path_params["collection"]
+    if not is_valid_id(collection):
+        return INVALID_COLLECTION
+    mode = request.query_params.get("mode", "create")
+    if mode not in IMPORT_MODES:
+        return JSONResponse({"error": f"mode must be one of {', '.join(IMPORT_MODES)}"}, status_code=400)
+    config = settings.current
+    report = await import_documents(
+        collection,
+        request.stream(),
+        upsert=mode == "upsert",
+        batch_size=config.db_import_batch_size,
+        concurrency=config.db_import_concurrency,
+        max_line_bytes=config.db_import_max_line_bytes,
+    )
+    return JSONResponse(report.summary(), status_code=413 if report.aborted else 200)
+
+
+def register_db_routes(app: Starlette) -> None:
+    """Register v1 bulk database endpoints on the given Starlette app."""
+    app.add_route("/api/v1/db/{collection}/export", export_collection, methods=["GET"])
+    app.add_route("/api/v1/db/{collection}/import", import_collection, methods=["POST"])
@@ -0,0 +1,5 @@
+"""File API routes exports."""
+
+from app.server.api.routes.v1.file_routes.routes import register_file_routes
+
+__all__ = ["register_file_routes"]
@@ -0,0 +1,169 @@
+"""v1 file routes: streaming proxy to the Appwrite storage bucket.
+
+Upload a whole file in one request (`POST /api/v1/files`), or upload to a
+chosen id with `PUT /api/v1/files/{file_id}`, which accepts a chunk-aligned
+`Content-Range` so an interrupted upload can continue from the
+`upload_offset` reported by `GET /api/v1/files/{file_id}`. Downloads stream
+from Appwrite and honour `Range`. Previews are rendered by Appwrite once per
+file and transform, then served from the on-disk asset cache.
+
+Every route requires a verified session (`X-Appwrite-JWT`) and forwards
+that JWT instead of the server key, so Appwrite enforces each file's
+permissions. Uploaded files belong to the uploader.
+"""
+
+from __future__ import annotations
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+from app.server.api.guards import session_required
+from app.server.api.responses import JSONResponse
+from app.server.utils.appwrite import AppwriteError
+from app.server.utils.asset_cache import asset_cache
+from app.server.utils.storage import (
+    PREVIEW_PARAMS,
+    ByteRange,
+    UploadError,
+    cached_file_info,
+    fetch_preview,
+    file_info,
+    new_file_id,
+    open_download,
+    preview_key,
+    upload,
+)
+
+# Response headers passed through from Appwrite on download.
+DOWNLOAD_HEADERS = (
+    "accept-ranges",
+    "cache-control",
+    "content-disposition",
+    "content-encoding",
+    "content-length",
+    "content-range",
+    "content-type",
+    "etag",
+    "last-modified",
+)
+DOWNLOAD_PIECE = 64 * 1024
+
+# A file id can be deleted and reused, so browsers keep a preview briefly and
+# then revalidate it against its ETag (the asset cache key).
+PREVIEW_CACHE_CONTROL = "private, max-age=60"
+
+
+def _upload_range(request: Request) -> ByteRange:
+    """The body's byte range: `Content-Range` if given, else the whole file."""
+    length = request.headers.get("content-length", "")
+    if not length.isdigit() or int(length) == 0:
+        raise UploadError("Content-Length is required (chunked bodies are not supported)", 411)
+    if header := request.headers.get("content-range"):
+        span = ByteRange.parse(header)
+        if int(length) != span.length:
+            raise UploadError("Content-Length does not match Content-Range")
+        return span
+    return ByteRange(0, int(length) - 1, int(length))
+
+
+async def _upload(request: Request, file_id: str) -> JSONResponse:
+    try:
+        span = _upload_range(request)
+        document = await upload(
+            file_id,
+            request.query_params.get("name") or request.headers.get("x-file-name") or file_id,
+            request.headers.get("content-type", "application/octet-stream"),
+            span,
+            request.stream(),
+            jwt=request.state.jwt,
+            user_id=request.state.session.user_id,
+        )
+    except UploadError as e:
+        return JSONResponse({"error": str(e), **e.detail}, status_code=e.status_code)
+    except AppwriteError as e:
+        return JSONResponse({"error": e.message}, status_code=e.status_code)
+    complete = span.end + 1 == span.total
+    return JSONResponse(
+        {**document, "$id": file_id, "upload_offset": span.end + 1, "upload_complete": complete},
+        status_code=201 if complete else 200,
+    )
+
+
+@session_required
+async def create_file(request: Request) -> JSONResponse:
+    """Upload a new file from the raw request body."""
+    return await _upload(request, new_file_id())
+
+
+@session_required
+async def put_file(request: Request) -> JSONResponse:
+    """Upload (all or a chunk-aligned range of) a file under a client-chosen id."""
+    return await _upload(request, request.path_params["file_id"])
+
+
+@session_required
+async def get_file(request: Request) -> JSONResponse:
+    """File metadata, including how far an unfinished upload got."""
+    try:
+        info = await file_info(request.path_params["file_id"], request.state.jwt)
+    except AppwriteError as e:
+        return JSONResponse({"error": e.message}, status_code=e.status_code)
+    if info is None:
+        return JSONResponse({"error": "file not found"}, status_code=404)
+    return JSONResponse(info)
+
+
+@session_required
+async def download_file(request: Request) -> Response:
+    """Stream the file's contents; supports `Range` requests."""
+    upstream = await open_download(request.path_params["file_id"], request.state.jwt, request.headers.get("range"))
+    if upstream.is_error:
+        try:
+            await upstream.aread()
+            body = upstream.json() if upstream.content else {}
+        except ValueError:
+            body = {}
+        finally:
+            await upstream.aclose()
+        message = body.get("message", upstream.reason_phrase) if isinstance(body, dict) else upstream.reason_phrase
+        return JSONResponse({"error": message}, status_code=upstream.status_code)
+    headers = {name: upstream.headers[name] for name in DOWNLOAD_HEADERS if name in upstream.headers}
+    return StreamingResponse(
+        upstream.aiter_raw(DOWNLOAD_PIECE),
+        status_code=upstream.status_code,
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+@session_required
+async def get_preview(request: Request) -> Response:
+    """A resized/reformatted image of the file, from the asset cache."""
+    file_id, jwt = request.path_params["file_id"], request.state.jwt
+    params = {name: request.query_params[name] for name in PREVIEW_PARAMS if name in request.query_params}
+    try:
+        # A short-lived metadata read, made as the caller, checks they may
+        # read the file and keeps a deleted or re-created file from being
+        # served a stale preview.
+        info = await cached_file_info(file_id, jwt, request.state.session.user_id)
+        if info is None:
+            return JSONResponse({"error": "file not found"}, status_code=404)
+        key = preview_key(info, params)
+        headers = {"Cache-Control": PREVIEW_CACHE_CONTROL, "ETag": f'"{key}"'}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        path = await asset_cache.get_or_create(key, lambda dest: fetch_preview(file_id, params, dest, jwt))
+    except AppwriteError as e:
+        return JSONResponse({"error": e.message}, status_code=e.status_code)
+    return FileResponse(path, media_type=asset_cache.content_type(path), headers=headers)
+
+
+def register_file_routes(app: Starlette) -> None:
+    """Register v1 file upload/download endpoints on the given Starlette app."""
+    app.add_route("/api/v1/files", create_file, methods=["POST"])
+    app.add_route("/api/v1/files/{file_id}", put_file, methods=["PUT"])
+    app.add_route("/api/v1/files/{file_id}", get_file, methods=["GET"])
+    app.add_route("/api/v1/files/{file_id}/download", download_file, methods=["GET"])
+    app.add_route("/api/v1/files/{file_id}/preview", get_preview, methods=["GET"])
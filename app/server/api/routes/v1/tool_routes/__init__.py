@@ -1,5 +1,5 @@
-"""API routes exports."""
+"""Tool API routes exports."""
 
-from app.server.api.health import router as health_router
+from app.server.api.routes.v1.tool_routes.routes import register_tool_routes, tool_pool
 
-__all__ = ["health_router"]
+__all__ = ["register_tool_routes", "tool_pool"]
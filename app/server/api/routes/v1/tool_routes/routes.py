@@ -0,0 +1,102 @@
+"""v1 tool execution routes.
+
+Both routes require a verified session (`X-Appwrite-JWT`); each user may
+have at most `tool_caller_limit` calls in flight.
+"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+
+from app.config import Settings, settings
+from app.server.api.guards import session_required
+from app.server.api.responses import Body, BodyError, JSONResponse, read_body
+from app.server.tools import CallerLimitExceeded, ToolPool, ToolTimeout, all_tools, get_tool
+
+tool_pool = ToolPool(
+    workers=settings.tool_pool_workers,
+    max_tasks_per_worker=settings.tool_max_tasks_per_worker,
+    default_timeout=settings.tool_default_timeout,
+    shm_threshold=settings.tool_shm_threshold,
+    caller_limit=settings.tool_caller_limit,
+)
+
+
+def _reconfigure_tool_pool(_: Settings, new: Settings) -> None:
+    # Worker count and recycling stay fixed until the process restarts.
+    tool_pool.default_timeout = new.tool_default_timeout
+    tool_pool.shm_threshold = new.tool_shm_threshold
+    tool_pool.caller_limit = new.tool_caller_limit
+
+
+settings.subscribe(_reconfigure_tool_pool, "tool_default_timeout", "tool_shm_threshold", "tool_caller_limit")
+
+
+class ToolCall(Body):
+    params: dict[str, Any] = {}
+    data: str = ""
+
+
+@session_required
+async def list_tools(request: Request) -> JSONResponse:
+    """Every registered tool and how it runs."""
+    return JSONResponse({"tools": [tool.describe() for tool in all_tools()]})
+
+
+async def _read_call(request: Request) -> tuple[bytes, dict]:
+    """Split a request into `(payload, params)`.
+
+    JSON bodies carry `{"params": {...}, "data": "..."}`, where `data` must
+    be a string (send binary payloads as a raw body); any other body is the
+    raw payload, with params taken from the query string.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        call = await read_body(request, ToolCall)
+        return call.data.encode(), call.params
+    params = {}
+    for key, value in request.query_params.items():
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return await request.body(), params
+
+
+@session_required
+async def call_tool(request: Request) -> JSONResponse:
+    """Run a tool and return its result."""
+    name = request.path_params["name"]
+    try:
+        tool = get_tool(name)
+    except KeyError:
+        return JSONResponse({"error": f"unknown tool: {name}"}, status_code=404)
+    try:
+        data, params = await _read_call(request)
+    except ValueError as e:
+        return JSONResponse({"error": str(e) or "invalid request body"}, status_code=400)
+    try:
+        # Checked here so a TypeError raised inside the tool stays a 500.
+        tool.check_params(params)
+    except TypeError as e:
+        return JSONResponse({"error": f"invalid params for {name}: {e}"}, status_code=400)
+    try:
+        result, elapsed = await tool_pool.run(name, data, params, caller=request.state.session.user_id)
+    except CallerLimitExceeded:
+        return JSONResponse({"error": "caller concurrency limit reached"}, status_code=429)
+    except ToolTimeout as e:
+        return JSONResponse({"error": str(e)}, status_code=504)
+    except BrokenProcessPool:
+        # A worker died mid-call; the pool has already been replaced.
+        return JSONResponse({"error": "tool worker crashed"}, status_code=503, headers={"Retry-After": "1"})
+    return JSONResponse({"tool": name, "result": result, "elapsed_ms": round(elapsed * 1000, 3)})
+
+
+def register_tool_routes(app: Starlette) -> None:
+    """Register v1 tool endpoints on the given Starlette app."""
+    app.add_route("/api/v1/tools", list_tools, methods=["GET"])
+    app.add_route("/api/v1/tools/{name}", call_tool, methods=["POST"])
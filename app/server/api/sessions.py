@@ -0,0 +1,41 @@
+"""Admin routes for the session verification cache."""
+
+from __future__ import annotations
+
+from pydantic import Field
+from starlette.applications import Starlette
+from starlette.requests import Request
+
+from app.server.api.guards import admin_only
+from app.server.api.responses import Body, BodyError, JSONResponse, read_body
+from app.server.utils.auth import session_verifier
+
+
+class RevokeRequest(Body):
+    token: str | None = Field(default=None, min_length=1)
+    session_id: str | None = Field(default=None, min_length=1)
+    user_id: str | None = Field(default=None, min_length=1)
+
+
+@admin_only
+async def revoke_sessions(request: Request) -> JSONResponse:
+    """Reject a `token`, a `session_id` or every session of a `user_id` from now on."""
+    try:
+        body = await read_body(request, RevokeRequest)
+    except BodyError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    revokers = {
+        "token": session_verifier.revoke,
+        "session_id": session_verifier.revoke_session,
+        "user_id": session_verifier.revoke_user,
+    }
+    given = [k for k in revokers if getattr(body, k) is not None]
+    if len(given) != 1:
+        return JSONResponse({"error": "give one of token, session_id or user_id"}, status_code=400)
+    dropped = revokers[given[0]](getattr(body, given[0]))
+    return JSONResponse({"revoked": given[0], "cached_tokens_dropped": dropped})
+
+
+def register_session_routes(app: Starlette) -> None:
+    """Register admin session endpoints on the given Starlette app."""
+    app.add_route("/api/admin/sessions/revoke", revoke_sessions, methods=["POST"])
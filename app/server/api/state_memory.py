@@ -0,0 +1,29 @@
+"""Admin routes for session state memory instrumentation."""
+
+from __future__ import annotations
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+
+from app.server.api.guards import admin_only
+from app.server.api.responses import JSONResponse
+from app.server.utils.state_memory import state_evictor, state_memory_report
+
+
+@admin_only
+async def state_memory(_: Request) -> JSONResponse:
+    """Serialized state bytes per substate, summed across live sessions."""
+    return JSONResponse(state_memory_report())
+
+
+@admin_only
+async def evict_idle_states(_: Request) -> JSONResponse:
+    """Run the idle-session eviction policy immediately."""
+    evicted = state_evictor.evict_idle()
+    return JSONResponse({"evicted": evicted, "report": state_memory_report()})
+
+
+def register_state_memory_routes(app: Starlette) -> None:
+    """Register state memory endpoints on the given Starlette app."""
+    app.add_route("/api/state/memory", state_memory, methods=["GET"])
+    app.add_route("/api/state/memory/evict", evict_idle_states, methods=["POST"])
@@ -0,0 +1,5 @@
+"""Appwrite Functions entry point exports."""
+
+from app.server.functions.adapter import FunctionAdapter, build_app, function_adapter
+
+__all__ = ["FunctionAdapter", "build_app", "function_adapter"]
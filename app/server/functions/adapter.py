@@ -0,0 +1,198 @@
+"""Serve the app's HTTP routes from an Appwrite Function.
+
+A function container imports its entry point once and then calls it for
+every execution. The first execution builds the app with the same `app()`
+factory the production backend uses (frontend compilation skipped). It
+starts the app's lifespan on an event loop in a background thread, and both
+are kept for the life of the container. Later executions only translate
+the request into an ASGI call and the response back, so the Appwrite client
+pool, caches and background services stay warm between them.
+
+Every response carries `X-Function-Start: cold|warm` and a `Server-Timing`
+entry. Those durations also go to `function_execution_seconds{start}`, so
+cold starts and warm calls can be told apart from outside and from
+metrics.
+
+Executions are plain request/response, so Reflex's event websocket cannot
+run here; this serves `/api/*`, `/ping` and uploads. Response bodies are
+buffered, since a Function returns its body in one piece.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.server.utils.metrics import metrics
+
+ASGIApp = Callable[..., Any]
+
+# Seconds to wait for the app's lifespan to start or stop.
+LIFESPAN_TIMEOUT = 60.0
+
+function_execution_seconds = metrics.histogram(
+    "function_execution_seconds", "Appwrite Function executions by cold or warm start.", ("start",)
+)
+function_cold_start_seconds = metrics.gauge(
+    "function_cold_start_seconds", "Time this container took to build and start the app."
+)
+
+
+def build_app() -> ASGIApp:
+    """The app's ASGI callable, built without compiling the frontend."""
+    from reflex.environment import environment
+
+    environment.REFLEX_SKIP_COMPILE.set(True)
+
+    from app.app import app
+    from app.server.utils.scheduler import scheduler
+
+    # A container is not a long-lived worker: periodic jobs belong to the backend
+    # deployment, and each container would otherwise elect itself leader.
+    scheduler.enabled = False
+    return app()
+
+
+class FunctionAdapter:
+    """Builds the app once per container and runs each execution through it."""
+
+    def __init__(self, factory: Callable[[], ASGIApp] = build_app) -> None:
+        self.factory = factory
+        self.app: ASGIApp | None = None
+        self.cold_start = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lifespan: asyncio.Queue[dict[str, Any]] | None = None
+        self._lifespan_done: asyncio.Task[Any] | None = None
+        self._state: dict[str, Any] = {}  # lifespan state, copied into every request
+        self._start_lock = threading.Lock()
+
+    def _submit(self, coroutine: Any) -> concurrent.futures.Future[Any]:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def start(self) -> bool:
+        """Build and start the app if this container has not yet; whether it did."""
+        with self._start_lock:
+            if self.app is not None:
+                return False
+            begin = time.perf_counter()
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="function-app", daemon=True).start()
+            self._loop = loop
+            app = self.factory()
+            self._submit(self._start_lifespan(app)).result(LIFESPAN_TIMEOUT)
+            self.app = app
+            self.cold_start = time.perf_counter() - begin
+            function_cold_start_seconds.set(self.cold_start)
+            atexit.register(self.stop)
+            return True
+
+    async def _start_lifespan(self, app: ASGIApp) -> None:
+        inbox: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        started: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+        async def send(message: dict[str, Any]) -> None:
+            if message["type"] == "lifespan.startup.complete":
+                started.set_result(None)
+            elif message["type"] == "lifespan.startup.failed":
+                started.set_exception(RuntimeError(message.get("message") or "app startup failed"))
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.0"}, "state": self._state}
+        task = asyncio.ensure_future(app(scope, inbox.get, send))
+        await inbox.put({"type": "lifespan.startup"})
+        await asyncio.wait({started, task}, return_when=asyncio.FIRST_COMPLETED)
+        await started  # raises if startup failed
+        self._lifespan = inbox
+        self._lifespan_done = task
+
+    def stop(self) -> None:
+        """Run the app's shutdown; called when the container exits."""
+        if self._lifespan is None:
+            return
+        inbox, done, self._lifespan = self._lifespan, self._lifespan_done, None
+
+        async def shutdown() -> None:
+            await inbox.put({"type": "lifespan.shutdown"})
+            await asyncio.wait_for(done, LIFESPAN_TIMEOUT)
+
+        with contextlib.suppress(Exception):
+            self._submit(shutdown()).result(LIFESPAN_TIMEOUT + 1)
+
+    async def _call(self, scope: dict[str, Any], body: bytes) -> tuple[int, list[tuple[bytes, bytes]], bytes]:
+        status, headers, chunks = 500, [], []
+        responded = asyncio.Event()
+        delivered = False
+
+        async def receive() -> dict[str, Any]:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await responded.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status, headers = message["status"], message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    responded.set()
+
+        await self.app(scope, receive, send)
+        responded.set()
+        return status, headers, b"".join(chunks)
+
+    async def handle(self, context: Any) -> Any:
+        """Run one Appwrite Function execution (`context.req`) through the app."""
+        begin = time.perf_counter()
+        cold = await asyncio.to_thread(self.start) if self.app is None else False
+        req = context.req
+        body = getattr(req, "body_binary", None)
+        if body is None:
+            body = (getattr(req, "body_raw", None) or "").encode()
+        headers = dict(req.headers)
+        host = headers.get("host") or req.host
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": req.method.upper(),
+            "scheme": req.scheme or "https",
+            "path": req.path or "/",
+            "raw_path": (req.path or "/").encode(),
+            "query_string": (req.query_string or "").encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode("latin-1"), str(v).encode("latin-1")) for k, v in headers.items()],
+            "client": (headers.get("x-forwarded-for", "0.0.0.0").split(",")[0].strip(), 0),
+            "server": (host.split(":")[0], int(req.port or 443)),
+            "state": dict(self._state),
+        }
+        status, raw_headers, payload = await asyncio.wrap_future(self._submit(self._call(scope, body)))
+
+        elapsed = time.perf_counter() - begin
+        start = "cold" if cold else "warm"
+        function_execution_seconds.observe(elapsed, start)
+        response_headers: dict[str, str] = {}
+        for key, value in raw_headers:
+            name, text = key.decode("latin-1"), value.decode("latin-1")
+            response_headers[name] = f"{response_headers[name]}, {text}" if name in response_headers else text
+        response_headers["x-function-start"] = start
+        timing = f"app;dur={elapsed * 1000:.1f}"
+        if cold:
+            timing += f", cold-start;dur={self.cold_start * 1000:.1f}"
+            context.log(f"Cold start: app ready in {self.cold_start * 1000:.0f} ms")
+        response_headers["server-timing"] = timing
+        res = context.res
+        if hasattr(res, "binary"):
+            return res.binary(payload, status, response_headers)
+        return res.send(payload.decode("utf-8", "replace"), status, response_headers)
+
+
+function_adapter = FunctionAdapter()
@@ -0,0 +1,6 @@
+"""Tool execution exports."""
+
+from app.server.tools.pool import CallerLimitExceeded, ToolPool, ToolTimeout
+from app.server.tools.registry import Tool, all_tools, get_tool, register_tool
+
+__all__ = ["CallerLimitExceeded", "Tool", "ToolPool", "ToolTimeout", "all_tools", "get_tool", "register_tool"]
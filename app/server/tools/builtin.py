@@ -0,0 +1,66 @@
+"""Built-in tools."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Any
+
+from app.server.tools.registry import register_tool
+
+_WORD = re.compile(rb"[A-Za-z0-9']+")
+_NEWLINE = re.compile(rb"\n")
+_NUMBER = re.compile(rb"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+@register_tool("word_count")
+def word_count(data: bytes | memoryview, top: int = 10) -> dict[str, Any]:
+    """Count lines, words and the most common words in a UTF-8 text payload."""
+    counts = Counter(match.group().lower() for match in _WORD.finditer(data))
+    return {
+        "bytes": len(data),
+        "lines": sum(1 for _ in _NEWLINE.finditer(data)) + (1 if len(data) and data[-1:] != b"\n" else 0),
+        "words": sum(counts.values()),
+        "top": [[word.decode(errors="replace"), n] for word, n in counts.most_common(top)],
+    }
+
+
+@register_tool("number_stats")
+def number_stats(data: bytes | memoryview) -> dict[str, Any]:
+    """Summary statistics for every number found in the payload."""
+    count = 0
+    mean = m2 = 0.0
+    low, high = math.inf, -math.inf
+    # Welford's algorithm: one pass, constant memory.
+    for match in _NUMBER.finditer(data):
+        value = float(match.group())
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        low, high = min(low, value), max(high, value)
+    if not count:
+        return {"count": 0}
+    return {
+        "count": count,
+        "mean": mean,
+        "stdev": math.sqrt(m2 / (count - 1)) if count > 1 else 0.0,
+        "min": low,
+        "max": high,
+    }
+
+
+@register_tool("sha256")
+def sha256(data: bytes | memoryview) -> dict[str, Any]:
+    """SHA-256 digest of the payload."""
+    return {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+
+@register_tool("sleep", kind="io", timeout=60.0)
+async def sleep(data: bytes | memoryview, seconds: float = 0.0) -> dict[str, Any]:
+    """Wait without blocking the event loop (I/O tool smoke test)."""
+    await asyncio.sleep(seconds)
+    return {"slept": seconds}
@@ -0,0 +1,271 @@
+"""Warm process pool for CPU-bound tools."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from app.server.tools.registry import get_tool
+
+
+class ToolTimeout(Exception):
+    """A tool call exceeded its timeout."""
+
+
+class CallerLimitExceeded(Exception):
+    """The caller already has its maximum number of tool calls in flight."""
+
+
+def _warm() -> int:
+    """Import the tool registry in a fresh worker so the first call is fast."""
+    from app.server.tools.registry import all_tools
+
+    all_tools()
+    return os.getpid()
+
+
+def _to_shm(data: bytes | bytearray | memoryview) -> tuple[str, int]:
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    name = shm.name
+    shm.close()
+    return name, len(data)
+
+
+def _from_shm(name: str, size: int) -> bytes:
+    shm = SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run_tool(name: str, params: dict[str, Any], data: bytes | None, shm: tuple[str, int] | None, threshold: int) -> tuple[str, Any]:
+    """Worker entry point: run a CPU tool on inline bytes or a shared-memory block.
+
+    Large binary results are handed back through a new shared-memory block
+    that the parent reads and unlinks.
+    """
+    tool = get_tool(name)
+    if shm is None:
+        result = tool.fn(data or b"", **params)
+    else:
+        block = SharedMemory(name=shm[0])
+        view = block.buf[: shm[1]]
+        try:
+            result = tool.fn(view, **params)
+        finally:
+            view.release()
+            block.close()
+    if isinstance(result, (bytes, bytearray, memoryview)) and len(result) >= threshold:
+        return "shm", _to_shm(result)
+    return "value", result
+
+
+class ToolPool:
+    """Runs CPU tools in a warm, self-recycling process pool.
+
+    Workers are replaced after `max_tasks_per_worker` calls (bounding leaks
+    in long-lived workers). A call that exceeds its timeout swaps in a fresh
+    pool for new calls; the old pool finishes the calls it already has, then
+    its processes, the stuck worker among them, are killed. Payloads of at
+    least `shm_threshold` bytes cross the process boundary through shared
+    memory rather than being pickled. Each caller may have at most
+    `caller_limit` calls in flight, so one user cannot occupy every worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 0,
+        max_tasks_per_worker: int = 500,
+        default_timeout: float = 30.0,
+        shm_threshold: int = 1024 * 1024,
+        caller_limit: int = 4,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.default_timeout = default_timeout
+        self.shm_threshold = shm_threshold
+        self.caller_limit = caller_limit
+        self._in_flight: dict[str, int] = {}
+        self.restarts = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = asyncio.Lock()
+        # Calls in flight on each pool, so a retired pool knows when it is idle.
+        self._inflight: dict[ProcessPoolExecutor, set[asyncio.Future]] = {}
+        self._retiring: set[asyncio.Task] = set()
+
+    def _context(self) -> multiprocessing.context.BaseContext:
+        # Forking a process that runs an event loop and threads is unsafe, and
+        # `max_tasks_per_child` requires a non-fork start method anyway.
+        if sys.platform != "linux":
+            return multiprocessing.get_context("spawn")
+        context = multiprocessing.get_context("forkserver")
+        # Workers fork from a server that already imported the tools.
+        context.set_forkserver_preload(["app.server.tools.builtin"])
+        return context
+
+    async def _start(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context(),
+            max_tasks_per_child=self.max_tasks_per_worker,
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm) for _ in range(self.workers)))
+        self._executor = executor
+        self._inflight[executor] = set()
+        return executor
+
+    async def start(self) -> None:
+        """Create the pool and warm every worker."""
+        async with self._lock:
+            if self._executor is None:
+                await self._start()
+
+    async def _current(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is not None:
+            return executor
+        async with self._lock:
+            return self._executor or await self._start()
+
+    @staticmethod
+    def _processes(executor: ProcessPoolExecutor) -> list[Any]:
+        # `shutdown()` drops the executor's reference, so read it first.
+        return list((getattr(executor, "_processes", None) or {}).values())
+
+    def _kill(self, executor: ProcessPoolExecutor, processes: list[Any] | None = None) -> None:
+        self._inflight.pop(executor, None)
+        processes = self._processes(executor) if processes is None else processes
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            with contextlib.suppress(Exception):
+                process.kill()
+
+    async def _retire(self, executor: ProcessPoolExecutor, processes: list[Any]) -> None:
+        # Every pending call is bounded by its own timeout, so this ends.
+        pending = [f for f in self._inflight.get(executor, ()) if not f.done()]
+        try:
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            self._kill(executor, processes)
+
+    async def _replace(self, executor: ProcessPoolExecutor, *, broken: bool) -> None:
+        """Swap out `executor` unless another call already did."""
+        async with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.restarts += 1
+            if broken:
+                self._kill(executor)
+            else:
+                processes = self._processes(executor)
+                executor.shutdown(wait=False)
+                task = asyncio.create_task(self._retire(executor, processes), name="tool_pool_retire")
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+            await self._start()
+
+    async def stop(self) -> None:
+        async with self._lock:
+            for task in list(self._retiring):
+                task.cancel()
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+            for executor in list(self._inflight):
+                self._kill(executor)
+            self._executor = None
+
+    async def run_cpu(self, name: str, data: bytes | bytearray | memoryview, params: dict[str, Any], timeout: float | None = None) -> Any:
+        """Run a CPU tool in the pool and return its result."""
+        executor = await self._current()
+        shm = _to_shm(data) if len(data) >= self.shm_threshold else None
+        inline = None if shm else bytes(data)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, _run_tool, name, params, inline, shm, self.shm_threshold)
+        inflight = self._inflight.get(executor, set())
+        inflight.add(future)
+        try:
+            kind, value = await asyncio.wait_for(future, timeout or self.default_timeout)
+        except asyncio.TimeoutError:
+            await self._replace(executor, broken=False)
+            raise ToolTimeout(f"{name} exceeded {timeout or self.default_timeout}s") from None
+        except BrokenProcessPool:
+            await self._replace(executor, broken=True)
+            raise
+        finally:
+            inflight.discard(future)
+            if shm is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    block = SharedMemory(name=shm[0])
+                    block.close()
+                    block.unlink()
+        return _from_shm(*value) if kind == "shm" else value
+
+    async def run(
+        self,
+        name: str,
+        data: bytes | bytearray | memoryview = b"",
+        params: dict[str, Any] | None = None,
+        caller: str | None = None,
+    ) -> tuple[Any, float]:
+        """Run any registered tool; returns `(result, elapsed_seconds)`.
+
+        Calls made on behalf of `caller` count against its `caller_limit`.
+
+        Raises:
+            KeyError: If the tool is not registered.
+            CallerLimitExceeded: If `caller` is at its in-flight limit.
+            ToolTimeout: If the tool exceeds its timeout.
+            BrokenProcessPool: If a worker died mid-call; the pool is
+                replaced before this is raised.
+        """
+        tool = get_tool(name)
+        params = params or {}
+        timeout = tool.timeout or self.default_timeout
+        if caller is not None:
+            if self._in_flight.get(caller, 0) >= self.caller_limit:
+                raise CallerLimitExceeded(caller)
+            self._in_flight[caller] = self._in_flight.get(caller, 0) + 1
+        start = time.perf_counter()
+        try:
+            if tool.kind == "io":
+                try:
+                    result = await asyncio.wait_for(tool.fn(data, **params), timeout)
+                except asyncio.TimeoutError:
+                    raise ToolTimeout(f"{name} exceeded {timeout}s") from None
+            else:
+                result = await self.run_cpu(name, data, params, timeout)
+        finally:
+            if caller is not None:
+                self._release(caller)
+        return result, time.perf_counter() - start
+
+    def _release(self, caller: str) -> None:
+        remaining = self._in_flight.get(caller, 1) - 1
+        if remaining > 0:
+            self._in_flight[caller] = remaining
+        else:
+            self._in_flight.pop(caller, None)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Keep a warm pool for the app's lifetime."""
+        await self.start()
+        try:
+            yield
+        finally:
+            await self.stop()
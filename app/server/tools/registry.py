@@ -0,0 +1,84 @@
+"""Tool registry.
+
+Kept free of app/Reflex imports: pool worker processes import this module
+(and the tool modules) on startup, and every heavy import here would be paid
+again each time a worker is recycled.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+from collections.abc import Callable
+from typing import Any, Literal
+
+ToolKind = Literal["cpu", "io"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Tool:
+    """A registered tool.
+
+    CPU tools are plain functions run in the process pool and receive the
+    request payload as a `bytes`-like object (a shared-memory `memoryview`
+    for large payloads). I/O tools are coroutines run on the event loop.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    kind: ToolKind
+    timeout: float | None
+    description: str
+    signature: inspect.Signature
+
+    def check_params(self, params: dict[str, Any]) -> None:
+        """Raise `TypeError` unless `fn(data, **params)` matches the signature."""
+        self.signature.bind(b"", **params)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "timeout": self.timeout,
+            "description": self.description,
+        }
+
+
+TOOLS: dict[str, Tool] = {}
+
+
+def register_tool(
+    name: str, *, kind: ToolKind = "cpu", timeout: float | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register `fn(data, **params)` as a tool."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if kind == "io" and not inspect.iscoroutinefunction(fn):
+            raise TypeError(f"I/O tool {name!r} must be a coroutine function")
+        if kind == "cpu" and inspect.iscoroutinefunction(fn):
+            raise TypeError(f"CPU tool {name!r} must be a plain function")
+        description = (inspect.getdoc(fn) or "").split("\n", 1)[0]
+        TOOLS[name] = Tool(name, fn, kind, timeout, description, inspect.signature(fn))
+        return fn
+
+    return decorator
+
+
+def _load_builtin() -> None:
+    import app.server.tools.builtin  # noqa: F401
+
+
+def get_tool(name: str) -> Tool:
+    """Look up a tool by name.
+
+    Raises:
+        KeyError: If no such tool is registered.
+    """
+    _load_builtin()
+    return TOOLS[name]
+
+
+def all_tools() -> list[Tool]:
+    """Every registered tool, sorted by name."""
+    _load_builtin()
+    return sorted(TOOLS.values(), key=lambda tool: tool.name)
@@ -0,0 +1,21 @@
+"""Server utilities exports."""
+
+from app.server.utils.appwrite import (
+    AppwriteClient,
+    AppwriteError,
+    appwrite_lifespan,
+    get_appwrite,
+    user_headers,
+)
+from app.server.utils.lifespan import ordered_lifespan
+from app.server.utils.write_behind import WriteBehindQueue
+
+__all__ = [
+    "AppwriteClient",
+    "AppwriteError",
+    "WriteBehindQueue",
+    "appwrite_lifespan",
+    "get_appwrite",
+    "ordered_lifespan",
+    "user_headers",
+]
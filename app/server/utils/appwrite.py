@@ -0,0 +1,271 @@
+"""Shared async Appwrite client with a pooled HTTP transport."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+import httpx
+
+from app.config import Settings, settings
+
+# Methods that are safe to replay after a failed attempt.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# Upstream statuses worth retrying; everything else is returned to the caller.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class AppwriteError(Exception):
+    """Error response returned by the Appwrite REST API."""
+
+    def __init__(self, status_code: int, message: str, error_type: str | None = None) -> None:
+        super().__init__(f"{status_code} {error_type or 'error'}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.error_type = error_type
+
+
+class AppwriteClient:
+    """Process-wide Appwrite REST client.
+
+    Wraps a single `httpx.AsyncClient` so every caller shares one pool of
+    keep-alive connections instead of paying a TLS handshake per request.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        project_id: str,
+        api_key: str | None = None,
+        *,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.project_id = project_id
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        headers = {
+            "X-Appwrite-Project": project_id,
+            "Content-Type": "application/json",
+        }
+        if api_key:
+            headers["X-Appwrite-Key"] = api_key
+
+        self._http = httpx.AsyncClient(
+            base_url=self.endpoint,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            transport=transport,
+        )
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> AppwriteClient:
+        """Build a client from application settings."""
+        if not config.appwrite_endpoint or not config.appwrite_project_id:
+            raise RuntimeError("APPWRITE_ENDPOINT and APPWRITE_PROJECT_ID must be set")
+        return cls(
+            config.appwrite_endpoint,
+            config.appwrite_project_id,
+            config.appwrite_api_key or config.appwrite_dev_api_key,
+            max_connections=config.appwrite_max_connections,
+            max_keepalive=config.appwrite_max_keepalive,
+            keepalive_expiry=config.appwrite_keepalive_expiry,
+            connect_timeout=config.appwrite_connect_timeout,
+            timeout=config.appwrite_timeout,
+            max_retries=config.appwrite_max_retries,
+            backoff_base=config.appwrite_backoff_base,
+            backoff_max=config.appwrite_backoff_max,
+        )
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying connection pool has been closed."""
+        return self._http.is_closed
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._http.aclose()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        content: bytes | AsyncIterable[bytes] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures with jittered backoff.
+
+        Non-idempotent methods are only retried when the connection could not
+        be established, so a POST is never replayed after it reached Appwrite.
+        `content` must be replayable: bytes, or an async iterable (not a
+        generator) that yields the same bytes each time it is iterated. With
+        `stream=True` the body is left unread and the caller must close the
+        response.
+        """
+        method = method.upper()
+        retryable = method in IDEMPOTENT_METHODS
+        kwargs: dict[str, Any] = {"params": params, "json": json, "content": content, "headers": headers}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        attempt = 0
+        while True:
+            try:
+                request = self._http.build_request(method, path, **kwargs)
+                response = await self._http.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt >= self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if not retryable or attempt >= self.max_retries:
+                    raise
+            else:
+                if not (retryable and response.status_code in RETRY_STATUSES and attempt < self.max_retries):
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def call(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and return the decoded JSON body.
+
+        Raises:
+            AppwriteError: If Appwrite answers with a 4xx/5xx status.
+        """
+        response = await self.request(method, path, **kwargs)
+        if response.status_code == 204 or not response.content:
+            if response.is_error:
+                raise AppwriteError(response.status_code, response.reason_phrase)
+            return None
+        body = response.json()
+        if response.is_error:
+            raise AppwriteError(
+                response.status_code,
+                body.get("message", response.reason_phrase) if isinstance(body, dict) else str(body),
+                body.get("type") if isinstance(body, dict) else None,
+            )
+        return body
+
+    async def get(self, path: str, **kwargs: Any) -> Any:
+        return await self.call("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> Any:
+        return await self.call("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs: Any) -> Any:
+        return await self.call("PUT", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs: Any) -> Any:
+        return await self.call("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs: Any) -> Any:
+        return await self.call("DELETE", path, **kwargs)
+
+
+_client: AppwriteClient | None = None
+
+# Settings that shape the client; changing any of them rebuilds it.
+CLIENT_FIELDS = tuple(
+    name
+    for name in Settings.model_fields
+    if name.startswith("appwrite_") and name not in ("appwrite_database_id", "appwrite_storage_id")
+)
+
+
+def user_headers(jwt: str) -> dict[str, str]:
+    """Per-request headers that authenticate as the JWT's user instead of the
+    server's API key, so Appwrite applies that user's permissions.
+    """
+    return {"X-Appwrite-JWT": jwt, "X-Appwrite-Key": ""}
+
+
+def get_appwrite() -> AppwriteClient:
+    """Return the process-wide Appwrite client started by the app lifespan."""
+    if _client is None or _client.closed:
+        raise RuntimeError("Appwrite client is not running; was appwrite_lifespan registered?")
+    return _client
+
+
+def set_appwrite(client: AppwriteClient | None) -> None:
+    """Install (or clear) the process-wide Appwrite client."""
+    global _client
+    _client = client
+
+
+def _drain_time(config: Settings) -> float:
+    """Upper bound on how long a request started on a client can still run."""
+    return (config.appwrite_timeout + config.appwrite_backoff_max) * (config.appwrite_max_retries + 1)
+
+
+def _client_for(config: Settings) -> AppwriteClient | None:
+    if not config.appwrite_endpoint or not config.appwrite_project_id:
+        # Nothing configured yet (e.g. local UI work); leave the client unset.
+        return None
+    return AppwriteClient.from_settings(config)
+
+
+@contextlib.asynccontextmanager
+async def appwrite_lifespan() -> AsyncIterator[None]:
+    """Open the shared Appwrite client for the lifetime of the Reflex app.
+
+    When the Appwrite settings are reloaded the client is rebuilt in place.
+    Callers that already hold the old client can finish their requests: it
+    is closed once its longest possible request has had time to complete.
+    """
+    retiring: set[asyncio.Task[None]] = set()
+
+    async def retire(client: AppwriteClient, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            await client.aclose()
+
+    def rebuild(old: Settings, new: Settings) -> None:
+        previous = _client
+        set_appwrite(_client_for(new))
+        if previous is not None:
+            task = asyncio.create_task(retire(previous, _drain_time(old)))
+            retiring.add(task)
+            task.add_done_callback(retiring.discard)
+
+    set_appwrite(_client_for(settings.current))
+    unsubscribe = settings.subscribe(rebuild, *CLIENT_FIELDS)
+    try:
+        yield
+    finally:
+        unsubscribe()
+        client = _client
+        set_appwrite(None)
+        for task in list(retiring):
+            task.cancel()
+        await asyncio.gather(*retiring, return_exceptions=True)
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,194 @@
+"""Size-bounded on-disk LRU cache for derived assets (previews, thumbnails).
+
+Entries are files named by a hash of everything that determines their
+bytes, so the same derivation always maps to the same file. They are
+written to a temporary file and renamed into place, so a reader never sees
+a partial entry, and they are served straight from disk (`FileResponse`
+uses the server's zero-copy `pathsend` path when it offers one). Concurrent
+misses for one key share a single build.
+
+The directory scan and the file writes run in worker threads, off the
+event loop. Recency is kept in memory and mirrored to each file's mtime, so
+the LRU order survives a restart. Each worker process indexes the directory once and
+then tracks its own writes, so with several workers sharing a directory the
+size bound holds per worker between trims. The leader's `asset_cache_trim`
+job rescans the directory and restores the bound across all of them; an
+entry evicted by another worker is simply rebuilt on its next miss.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from app.config import Settings, settings
+from app.server.utils.metrics import metrics
+from app.server.utils.scheduler import Scheduler
+
+# Writes `tmp` and returns the entry's content type.
+Producer = Callable[[Path], Awaitable[str]]
+
+# Temporary files older than this are from writes that will never finish.
+STALE_TMP_AGE = 3600.0
+
+asset_cache_requests = metrics.counter(
+    "asset_cache_requests_total", "Derived asset lookups by result.", ("result",)
+)
+asset_cache_bytes = metrics.gauge("asset_cache_bytes", "Bytes of derived assets on disk.")
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable hash of the inputs that determine an asset's bytes."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class AssetCache:
+    """Derived assets on disk under `directory`, at most `max_bytes` in total."""
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, tuple[Path, int]] | None = None  # least recent first
+        self._building: dict[str, asyncio.Task[Path]] = {}
+
+    def _scan(self) -> OrderedDict[str, tuple[Path, int]]:
+        """Entries on disk, oldest mtime first (blocking; run in a thread)."""
+        found = []
+        stale = time.time() - STALE_TMP_AGE
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # renamed or removed by another worker
+                continue
+            if path.suffix == ".tmp":
+                if stat.st_mtime < stale:  # left by an interrupted write
+                    path.unlink(missing_ok=True)
+                continue
+            found.append((stat.st_mtime, path.stem, path, stat.st_size))
+        return OrderedDict((key, (path, size)) for _, key, path, size in sorted(found))
+
+    async def _index(self) -> OrderedDict[str, tuple[Path, int]]:
+        """The tracked entries, scanning the directory on first use."""
+        if self._entries is None:
+            entries = await asyncio.to_thread(self._scan)
+            if self._entries is None:  # a concurrent scan may have finished first
+                self._entries = entries
+                self.total_bytes = sum(size for _, size in entries.values())
+                asset_cache_bytes.set(self.total_bytes)
+        return self._entries
+
+    async def lookup(self, key: str) -> Path | None:
+        """The entry's path if cached, marking it most recently used."""
+        entries = await self._index()
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        path = entry[0]
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # removed behind our back
+            self._drop(key)
+            return None
+        entries.move_to_end(key)
+        return path
+
+    def _drop(self, key: str) -> None:
+        path, size = self._entries.pop(key)
+        path.unlink(missing_ok=True)
+        self.total_bytes -= size
+
+    def evict(self) -> int:
+        """Remove least recently used entries until within `max_bytes`.
+
+        The most recent entry is kept even if it alone exceeds the bound, since
+        it is about to be served. Before the first scan nothing is tracked,
+        so nothing is evicted.
+        """
+        entries = self._entries
+        if entries is None:
+            return 0
+        evicted = 0
+        while self.total_bytes > self.max_bytes and len(entries) > 1:
+            self._drop(next(iter(entries)))
+            evicted += 1
+        asset_cache_bytes.set(self.total_bytes)
+        return evicted
+
+    async def trim(self) -> int:
+        """Rescan the directory, then evict down to `max_bytes` (all workers' entries)."""
+        self._entries = None
+        await self._index()
+        return self.evict()
+
+    @staticmethod
+    def _install(tmp: Path, path: Path) -> int:
+        """Move a finished write into place; returns its size (blocking)."""
+        os.replace(tmp, path)
+        return path.stat().st_size
+
+    async def _build(self, key: str, produce: Producer) -> Path:
+        shard = self.directory / key[:2]
+        await asyncio.to_thread(shard.mkdir, parents=True, exist_ok=True)
+        tmp = shard / f"{key}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+        try:
+            content_type = await produce(tmp)
+            path = shard / f"{key}{mimetypes.guess_extension(content_type.split(';')[0].strip()) or '.bin'}"
+            size = await asyncio.to_thread(self._install, tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        entries = await self._index()
+        if key in entries:  # replaced an entry whose file had vanished
+            self.total_bytes -= entries.pop(key)[1]
+        entries[key] = (path, size)
+        self.total_bytes += size
+        self.evict()
+        return path
+
+    async def get_or_create(self, key: str, produce: Producer) -> Path:
+        """Path of the cached entry for `key`, building it with `produce` on a miss.
+
+        Concurrent misses for the same key await one build; a failed build is
+        not cached, so the next request retries.
+        """
+        if (path := await self.lookup(key)) is not None:
+            asset_cache_requests.inc("hit")
+            return path
+        task = self._building.get(key)
+        if task is None:
+            asset_cache_requests.inc("miss")
+            task = asyncio.create_task(self._build(key, produce))
+            self._building[key] = task
+            task.add_done_callback(lambda _: self._building.pop(key, None))
+        else:
+            asset_cache_requests.inc("shared")
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def content_type(path: Path) -> str:
+        return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+asset_cache = AssetCache(settings.asset_cache_dir, settings.asset_cache_max_bytes)
+
+
+def _reconfigure_asset_cache(_: Settings, new: Settings) -> None:
+    asset_cache.max_bytes = new.asset_cache_max_bytes
+    asset_cache.evict()
+
+
+settings.subscribe(_reconfigure_asset_cache, "asset_cache_max_bytes")
+
+
+def register_asset_cache_jobs(scheduler: Scheduler) -> None:
+    """Keep the shared directory within its bound from the leader."""
+    scheduler.add("asset_cache_trim", asset_cache.trim, every=settings.asset_cache_trim_interval, jitter=10.0)
@@ -0,0 +1,231 @@
+"""Verification of Appwrite JWTs with a per-process cache.
+
+A verified token is cached under the SHA-256 of the token, so a repeat
+check costs a hash and a dict lookup rather than a round trip. An entry
+lasts until the token's own `exp`, and the cache holds at most
+`max_entries` tokens (least recently used go first). A refreshed token is
+a new key, so it is verified once and then cached like the first.
+
+Tokens are verified one of two ways:
+
+- Locally, when `auth_jwt_secret` is set. Self-hosted Appwrite signs JWTs
+  with HS256 under its `_APP_OPENSSL_KEY_V1`. The HMAC key is prepared once
+  and copied per check, and no upstream call is made at all.
+- Upstream otherwise (Appwrite Cloud does not share its key). A cache miss
+  calls `GET /account` with the token; concurrent misses for one token
+  share that call.
+
+Revoking a token, a session or a user takes effect at once in this process.
+A revocation is remembered for `token_max_age` (Appwrite's JWT lifetime),
+after which every token it could have covered has expired anyway. A
+session deleted in Appwrite without calling `revoke_*` stays valid here
+until its cached tokens expire.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import dataclasses
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import Settings, settings
+from app.server.utils.appwrite import AppwriteError, get_appwrite, user_headers
+from app.server.utils.metrics import metrics
+
+auth_verifications = metrics.counter(
+    "auth_verifications_total", "Session token checks by outcome.", ("result",)
+)
+
+
+class AuthError(Exception):
+    """The token is malformed, expired, revoked or rejected by Appwrite."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class VerifiedSession:
+    """The identity a token proved, valid until `expires_at` (epoch seconds)."""
+
+    user_id: str
+    session_id: str
+    expires_at: float
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _claims(token: str) -> tuple[str, str, dict[str, Any]]:
+    """Split a JWT into its signing input, signature segment and payload claims."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        claims = json.loads(_b64decode(payload_b64))
+    except (ValueError, binascii.Error) as e:
+        raise AuthError("malformed token") from e
+    if not isinstance(header, dict) or not isinstance(claims, dict) or header.get("alg") != "HS256":
+        raise AuthError("unsupported token")
+    return f"{header_b64}.{payload_b64}", signature_b64, claims
+
+
+class SessionVerifier:
+    """Checks Appwrite JWTs, caching what it has verified."""
+
+    def __init__(
+        self,
+        secret: str | None,
+        *,
+        max_entries: int = 10_000,
+        token_max_age: float = 900.0,
+        leeway: float = 5.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.token_max_age = token_max_age
+        self.leeway = leeway
+        self.set_secret(secret)
+        self._entries: OrderedDict[bytes, VerifiedSession] = OrderedDict()  # least recent first
+        self._loading: dict[bytes, asyncio.Task[VerifiedSession]] = {}
+        # id -> time the revocation can be forgotten
+        self._revoked_sessions: dict[str, float] = {}
+        self._revoked_users: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_secret(self, secret: str | None) -> None:
+        """Switch local verification on (or off, with None); drops cached tokens."""
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256) if secret else None
+        if hasattr(self, "_entries"):
+            self._entries.clear()
+
+    def _revoked(self, session: VerifiedSession) -> bool:
+        return session.session_id in self._revoked_sessions or session.user_id in self._revoked_users
+
+    async def verify(self, token: str) -> VerifiedSession:
+        """The session `token` belongs to.
+
+        Raises:
+            AuthError: If the token is not valid now.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        session = self._entries.get(key)
+        if session is not None:
+            if session.expires_at > time.time() and not self._revoked(session):
+                self._entries.move_to_end(key)
+                auth_verifications.inc("hit")
+                return session
+            del self._entries[key]
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._verify(token))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        try:
+            session = await asyncio.shield(task)
+        except AuthError:
+            auth_verifications.inc("rejected")
+            raise
+        if self._revoked(session):  # revoked while the check was in flight
+            auth_verifications.inc("rejected")
+            raise AuthError("session revoked")
+        self._entries[key] = session
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return session
+
+    async def _verify(self, token: str) -> VerifiedSession:
+        signing_input, signature, claims = _claims(token)
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at + self.leeway <= time.time():
+            raise AuthError("token expired")
+        user_id, session_id = claims.get("userId"), claims.get("sessionId")
+        if not isinstance(user_id, str) or not isinstance(session_id, str):
+            raise AuthError("token has no user or session")
+        if session_id in self._revoked_sessions or user_id in self._revoked_users:
+            raise AuthError("session revoked")
+
+        if self._mac is not None:
+            mac = self._mac.copy()
+            mac.update(signing_input.encode())
+            expected = base64.urlsafe_b64encode(mac.digest()).rstrip(b"=")
+            if not hmac.compare_digest(expected, signature.encode()):
+                raise AuthError("bad token signature")
+            auth_verifications.inc("local")
+        else:
+            try:
+                # The JWT, not the server's API key, must authenticate this call.
+                account = await get_appwrite().get("/account", headers=user_headers(token))
+            except AppwriteError as e:
+                if e.status_code in (401, 403, 404):
+                    raise AuthError(e.message) from e
+                raise
+            if account.get("$id") != user_id:
+                raise AuthError("token does not match its account")
+            auth_verifications.inc("upstream")
+        return VerifiedSession(user_id, session_id, float(expires_at))
+
+    def _forget(self, revoked: dict[str, float], identity: str) -> int:
+        now = time.time()
+        for stale in [key for key, until in revoked.items() if until <= now]:
+            del revoked[stale]
+        revoked[identity] = now + self.token_max_age + self.leeway
+        dropped = [key for key, session in self._entries.items() if self._revoked(session)]
+        for key in dropped:
+            del self._entries[key]
+        return len(dropped)
+
+    def revoke_session(self, session_id: str) -> int:
+        """Reject every token of `session_id`; returns cached tokens dropped."""
+        return self._forget(self._revoked_sessions, session_id)
+
+    def revoke_user(self, user_id: str) -> int:
+        """Reject every token of every session of `user_id`; returns cached tokens dropped."""
+        return self._forget(self._revoked_users, user_id)
+
+    def revoke(self, token: str) -> int:
+        """Reject `token` and the rest of its session."""
+        try:
+            _, _, claims = _claims(token)
+        except AuthError:
+            return 0
+        session_id = claims.get("sessionId")
+        return self.revoke_session(session_id) if isinstance(session_id, str) else 0
+
+
+session_verifier = SessionVerifier(
+    settings.auth_jwt_secret,
+    max_entries=settings.auth_cache_size,
+    token_max_age=settings.auth_token_max_age,
+    leeway=settings.auth_clock_leeway,
+)
+
+
+def _reconfigure_session_verifier(old: Settings, new: Settings) -> None:
+    session_verifier.max_entries = new.auth_cache_size
+    session_verifier.token_max_age = new.auth_token_max_age
+    session_verifier.leeway = new.auth_clock_leeway
+    if old.auth_jwt_secret != new.auth_jwt_secret:
+        session_verifier.set_secret(new.auth_jwt_secret)
+
+
+settings.subscribe(
+    _reconfigure_session_verifier, "auth_jwt_secret", "auth_cache_size", "auth_token_max_age", "auth_clock_leeway"
+)
+
+
+def admin_key(token: str) -> str:
+    """Digest of an admin token, safe to keep in session state instead of the token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def is_admin_key(key: str) -> bool:
+    """Whether `key` is the digest of `ADMIN_API_TOKEN`; never true while it is unset."""
+    expected = settings.admin_api_token
+    return bool(expected and key) and hmac.compare_digest(key, admin_key(expected))
@@ -0,0 +1,269 @@
+"""Appwrite database documents: cached reads and bulk NDJSON export/import.
+
+`get_document` and `list_documents` read through `query_cache`; anything
+that writes documents should call `query_cache.invalidate` afterwards.
+
+Export walks a collection with cursor pagination and yields one JSON line
+per document. The next page is requested as soon as the current one
+arrives, so sending a page overlaps with fetching the next.
+
+Import reads NDJSON as it arrives, validates each row and writes rows with
+Appwrite's bulk document endpoint, at most `concurrency` batches at a time.
+Reading pauses while that many batches are in flight, so memory stays at
+about `concurrency * batch_size` rows whatever the size of the input.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+import httpx
+
+from app.config import settings
+from app.server.utils import queries
+from app.server.utils.appwrite import AppwriteClient, AppwriteError, get_appwrite
+from app.server.utils.query_cache import query_cache
+
+# Read-only attributes Appwrite adds to every document; dropped on import.
+SYSTEM_ATTRIBUTES = frozenset(
+    {"$createdAt", "$updatedAt", "$collectionId", "$databaseId", "$sequence", "$tenant"}
+)
+# Errors kept in an import report; later ones are only counted.
+MAX_REPORTED_ERRORS = 100
+
+_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,35}")
+
+
+class DocumentImportError(Exception):
+    """An import body that cannot be read any further."""
+
+
+def is_valid_id(value: Any) -> bool:
+    """Whether `value` is a valid Appwrite id (collection or document)."""
+    return isinstance(value, str) and _ID.fullmatch(value) is not None
+
+
+def documents_path(collection: str) -> str:
+    if not settings.appwrite_database_id:
+        raise RuntimeError("APPWRITE_DATABASE_ID must be set")
+    return f"/databases/{settings.appwrite_database_id}/collections/{collection}/documents"
+
+
+async def get_document(collection: str, document_id: str) -> dict[str, Any] | None:
+    """A document from `collection`, or None if it does not exist (cached)."""
+
+    async def fetch() -> dict[str, Any] | None:
+        try:
+            return await get_appwrite().get(f"{documents_path(collection)}/{document_id}")
+        except AppwriteError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    return await query_cache.read((collection, "document", document_id), fetch)
+
+
+async def list_documents(collection: str, *query: str) -> dict[str, Any]:
+    """Appwrite's list response (`total`, `documents`) for `query` (cached)."""
+
+    async def fetch() -> dict[str, Any]:
+        return await get_appwrite().get(documents_path(collection), params=queries.params(*query))
+
+    return await query_cache.read((collection, "list", query), fetch)
+
+
+def _encode(document: dict[str, Any]) -> bytes:
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+
+
+async def export_documents(collection: str, page_size: int) -> AsyncIterator[bytes]:
+    """Every document in `collection`, as NDJSON, one page per chunk.
+
+    Raises:
+        AppwriteError: If a page cannot be read (on the first chunk if the
+            collection does not exist).
+    """
+    client = get_appwrite()
+    path = documents_path(collection)
+
+    def fetch(cursor: str | None) -> asyncio.Task[Any]:
+        page = [queries.limit(page_size)]
+        if cursor is not None:
+            page.append(queries.cursor_after(cursor))
+        return asyncio.create_task(client.get(path, params=queries.params(*page)))
+
+    pending: asyncio.Task[Any] | None = fetch(None)
+    try:
+        while pending is not None:
+            documents = (await pending)["documents"]
+            pending = fetch(documents[-1]["$id"]) if len(documents) == page_size else None
+            if documents:
+                yield b"".join(map(_encode, documents))
+    finally:
+        if pending is not None:  # the client went away mid-export
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+
+async def ndjson_lines(pieces: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[tuple[int, bytes]]:
+    """Split a byte stream into `(line_number, line)` pairs, numbered from 1.
+
+    Raises:
+        DocumentImportError: If a line is longer than `max_line_bytes`.
+    """
+    buffer = bytearray()
+    number = 0
+    async for piece in pieces:
+        buffer += piece
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            number += 1
+            yield number, bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise DocumentImportError(f"line {number + 1} is longer than {max_line_bytes} bytes")
+    if buffer:
+        yield number + 1, bytes(buffer)
+
+
+def prepare_document(row: Any) -> dict[str, Any]:
+    """Validate an imported row and shape it for Appwrite's bulk endpoint.
+
+    System attributes from an export are dropped; a row without `$id`
+    gets a new one, so its id appears in error reports.
+
+    Raises:
+        ValueError: If the row cannot be imported.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("row must be a JSON object")
+    document = {key: value for key, value in row.items() if key not in SYSTEM_ATTRIBUTES}
+    document.setdefault("$id", uuid.uuid4().hex)
+    if not is_valid_id(document["$id"]):
+        raise ValueError(f"invalid $id: {document['$id']!r}")
+    permissions = document.get("$permissions", [])
+    if not isinstance(permissions, list) or not all(isinstance(p, str) for p in permissions):
+        raise ValueError("$permissions must be a list of strings")
+    unknown = sorted(key for key in document if key.startswith("$") and key not in ("$id", "$permissions"))
+    if unknown:
+        raise ValueError(f"unknown system attributes: {', '.join(unknown)}")
+    return document
+
+
+@dataclasses.dataclass
+class ImportReport:
+    """Outcome of an import: row counts plus the first errors, by line."""
+
+    received: int = 0
+    imported: int = 0
+    invalid: int = 0
+    failed: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    aborted: str | None = None
+    errors: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    def error(self, **detail: Any) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(detail)
+
+    def summary(self) -> dict[str, Any]:
+        summary = dataclasses.asdict(self)
+        summary["errors_truncated"] = self.invalid + self.failed_batches > len(self.errors)
+        return summary
+
+
+async def _write_batch(
+    client: AppwriteClient,
+    path: str,
+    documents: list[dict[str, Any]],
+    lines: tuple[int, int],
+    upsert: bool,
+    report: ImportReport,
+) -> None:
+    try:
+        # Upserts are idempotent (PUT), so the client may retry them.
+        await client.call("PUT" if upsert else "POST", path, json={"documents": documents})
+    except AppwriteError as e:
+        status, message = e.status_code, e.message
+    except httpx.HTTPError as e:
+        status, message = None, f"{type(e).__name__}: {e}"
+    else:
+        report.imported += len(documents)
+        return
+    report.failed += len(documents)
+    report.failed_batches += 1
+    report.error(lines=list(lines), documents=len(documents), status=status, message=message)
+
+
+async def import_documents(
+    collection: str,
+    body: AsyncIterable[bytes],
+    *,
+    upsert: bool = False,
+    batch_size: int,
+    concurrency: int,
+    max_line_bytes: int,
+) -> ImportReport:
+    """Write the NDJSON rows in `body` to `collection`.
+
+    Invalid rows are skipped and reported by line; a batch Appwrite rejects
+    is reported with the range of lines it held, and the other batches
+    still go through. With `upsert`, existing documents are replaced
+    instead of failing their batch.
+    """
+    client = get_appwrite()
+    path = documents_path(collection)
+    report = ImportReport()
+    slots = asyncio.Semaphore(concurrency)
+    writing: set[asyncio.Task[None]] = set()
+
+    async def write(documents: list[dict[str, Any]], lines: tuple[int, int]) -> None:
+        try:
+            await _write_batch(client, path, documents, lines, upsert, report)
+        finally:
+            slots.release()
+
+    async def submit(documents: list[dict[str, Any]], lines: tuple[int, int]) -> None:
+        await slots.acquire()  # backpressure: stop reading while batches are full
+        report.batches += 1
+        task = asyncio.create_task(write(documents, lines))
+        writing.add(task)
+        task.add_done_callback(writing.discard)
+
+    batch: list[dict[str, Any]] = []
+    first = last = 0
+    try:
+        async for number, line in ndjson_lines(body, max_line_bytes):
+            if not line.strip():
+                continue
+            report.received += 1
+            try:
+                document = prepare_document(json.loads(line))
+            except ValueError as e:  # includes JSONDecodeError
+                report.invalid += 1
+                report.error(line=number, message=str(e))
+                continue
+            if not batch:
+                first = number
+            batch.append(document)
+            last = number
+            if len(batch) >= batch_size:
+                await submit(batch, (first, last))
+                batch = []
+        if batch:
+            await submit(batch, (first, last))
+    except DocumentImportError as e:
+        report.aborted = str(e)
+    finally:
+        await asyncio.gather(*writing, return_exceptions=True)
+        if report.batches:
+            query_cache.invalidate(collection)
+    return report
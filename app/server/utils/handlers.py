@@ -0,0 +1,68 @@
+"""Kind-preserving wrappers for state event handler functions."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+Enter = Callable[[], Any]
+Exit = Callable[[Any, str], None]
+
+
+def wrap_handler(fn: Callable[..., Any], enter: Enter, exit: Exit) -> Callable[..., Any]:
+    """Run `enter()` before and `exit(token, outcome)` after each handler call.
+
+    `token` is whatever `enter` returned; `outcome` is "ok" or "error". For
+    generator handlers the call ends when the generator is exhausted. The
+    wrapper keeps the function's kind (plain, generator, coroutine or async
+    generator), since Reflex dispatches on it, and via `functools.wraps` its
+    signature and the attributes `@rx.event` sets (background flag, event
+    actions).
+    """
+    if inspect.isasyncgenfunction(fn):
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token, outcome = enter(), "error"
+            try:
+                async for item in fn(*args, **kwargs):
+                    yield item
+                outcome = "ok"
+            finally:
+                exit(token, outcome)
+
+    elif inspect.iscoroutinefunction(fn):
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token, outcome = enter(), "error"
+            try:
+                result = await fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                exit(token, outcome)
+
+    elif inspect.isgeneratorfunction(fn):
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token, outcome = enter(), "error"
+            try:
+                result = yield from fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                exit(token, outcome)
+
+    else:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token, outcome = enter(), "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                exit(token, outcome)
+
+    return functools.wraps(fn)(wrapper)
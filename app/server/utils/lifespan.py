@@ -0,0 +1,26 @@
+"""Ordered composition of app lifespan tasks."""
+
+from __future__ import annotations
+
+import contextlib
+from collections.abc import AsyncIterator, Callable
+from typing import AsyncContextManager
+
+
+def ordered_lifespan(*tasks: Callable[[], AsyncContextManager[None]]) -> Callable[[], AsyncContextManager[None]]:
+    """Combine lifespan context managers into one that enters them in order.
+
+    Reflex keeps lifespan tasks in a set, so separately registered tasks start
+    and stop in arbitrary order. Services that depend on each other (e.g. a
+    write-behind queue that must drain through the Appwrite client) are
+    registered through this instead and shut down in reverse order.
+    """
+
+    @contextlib.asynccontextmanager
+    async def services_lifespan() -> AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as stack:
+            for task in tasks:
+                await stack.enter_async_context(task())
+            yield
+
+    return services_lifespan
@@ -0,0 +1,251 @@
+"""In-process metrics with Prometheus text exposition.
+
+Recording is a dict lookup plus a couple of integer/float increments, with
+no locks: observations come from the event loop thread, and under the GIL a
+rare lost increment from another thread is an acceptable trade for keeping
+instrumentation on in production. Rendering computes cumulative buckets at
+scrape time so the hot path never does.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from reflex.middleware import Middleware
+from reflex.utils import format
+
+from app.server.utils.handlers import wrap_handler
+
+if TYPE_CHECKING:
+    from reflex.app import App
+    from reflex.event import Event
+    from reflex.state import BaseState, StateUpdate
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter, one series per label tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down (e.g. requests in flight)."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram.
+
+    Each series is a flat list of per-bucket counts (the last slot before the
+    sum is `+Inf`) followed by the running sum.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.bounds) + 2)
+        series[bisect_left(self.bounds, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for labels, series in list(self._series.items()):
+            counts, total = series[:-1], series[-1]
+            cumulative = 0
+            for bound, count in zip((*self.bounds, "+Inf"), counts):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_number(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Owns metric instances and renders them in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests served by the API app.", ("method", "route", "status")
+)
+http_latency = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("method", "route")
+)
+http_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+event_calls = metrics.counter(
+    "event_handler_calls_total", "State event handler invocations.", ("handler", "outcome")
+)
+event_latency = metrics.histogram(
+    "event_handler_duration_seconds", "State event handler run time, until the handler returns or is exhausted.", ("handler",)
+)
+event_in_flight = metrics.gauge("event_handlers_in_flight", "State event handlers currently running.", ("handler",))
+state_delta_bytes = metrics.histogram(
+    "state_delta_bytes", "Serialized size of state deltas sent to clients.", ("handler",), SIZE_BUCKETS
+)
+
+# Full event name ("<state full name>.<handler>") -> handler label.
+_handler_labels: dict[str, str] = {}
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording count, latency and in-flight HTTP requests.
+
+    Requests are labelled by the matched route template (Starlette stores the
+    route in the scope), never the raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = "500"
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method, route, status)
+            http_latency.observe(elapsed, method, route)
+
+
+def instrument_handler(fn: Callable[..., Any], state_full_name: str) -> Callable[..., Any]:
+    """Wrap a state event handler function to record its calls and run time."""
+    label = fn.__qualname__
+    _handler_labels[f"{state_full_name}.{fn.__name__}"] = label
+
+    def enter() -> float:
+        event_in_flight.inc(label)
+        return time.perf_counter()
+
+    def exit(start: float, outcome: str) -> None:
+        event_latency.observe(time.perf_counter() - start, label)
+        event_calls.inc(label, outcome)
+        event_in_flight.dec(label)
+
+    return wrap_handler(fn, enter, exit)
+
+
+class StateDeltaMetrics(Middleware):
+    """Reflex middleware recording the serialized size of each state delta."""
+
+    async def preprocess(self, app: App, state: BaseState, event: Event) -> StateUpdate | None:
+        return None
+
+    async def postprocess(self, app: App, state: BaseState, event: Event, update: StateUpdate) -> StateUpdate:
+        if update.delta:
+            label = _handler_labels.get(event.name, "other")
+            state_delta_bytes.observe(len(format.json_dumps(update.delta)), label)
+        return update
+
+
+state_delta_metrics = StateDeltaMetrics()
@@ -0,0 +1,240 @@
+"""Sampled profiling of state event handlers.
+
+A sampled call is profiled in one of two modes:
+
+- "stack": a background thread snapshots the event loop thread's stack every
+  `interval` seconds and writes Brendan Gregg's folded format (`.folded`),
+  ready for flamegraph.pl, speedscope or inferno.
+- "cprofile": deterministic cProfile output (`.prof`), for snakeviz or
+  gprof2dot.
+
+Both observe the whole event loop thread, so time an async handler spends
+awaiting includes whatever other tasks ran meanwhile. At most one call is
+profiled at a time; samples that would overlap are skipped. Background
+handlers are never sampled: a watcher loop runs for the whole session and
+would hold the one sample slot, and its profile, open until it ends.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from reflex.event import BACKGROUND_TASK_MARKER
+
+from app.config import Settings, settings
+from app.server.utils.handlers import wrap_handler
+
+MODES = ("stack", "cprofile")
+SUFFIXES = {"stack": ".folded", "cprofile": ".prof"}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _folded(frame: FrameType | None) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's stack until stopped, then writes folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float, path: Path, on_written: Callable[[], None]) -> None:
+        super().__init__(name="handler_profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.path = path
+        self.on_written = on_written
+        self.stacks: Counter[str] = Counter()
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_folded(frame)] += 1
+        lines = (f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        self.path.write_text("".join(lines))
+        self.on_written()
+
+    def stop(self) -> None:
+        self._halt.set()
+
+
+class HandlerProfiler:
+    """Profiles a random fraction of event handler calls into `directory`.
+
+    Settings are plain attributes so they can be changed at runtime (see the
+    admin profiling routes); the oldest files beyond `keep` are deleted.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        sample_rate: float,
+        mode: str,
+        interval: float,
+        directory: str | Path,
+        keep: int,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval = interval
+        self.directory = Path(directory)
+        self.keep = keep
+        self.sampled = 0
+        self._active = False
+
+    def configure(self, **changes: Any) -> None:
+        """Update settings at runtime.
+
+        Raises:
+            ValueError: If a value is out of range.
+        """
+        if "mode" in changes and changes["mode"] not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if "sample_rate" in changes and not 0.0 <= float(changes["sample_rate"]) <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        for name in ("enabled", "sample_rate", "mode"):
+            if name in changes:
+                setattr(self, name, changes[name])
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "sampled": self.sampled,
+            "directory": str(self.directory),
+            "profiles": [
+                {"name": p.name, "bytes": st.st_size, "modified": st.st_mtime} for p, st in self._listing()
+            ],
+        }
+
+    def _listing(self) -> list[tuple[Path, os.stat_result]]:
+        """`(path, stat)` of each profile file, newest first.
+
+        Files pruned by another sampler while the directory is read are
+        skipped.
+        """
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix not in SUFFIXES.values():
+                continue
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return sorted(entries, key=lambda entry: entry[1].st_mtime, reverse=True)
+
+    def profiles(self) -> list[Path]:
+        """Profile files, newest first."""
+        return [path for path, _ in self._listing()]
+
+    def get_profile(self, name: str) -> Path | None:
+        """A profile by file name, or None (never resolves outside the directory)."""
+        return next((p for p in self.profiles() if p.name == name), None)
+
+    def _prune(self) -> None:
+        for path in self.profiles()[self.keep :]:
+            path.unlink(missing_ok=True)
+
+    def _path(self, label: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{_UNSAFE.sub('_', label)}-{os.getpid()}-{self.sampled}{SUFFIXES[self.mode]}"
+        return self.directory / name
+
+    def _start(self, label: str) -> Any:
+        if not self.enabled or self._active or random.random() >= self.sample_rate:
+            return None
+        self._active = True
+        self.sampled += 1
+        path = self._path(label)
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler (e.g. a debugger) is active
+                self._active = False
+                return None
+            return profile, path
+        sampler = _StackSampler(threading.get_ident(), self.interval, path, self._prune)
+        sampler.start()
+        return sampler, path
+
+    def _finish(self, token: Any, outcome: str) -> None:
+        if token is None:
+            return
+        recorder, path = token
+        self._active = False
+        if isinstance(recorder, _StackSampler):
+            recorder.stop()  # the sampler thread writes its own file
+            return
+        recorder.disable()
+        # Write off the event loop; the profile no longer changes.
+        threading.Thread(target=self._dump, args=(recorder, path), daemon=True).start()
+
+    def _dump(self, profile: cProfile.Profile, path: Path) -> None:
+        profile.dump_stats(path)
+        self._prune()
+
+    def wrap(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a state event handler function for sampled profiling.
+
+        Background handlers are returned unwrapped.
+        """
+        if getattr(fn, BACKGROUND_TASK_MARKER, False):
+            return fn
+        label = fn.__qualname__
+        return wrap_handler(fn, lambda: self._start(label), self._finish)
+
+
+handler_profiler = HandlerProfiler(
+    enabled=settings.profiling_enabled,
+    sample_rate=settings.profiling_sample_rate,
+    mode=settings.profiling_mode,
+    interval=settings.profiling_interval,
+    directory=settings.profiling_dir,
+    keep=settings.profiling_keep,
+)
+
+
+def _reconfigure_profiler(_: Settings, new: Settings) -> None:
+    handler_profiler.configure(
+        enabled=new.profiling_enabled, sample_rate=new.profiling_sample_rate, mode=new.profiling_mode
+    )
+    handler_profiler.interval = new.profiling_interval
+    handler_profiler.keep = new.profiling_keep
+
+
+settings.subscribe(
+    _reconfigure_profiler,
+    "profiling_enabled",
+    "profiling_sample_rate",
+    "profiling_mode",
+    "profiling_interval",
+    "profiling_keep",
+)
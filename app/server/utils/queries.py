@@ -0,0 +1,60 @@
+"""Appwrite query string builders.
+
+Appwrite list endpoints take repeated ``queries[]`` params, each a JSON-encoded
+query object. These helpers keep that encoding in one place.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+def _query(method: str, attribute: str | None = None, values: list[Any] | None = None) -> str:
+    query: dict[str, Any] = {"method": method}
+    if attribute is not None:
+        query["attribute"] = attribute
+    if values is not None:
+        query["values"] = values
+    return json.dumps(query, separators=(",", ":"))
+
+
+def limit(n: int) -> str:
+    return _query("limit", values=[n])
+
+
+def cursor_after(document_id: str) -> str:
+    return _query("cursorAfter", values=[document_id])
+
+
+def cursor_before(document_id: str) -> str:
+    return _query("cursorBefore", values=[document_id])
+
+
+def order_asc(attribute: str) -> str:
+    return _query("orderAsc", attribute)
+
+
+def order_desc(attribute: str) -> str:
+    return _query("orderDesc", attribute)
+
+
+def equal(attribute: str, value: Any) -> str:
+    return _query("equal", attribute, value if isinstance(value, list) else [value])
+
+
+def greater_than(attribute: str, value: Any) -> str:
+    return _query("greaterThan", attribute, [value])
+
+
+def search(attribute: str, value: str) -> str:
+    return _query("search", attribute, [value])
+
+
+def select(*attributes: str) -> str:
+    return _query("select", values=list(attributes))
+
+
+def params(*queries: str, **extra: Any) -> dict[str, Any]:
+    """Build request params for an Appwrite list call."""
+    return {"queries[]": list(queries), **extra}
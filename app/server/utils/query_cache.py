@@ -0,0 +1,169 @@
+"""Read-through cache for Appwrite database reads.
+
+Entries are keyed by collection and query. Reads are made with the
+server's API key, which sees every document, so only serve a cached value
+to callers allowed to see the whole collection. Each entry lives for `ttl`
+seconds (`negative_ttl` for "not found"), and the least recently used
+entries are evicted once the cached values exceed `max_bytes`. Concurrent misses for one key share a single
+upstream read, so dozens of sessions asking for the same reference data at
+once cost one round trip.
+
+Writes made through this process call `invalidate`, which drops the
+affected entries at once; reads that were already in flight when the write
+landed are returned to their callers but not stored. Writes from other
+processes are only picked up when the TTL expires.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.config import Settings, settings
+from app.server.utils.metrics import metrics
+
+# (collection, kind, document id or queries)
+Key = tuple[str, str, Any]
+
+# Bookkeeping per entry on top of its JSON size, for the memory bound.
+ENTRY_OVERHEAD = 200
+
+query_cache_requests = metrics.counter(
+    "query_cache_requests_total", "Database reads by collection and cache result.", ("collection", "result")
+)
+query_cache_invalidations = metrics.counter(
+    "query_cache_invalidations_total", "Cache invalidations by collection.", ("collection",)
+)
+query_cache_bytes = metrics.gauge("query_cache_bytes", "Estimated bytes of cached database reads.")
+
+
+@dataclasses.dataclass(slots=True)
+class _Entry:
+    value: Any
+    expires: float
+    size: int
+
+
+class QueryCache:
+    """TTL + LRU cache of database reads, with single-flight misses."""
+
+    def __init__(self, ttl: float, negative_ttl: float, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Key, _Entry] = OrderedDict()  # least recent first
+        self._collections: dict[str, set[Key]] = {}
+        self._generations: dict[str, int] = {}
+        self._loading: dict[Key, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def read(self, key: Key, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for `key`, calling `fetch` on a miss.
+
+        `fetch` returns None for "not found"; that is cached for
+        `negative_ttl`. Errors are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                query_cache_requests.inc(key[0], "hit")
+                return entry.value
+            self._remove(key)
+        task = self._loading.get(key)
+        if task is None:
+            self.misses += 1
+            query_cache_requests.inc(key[0], "miss")
+            task = asyncio.create_task(self._load(key, fetch))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.hits += 1
+            query_cache_requests.inc(key[0], "shared")
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Key, task: asyncio.Task[Any]) -> None:
+        if self._loading.get(key) is task:  # not replaced after an invalidation
+            del self._loading[key]
+
+    async def _load(self, key: Key, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generations.get(key[0], 0)
+        value = await fetch()
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl > 0 and self._generations.get(key[0], 0) == generation:
+            self._store(key, value, ttl)
+        return value
+
+    def _store(self, key: Key, value: Any, ttl: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        size = ENTRY_OVERHEAD + len(json.dumps(value, separators=(",", ":"), default=str))
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._collections.setdefault(key[0], set()).add(key)
+        self.total_bytes += size
+        self.evict()
+
+    def _remove(self, key: Key) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+        keys = self._collections[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._collections[key[0]]
+
+    def evict(self) -> int:
+        """Drop least recently used entries until within `max_bytes`."""
+        evicted = 0
+        while self.total_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        query_cache_bytes.set(self.total_bytes)
+        return evicted
+
+    def invalidate(self, collection: str, document_id: str | None = None) -> int:
+        """Forget reads a write to `collection` may have changed.
+
+        With `document_id`, that document's reads and all of
+        the collection's list queries go; without it, everything cached for
+        the collection. Returns the number of entries dropped.
+        """
+        self._generations[collection] = self._generations.get(collection, 0) + 1
+        query_cache_invalidations.inc(collection)
+
+        def affected(key: Key) -> bool:
+            return document_id is None or key[1] != "document" or key[2] == document_id
+
+        stale = [key for key in self._collections.get(collection, ()) if affected(key)]
+        for key in stale:
+            self._remove(key)
+        # Later readers start a fresh read instead of joining one from before the write.
+        for key in [key for key in self._loading if key[0] == collection and affected(key)]:
+            del self._loading[key]
+        query_cache_bytes.set(self.total_bytes)
+        return len(stale)
+
+
+query_cache = QueryCache(settings.query_cache_ttl, settings.query_cache_negative_ttl, settings.query_cache_max_bytes)
+
+
+def _reconfigure_query_cache(_: Settings, new: Settings) -> None:
+    query_cache.ttl = new.query_cache_ttl
+    query_cache.negative_ttl = new.query_cache_negative_ttl
+    query_cache.max_bytes = new.query_cache_max_bytes
+    query_cache.evict()
+
+
+settings.subscribe(_reconfigure_query_cache, "query_cache_ttl", "query_cache_negative_ttl", "query_cache_max_bytes")
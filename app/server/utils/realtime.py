@@ -0,0 +1,439 @@
+"""One Appwrite Realtime connection per process, shared by every session.
+
+Sessions `subscribe` to the channels they need and get a `Subscription`,
+a small queue of events. The bridge keeps a reference count per channel
+and holds a single upstream websocket subscribed to their union. Appwrite
+fixes a socket's channels when it connects, so when the union changes the
+bridge opens a socket for the new set before closing the old one, and no
+events are lost in between. Changes that land close together (a burst of
+page loads) are coalesced into one reconnect.
+
+Each upstream event is delivered once to every subscription that listens
+on any of its channels. A subscriber that falls behind loses its oldest
+events rather than growing without bound.
+
+Without `realtime_session` the socket connects as a guest and only sees
+events for resources the `any` role can read; with a session secret it
+authenticates as that user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import json
+import logging
+import random
+import ssl
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Ping,
+    RejectConnection,
+    Request,
+    TextMessage,
+)
+
+from app.config import Settings, settings
+from app.server.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Recently delivered events, remembered to drop the copies that arrive on
+# both sockets while a resubscribe overlaps them.
+_RECENT_EVENTS = 512
+
+realtime_events = metrics.counter("realtime_events_total", "Events received from Appwrite Realtime.")
+realtime_deliveries = metrics.counter("realtime_deliveries_total", "Events queued for subscribers.")
+realtime_dropped = metrics.counter("realtime_dropped_total", "Events dropped by subscribers that fell behind.")
+realtime_connects = metrics.counter("realtime_connects_total", "Upstream Realtime connections opened.", ("result",))
+realtime_subscriptions = metrics.gauge("realtime_subscriptions", "Open realtime subscriptions.")
+realtime_channels = metrics.gauge("realtime_channels", "Channels on the upstream Realtime connection.")
+
+
+class RealtimeError(Exception):
+    """The upstream Realtime socket could not be opened or was rejected."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RealtimeEvent:
+    """One Appwrite Realtime event."""
+
+    events: tuple[str, ...]
+    channels: tuple[str, ...]
+    timestamp: str
+    payload: dict[str, Any]
+
+    @classmethod
+    def from_message(cls, data: dict[str, Any]) -> RealtimeEvent:
+        return cls(
+            tuple(data.get("events", ())),
+            tuple(data.get("channels", ())),
+            str(data.get("timestamp", "")),
+            data.get("payload") or {},
+        )
+
+    @property
+    def name(self) -> str:
+        """The most specific event name, e.g. `databases.db.collections.c.documents.d.create`."""
+        return self.events[0] if self.events else ""
+
+    def summary(self) -> dict[str, str]:
+        """Flat fields for an activity row: action, resource, document id, time."""
+        resource, _, action = self.name.rpartition(".")
+        _, sep, clock = self.timestamp.partition("T")
+        return {
+            "action": action,
+            "resource": resource,
+            "id": str(self.payload.get("$id", "")),
+            "time": clock[:8] if sep else self.timestamp,
+        }
+
+    @property
+    def key(self) -> tuple[str, tuple[str, ...], Any]:
+        return self.timestamp, self.events, self.payload.get("$id")
+
+
+class Subscription:
+    """A session's view of the bridge: the events on its channels, in order."""
+
+    def __init__(self, bridge: RealtimeBridge, channels: frozenset[str], maxsize: int) -> None:
+        self.channels = channels
+        self.dropped = 0
+        self._bridge = bridge
+        self._queue: deque[RealtimeEvent] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def _push(self, event: RealtimeEvent) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            realtime_dropped.inc()
+        self._queue.append(event)
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> list[RealtimeEvent]:
+        """Every queued event, waiting up to `timeout` seconds for the first.
+
+        Returns an empty list on timeout, so callers can check whether they
+        are still wanted.
+        """
+        if not self._queue:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._ready.wait(), timeout)
+        batch = list(self._queue)
+        self._queue.clear()
+        self._ready.clear()
+        return batch
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._bridge._release(self)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _Socket:
+    """A client websocket over asyncio streams (wsproto does the framing)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, ws: WSConnection) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.ws = ws
+        self._text: list[str] = []
+
+    @classmethod
+    async def open(cls, url: str, timeout: float) -> _Socket:
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        port = parts.port or (443 if secure else 80)
+        target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=ssl.create_default_context() if secure else None),
+            timeout,
+        )
+        socket = cls(reader, writer, WSConnection(ConnectionType.CLIENT))
+        try:
+            await socket._send(Request(host=parts.netloc, target=target))
+            async with asyncio.timeout(timeout):
+                while True:
+                    data = await reader.read(65536)
+                    socket.ws.receive_data(data or None)
+                    for event in socket.ws.events():
+                        if isinstance(event, AcceptConnection):
+                            return socket
+                        if isinstance(event, RejectConnection):
+                            raise RealtimeError(f"handshake rejected with HTTP {event.status_code}")
+                    if not data:
+                        raise RealtimeError("connection closed during handshake")
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _send(self, event: Any) -> None:
+        self.writer.write(self.ws.send(event))
+        await self.writer.drain()
+
+    async def send_json(self, message: dict[str, Any]) -> None:
+        await self._send(TextMessage(data=json.dumps(message, separators=(",", ":"))))
+
+    async def receive(self, timeout: float) -> list[dict[str, Any]] | None:
+        """Messages that arrived within `timeout` (possibly none); None once closed."""
+        try:
+            data = await asyncio.wait_for(self.reader.read(65536), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.ws.receive_data(data or None)
+        messages = []
+        for event in self.ws.events():
+            if isinstance(event, TextMessage):
+                self._text.append(event.data)
+                if event.message_finished:
+                    messages.append(json.loads("".join(self._text)))
+                    self._text.clear()
+            elif isinstance(event, Ping):
+                await self._send(event.response())
+            elif isinstance(event, CloseConnection):
+                with contextlib.suppress(Exception):
+                    await self._send(event.response())
+                return None
+        return messages if data else None
+
+    async def close(self) -> None:
+        with contextlib.suppress(Exception):
+            await self._send(CloseConnection(code=1000))
+        self.writer.close()
+        with contextlib.suppress(Exception):
+            await self.writer.wait_closed()
+
+
+@dataclasses.dataclass
+class _Upstream:
+    target: tuple[str, str | None]  # (url, session)
+    channels: frozenset[str]
+    socket: _Socket
+    task: asyncio.Task[None] | None = None
+
+
+class RealtimeBridge:
+    """Reference-counted channel subscriptions over one upstream socket."""
+
+    def __init__(
+        self,
+        *,
+        heartbeat: float = 20.0,
+        resubscribe_delay: float = 0.5,
+        queue_size: int = 100,
+        connect_timeout: float = 10.0,
+        backoff_max: float = 30.0,
+    ) -> None:
+        self.heartbeat = heartbeat
+        self.resubscribe_delay = resubscribe_delay
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
+        self.backoff_max = backoff_max
+        self.connects = 0
+        self._refs: dict[str, int] = {}
+        self._listeners: dict[str, set[Subscription]] = {}
+        self._changed = asyncio.Event()
+        self._recent: deque[tuple[Any, ...]] = deque(maxlen=_RECENT_EVENTS)
+        self._recent_keys: set[tuple[Any, ...]] = set()
+        self._upstream: _Upstream | None = None
+
+    @property
+    def channels(self) -> frozenset[str]:
+        """Channels some live subscription needs."""
+        return frozenset(self._refs)
+
+    @property
+    def connected_channels(self) -> frozenset[str]:
+        """Channels the upstream socket is currently subscribed to."""
+        return self._upstream.channels if self._upstream else frozenset()
+
+    def subscribe(self, channels: Iterable[str], maxsize: int | None = None) -> Subscription:
+        """Start receiving events on `channels`; close the subscription when done."""
+        subscription = Subscription(self, frozenset(channels), maxsize or self.queue_size)
+        for channel in subscription.channels:
+            self._refs[channel] = self._refs.get(channel, 0) + 1
+            self._listeners.setdefault(channel, set()).add(subscription)
+            if self._refs[channel] == 1:
+                self._changed.set()
+        realtime_subscriptions.inc()
+        return subscription
+
+    def _release(self, subscription: Subscription) -> None:
+        for channel in subscription.channels:
+            self._listeners[channel].discard(subscription)
+            self._refs[channel] -= 1
+            if not self._refs[channel]:
+                del self._refs[channel], self._listeners[channel]
+                self._changed.set()
+        realtime_subscriptions.dec()
+
+    def refresh(self) -> None:
+        """Reconnect on the next pass (e.g. after the endpoint changed)."""
+        if self._upstream is not None:
+            self._upstream.target = ("", None)
+        self._changed.set()
+
+    def _target(self) -> tuple[str, str | None]:
+        config = settings.current
+        if not config.appwrite_endpoint or not config.appwrite_project_id:
+            raise RealtimeError("APPWRITE_ENDPOINT and APPWRITE_PROJECT_ID must be set")
+        endpoint = config.appwrite_endpoint.rstrip("/")
+        scheme, _, rest = endpoint.partition("://")
+        base = f"{'wss' if scheme == 'https' else 'ws'}://{rest}/realtime"
+        return base, config.realtime_session
+
+    def dispatch(self, event: RealtimeEvent) -> int:
+        """Queue `event` for every subscription on its channels; returns how many."""
+        key = event.key
+        if key in self._recent_keys:
+            return 0
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_keys.discard(self._recent[0])
+        self._recent.append(key)
+        self._recent_keys.add(key)
+        realtime_events.inc()
+
+        delivered: set[Subscription] = set()
+        for channel in event.channels:
+            for subscription in self._listeners.get(channel, ()):
+                if subscription not in delivered:
+                    delivered.add(subscription)
+                    subscription._push(event)
+        realtime_deliveries.inc(amount=len(delivered))
+        return len(delivered)
+
+    async def _open(self, target: tuple[str, str | None], channels: frozenset[str]) -> _Upstream:
+        url, session = target
+        query = urlencode([("project", settings.appwrite_project_id)] + [("channels[]", c) for c in sorted(channels)])
+        try:
+            socket = await _Socket.open(f"{url}?{query}", self.connect_timeout)
+            if session:
+                await socket.send_json({"type": "authentication", "data": {"session": session}})
+        except (OSError, asyncio.TimeoutError, RealtimeError):
+            realtime_connects.inc("error")
+            raise
+        self.connects += 1
+        realtime_connects.inc("ok")
+        upstream = _Upstream(target, channels, socket)
+        upstream.task = asyncio.create_task(self._pump(socket), name="realtime_pump")
+        return upstream
+
+    async def _pump(self, socket: _Socket) -> None:
+        """Read one socket until it closes, dispatching events and sending heartbeats."""
+        next_ping = time.monotonic() + self.heartbeat
+        while True:
+            messages = await socket.receive(max(0.0, next_ping - time.monotonic()))
+            if messages is None:
+                return
+            for message in messages:
+                kind = message.get("type")
+                if kind == "event":
+                    self.dispatch(RealtimeEvent.from_message(message.get("data") or {}))
+                elif kind == "error":
+                    logger.warning("Appwrite Realtime error: %s", message.get("data"))
+            if time.monotonic() >= next_ping:
+                await socket.send_json({"type": "ping"})
+                next_ping = time.monotonic() + self.heartbeat
+
+    async def _retire(self, upstream: _Upstream | None) -> None:
+        if upstream is None:
+            return
+        if upstream.task is not None:
+            upstream.task.cancel()
+            await asyncio.gather(upstream.task, return_exceptions=True)
+        await upstream.socket.close()
+
+    async def run(self) -> None:
+        """Keep the upstream socket subscribed to the channels in use."""
+        failures = 0
+        while True:
+            self._changed.clear()
+            wanted = self.channels
+            upstream = self._upstream
+            try:
+                target = self._target() if wanted else None
+            except RealtimeError as e:
+                logger.warning("Realtime bridge idle: %s", e)
+                target = None
+            if target is None:
+                self._upstream = None
+                await self._retire(upstream)
+            elif upstream is None or upstream.target != target or upstream.channels != wanted:
+                try:
+                    # Make before break: the old socket keeps delivering until
+                    # the new one is subscribed.
+                    self._upstream = await self._open(target, wanted)
+                except (OSError, asyncio.TimeoutError, RealtimeError) as e:
+                    failures += 1
+                    delay = random.uniform(0, min(self.backoff_max, 0.5 * 2**failures))
+                    logger.warning("Realtime connect failed (%s); retrying in %.1fs", e, delay)
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                await self._retire(upstream)
+            realtime_channels.set(len(self.connected_channels))
+
+            waits = [asyncio.ensure_future(self._changed.wait())]
+            if self._upstream is not None and self._upstream.task is not None:
+                waits.append(self._upstream.task)
+            try:
+                await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waits[0].cancel()
+            current = self._upstream
+            if current is not None and current.task is not None and current.task.done():
+                error = None if current.task.cancelled() else current.task.exception()
+                logger.warning("Realtime connection closed (%s); reconnecting", error or "by server")
+                self._upstream = None
+                await self._retire(current)
+                await asyncio.sleep(random.uniform(0, 1))
+            else:
+                await asyncio.sleep(self.resubscribe_delay)  # coalesce subscription churn
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Run the bridge for the app's lifetime."""
+        task = asyncio.create_task(self.run(), name="realtime_bridge")
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            upstream, self._upstream = self._upstream, None
+            await self._retire(upstream)
+
+
+realtime_bridge = RealtimeBridge(
+    heartbeat=settings.realtime_heartbeat,
+    resubscribe_delay=settings.realtime_resubscribe_delay,
+    queue_size=settings.realtime_queue_size,
+)
+
+
+def _reconfigure_realtime(_: Settings, new: Settings) -> None:
+    realtime_bridge.heartbeat = new.realtime_heartbeat
+    realtime_bridge.resubscribe_delay = new.realtime_resubscribe_delay
+    realtime_bridge.queue_size = new.realtime_queue_size
+
+
+settings.subscribe(_reconfigure_realtime, "realtime_heartbeat", "realtime_resubscribe_delay", "realtime_queue_size")
+settings.subscribe(
+    lambda old, new: realtime_bridge.refresh(), "appwrite_endpoint", "appwrite_project_id", "realtime_session"
+)
@@ -0,0 +1,303 @@
+"""Periodic background jobs, run on one worker at a time.
+
+Each job is an async callable that runs on a fixed interval or a cron
+schedule (UTC), plus an optional random jitter, and is cancelled after a
+timeout. Runs of one job never overlap. When a run ends, its outcome and
+duration go to the `scheduler_job_*` metrics.
+
+With several backend workers, every worker runs the same scheduler. Jobs
+that do shared work (`leader_only`, the default) only run on the worker that
+holds the lease. The others skip them and keep trying to take the lease over
+every `lease_interval`. Jobs that refresh per-process state run everywhere.
+
+`FileLease` is an exclusive lock on a file in `scheduler_dir`. The OS drops
+it when the holder exits or crashes, so another worker takes over within
+one `lease_interval`. It elects one leader per host, or per shared
+filesystem with working locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import os
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Protocol
+
+from app.config import settings
+from app.server.utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+job_runs = metrics.counter("scheduler_job_runs_total", "Background job runs by outcome.", ("job", "result"))
+job_duration = metrics.histogram("scheduler_job_duration_seconds", "Background job run time.", ("job",))
+job_last_success = metrics.gauge(
+    "scheduler_job_last_success_timestamp_seconds", "When each job last finished successfully.", ("job",)
+)
+scheduler_leader = metrics.gauge("scheduler_leader", "1 while this worker runs the leader-only jobs.")
+
+Task = Callable[[], Awaitable[Any]]
+
+# (lowest, highest) of minute, hour, day of month, month, day of week.
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class CronSchedule:
+    """A five-field cron expression (`minute hour day month weekday`), in UTC.
+
+    Fields take `*`, numbers, ranges `a-b`, steps `*/n` or `a-b/n`, and
+    comma-separated lists of those. Weekdays run 0-6 from Sunday (7 is also
+    Sunday). As in cron, when both day fields are restricted a day matching
+    either one is due.
+    """
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse(field, low, high) for field, (low, high) in zip(fields, _CRON_FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> set[int]:
+        values: set[int] = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            if span == "*":
+                start, end = low, high
+            elif "-" in span:
+                start, end = (int(n) for n in span.split("-", 1))
+            else:
+                start = int(span)
+                end = high if step else start
+            stride = int(step) if step else 1
+            if not low <= start <= end <= high or stride < 1:
+                raise ValueError(f"cron field out of range: {field!r}")
+            values.update(range(start, end + 1, stride))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        if moment.month not in self.months:
+            return False
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first minute strictly after `moment` that the schedule matches."""
+        moment = moment.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(100_000):  # > 4 years of days, plus hours and minutes of the matching ones
+            if not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"cron expression never matches: {self.expression!r}")
+
+
+class Lease(Protocol):
+    """Leadership shared by the workers; at most one holds it at a time."""
+
+    def acquire(self) -> bool:
+        """Take or keep the lease without waiting; whether it is held now."""
+        ...
+
+    def release(self) -> None:
+        """Give the lease up, if held."""
+        ...
+
+
+class FileLease:
+    """Leadership held as an exclusive, non-blocking lock on `path`."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fd: int | None = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())  # who leads, for whoever looks
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # closing drops the lock
+            self._fd = None
+
+
+@dataclasses.dataclass(eq=False)
+class Job:
+    """A registered job and when it is next due."""
+
+    name: str
+    run: Task
+    every: float | None = None
+    cron: CronSchedule | None = None
+    jitter: float = 0.0
+    timeout: float | None = None
+    leader_only: bool = True
+    last_result: str = ""
+    last_run: float = 0.0
+
+    def next_due(self, now: float, started: float | None) -> float:
+        """Epoch time of the next run; `started` is when the last one began."""
+        if self.cron is not None:
+            due = self.cron.next_after(datetime.fromtimestamp(now, timezone.utc)).timestamp()
+        elif started is None:
+            due = now  # interval jobs run once at startup
+        else:
+            due = max(now, started + self.every)
+        return due + random.uniform(0, self.jitter)
+
+
+class Scheduler:
+    """Runs registered jobs for the lifetime of the app."""
+
+    def __init__(self, lease: Lease, *, lease_interval: float = 5.0, default_timeout: float | None = None) -> None:
+        self.lease = lease
+        self.lease_interval = lease_interval
+        self.default_timeout = default_timeout
+        self.jobs: dict[str, Job] = {}
+        self.is_leader = False
+        # Overrides `settings.scheduler_enabled` when set (e.g. off in a Function container).
+        self.enabled: bool | None = None
+
+    def add(
+        self,
+        name: str,
+        run: Task,
+        *,
+        every: float | None = None,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        timeout: float | None = None,
+        leader_only: bool = True,
+    ) -> Job:
+        """Register `run` to be called every `every` seconds or on `cron`.
+
+        Registering a name again replaces that job (`create_app` may run
+        more than once per process).
+
+        Raises:
+            ValueError: If the schedule is missing or invalid.
+        """
+        if (every is None) == (cron is None):
+            raise ValueError("give exactly one of every or cron")
+        if every is not None and every <= 0:
+            raise ValueError("every must be positive")
+        job = Job(
+            name,
+            run,
+            every=every,
+            cron=CronSchedule(cron) if cron is not None else None,
+            jitter=jitter,
+            timeout=timeout if timeout is not None else self.default_timeout,
+            leader_only=leader_only,
+        )
+        self.jobs[name] = job
+        return job
+
+    def _elect(self) -> None:
+        try:
+            leader = self.lease.acquire()
+        except OSError:
+            logger.exception("Scheduler lease check failed")
+            leader = False
+        if leader != self.is_leader:
+            logger.info("Scheduler %s leadership (pid %d)", "took" if leader else "lost", os.getpid())
+            self.is_leader = leader
+            scheduler_leader.set(int(leader))
+
+    async def _campaign(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_interval)
+            self._elect()
+
+    async def run_job(self, job: Job) -> str:
+        """Run `job` once now, recording its outcome; returns `ok`, `error` or `timeout`."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(job.run(), job.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job %s timed out after %gs", job.name, job.timeout)
+            result = "timeout"
+        except Exception:
+            logger.exception("Job %s failed", job.name)
+            result = "error"
+        else:
+            result = "ok"
+            job_last_success.set(time.time(), job.name)
+        job_duration.observe(time.perf_counter() - start, job.name)
+        job_runs.inc(job.name, result)
+        job.last_result, job.last_run = result, time.time()
+        return result
+
+    async def _loop(self, job: Job) -> None:
+        started: float | None = None
+        while True:
+            due = job.next_due(time.time(), started)
+            await asyncio.sleep(max(0.0, due - time.time()))
+            started = time.time()
+            if self.is_leader or not job.leader_only:
+                await self.run_job(job)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Elect a leader and run every job's schedule until shutdown."""
+        if not (settings.scheduler_enabled if self.enabled is None else self.enabled):
+            yield
+            return
+        self._elect()
+        tasks = [asyncio.create_task(self._campaign(), name="scheduler_lease")]
+        tasks += [asyncio.create_task(self._loop(job), name=f"job:{job.name}") for job in self.jobs.values()]
+        try:
+            yield
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.lease.release()
+            self.is_leader = False
+            scheduler_leader.set(0)
+
+
+scheduler = Scheduler(
+    FileLease(Path(settings.scheduler_dir) / "leader.lock"),
+    lease_interval=settings.scheduler_lease_interval,
+    default_timeout=settings.scheduler_job_timeout,
+)
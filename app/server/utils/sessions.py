@@ -0,0 +1,27 @@
+"""Helpers for inspecting live Reflex websocket sessions."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import reflex as rx
+
+
+def current_app() -> rx.App:
+    """The running Reflex app instance."""
+    from reflex.utils.prerequisites import get_app
+
+    return get_app().app
+
+
+def connected_tokens() -> Mapping[str, str]:
+    """Client tokens with an open websocket, mapped to their socket ids."""
+    namespace = current_app().event_namespace
+    return namespace.token_to_sid if namespace is not None else {}
+
+
+def is_connected(token: str) -> bool:
+    """Whether the given client token currently has an open websocket."""
+    return token in connected_tokens()
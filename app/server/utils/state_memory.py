@@ -0,0 +1,199 @@
+"""Per-session state memory accounting and idle-session eviction."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import pickle
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import TYPE_CHECKING, Any
+
+from reflex.middleware import Middleware
+
+from app.config import Settings, settings
+from app.server.utils.sessions import connected_tokens, current_app
+
+if TYPE_CHECKING:
+    from reflex.app import App
+    from reflex.event import Event
+    from reflex.state import BaseState, StateUpdate
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActivity(Middleware):
+    """Records the last time each client token sent an event."""
+
+    def __init__(self) -> None:
+        self.last_seen: dict[str, float] = {}
+
+    async def preprocess(self, app: App, state: BaseState, event: Event) -> StateUpdate | None:
+        self.last_seen[event.token] = time.monotonic()
+        return None
+
+    def idle_for(self, token: str, now: float | None = None) -> float:
+        """Seconds since `token` last sent an event (infinite if never seen)."""
+        seen = self.last_seen.get(token)
+        return float("inf") if seen is None else (now or time.monotonic()) - seen
+
+    def prune(self, idle_ttl: float) -> int:
+        """Forget tokens idle for over `idle_ttl`; returns how many were dropped.
+
+        Only in-process states are evicted, so under the Redis and disk
+        managers nothing else would ever remove a departed token.
+        """
+        cutoff = time.monotonic() - idle_ttl
+        stale = [token for token, seen in self.last_seen.items() if seen < cutoff]
+        for token in stale:
+            del self.last_seen[token]
+        return len(stale)
+
+
+session_activity = SessionActivity()
+
+
+def _walk(state: BaseState) -> Iterator[BaseState]:
+    yield state
+    for substate in state.substates.values():
+        yield from _walk(substate)
+
+
+def _substate_bytes(state: BaseState) -> int:
+    """Serialized size of one substate's own vars (parent/children excluded)."""
+    try:
+        return len(pickle.dumps(state))
+    except Exception:
+        return 0
+
+
+def live_states() -> dict[str, BaseState]:
+    """Root states held in this process, keyed by client token.
+
+    Memory and disk managers keep states in `states`; Redis keeps nothing
+    in-process, so it reports no sessions here.
+    """
+    return getattr(current_app().state_manager, "states", {})
+
+
+def state_memory_report() -> dict[str, Any]:
+    """Serialized bytes per substate, summed over every live session."""
+    states = dict(live_states())
+    connected = connected_tokens()
+    now = time.monotonic()
+    substates: dict[str, dict[str, int]] = {}
+    total = 0
+    for root in states.values():
+        for substate in _walk(root):
+            size = _substate_bytes(substate)
+            entry = substates.setdefault(substate.get_full_name(), {"bytes": 0, "sessions": 0, "max_bytes": 0})
+            entry["bytes"] += size
+            entry["sessions"] += 1
+            entry["max_bytes"] = max(entry["max_bytes"], size)
+            total += size
+    sessions = len(states)
+    idle = sum(1 for token in states if session_activity.idle_for(token, now) > settings.state_idle_ttl)
+    return {
+        "manager": type(current_app().state_manager).__name__,
+        "sessions": sessions,
+        "connected": sum(1 for token in states if token in connected),
+        "idle": idle,
+        "total_bytes": total,
+        "bytes_per_session": total // sessions if sessions else 0,
+        "bytes_per_1000_sessions": total * 1000 // sessions if sessions else 0,
+        "substates": dict(sorted(substates.items(), key=lambda item: -item[1]["bytes"])),
+        "policy": {
+            "idle_ttl": settings.state_idle_ttl,
+            "max_sessions": settings.state_max_sessions,
+        },
+        "evicted": state_evictor.evicted,
+    }
+
+
+class StateEvictor:
+    """Drops idle sessions from process memory.
+
+    A session is evictable once it is disconnected and has sent no events for
+    `idle_ttl` seconds. With `max_sessions` set, the least recently active
+    disconnected sessions are also evicted down to the cap. The disk state
+    manager has already persisted these states, so they are reloaded on the
+    next event; with the memory manager the client simply rehydrates.
+    """
+
+    def __init__(self, idle_ttl: float, interval: float, max_sessions: int = 0) -> None:
+        self.idle_ttl = idle_ttl
+        self.interval = interval
+        self.max_sessions = max_sessions
+        self.evicted = 0
+
+    def _candidates(self, states: dict[str, BaseState]) -> list[str]:
+        now = time.monotonic()
+        connected = connected_tokens()
+        idle = sorted(
+            (token for token in states if token not in connected),
+            key=lambda token: -session_activity.idle_for(token, now),
+        )
+        expired = [token for token in idle if session_activity.idle_for(token, now) > self.idle_ttl]
+        if self.max_sessions and len(states) - len(expired) > self.max_sessions:
+            overflow = len(states) - self.max_sessions
+            expired = idle[: max(overflow, len(expired))]
+        return expired
+
+    def evict_idle(self) -> int:
+        """Evict idle sessions now; returns how many were dropped."""
+        manager = current_app().state_manager
+        states = live_states()
+        locks: dict[str, asyncio.Lock] = getattr(manager, "_states_locks", {})
+        pending_writes: dict[str, Any] = getattr(manager, "_write_queue", {})
+        touched: dict[str, float] = getattr(manager, "_token_last_touched", {})
+        evicted = 0
+        for token in self._candidates(states):
+            lock = locks.get(token)
+            if (lock is not None and lock.locked()) or token in pending_writes:
+                continue
+            states.pop(token, None)
+            locks.pop(token, None)
+            touched.pop(token, None)
+            session_activity.last_seen.pop(token, None)
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if evicted := self.evict_idle():
+                    logger.info("Evicted %d idle session states", evicted)
+            except Exception:
+                logger.exception("Idle session eviction failed")
+            # An idle token reads as idle forever either way, so this never changes a decision.
+            session_activity.prune(self.idle_ttl)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Run the eviction loop for the app's lifetime."""
+        task = asyncio.create_task(self.run(), name="state_evictor")
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+state_evictor = StateEvictor(
+    settings.state_idle_ttl,
+    settings.state_eviction_interval,
+    settings.state_max_sessions,
+)
+
+
+def _reconfigure_evictor(_: Settings, new: Settings) -> None:
+    state_evictor.idle_ttl = new.state_idle_ttl
+    state_evictor.interval = new.state_eviction_interval
+    state_evictor.max_sessions = new.state_max_sessions
+
+
+settings.subscribe(_reconfigure_evictor, "state_idle_ttl", "state_eviction_interval", "state_max_sessions")
@@ -0,0 +1,298 @@
+"""Streaming transfers to and from the Appwrite storage bucket.
+
+Uploads use Appwrite's chunked protocol: the file is sent as consecutive
+`CHUNK_SIZE` pieces, each a multipart request carrying a `Content-Range`
+header and the same file id. Appwrite records how many chunks it has, so an
+interrupted upload resumes from `chunksUploaded * CHUNK_SIZE`.
+
+Nothing here holds more than one chunk of a file (plus the piece being
+read) in memory, whatever the file size.
+
+Every call is made as the end user: the caller's JWT replaces the server
+key, so Appwrite applies the bucket's and each file's permissions. New
+files are readable and writable by their uploader only; the bucket must
+grant users `create`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.config import settings
+from app.server.utils.appwrite import AppwriteError, get_appwrite, user_headers
+from app.server.utils.asset_cache import cache_key
+from app.server.utils.query_cache import query_cache
+
+# Fixed by Appwrite: every chunk but the last must be exactly this size.
+CHUNK_SIZE = 5 * 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+_UNSAFE_NAME = re.compile(r'["\\\x00-\x1f\x7f]')
+
+
+class UploadError(Exception):
+    """An upload request that cannot be applied (bad range, wrong length)."""
+
+    def __init__(self, message: str, status_code: int = 400, **detail: Any) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclasses.dataclass(frozen=True)
+class ByteRange:
+    """Bytes `start`..`end` (inclusive) of a `total`-byte file."""
+
+    start: int
+    end: int
+    total: int
+
+    @classmethod
+    def parse(cls, header: str) -> ByteRange:
+        """Parse a `Content-Range: bytes start-end/total` header.
+
+        Raises:
+            UploadError: If the header is malformed or out of bounds.
+        """
+        match = _CONTENT_RANGE.fullmatch(header.strip())
+        if match is None:
+            raise UploadError("Content-Range must look like 'bytes start-end/total'")
+        start, end, total = map(int, match.groups())
+        if not start <= end < total:
+            raise UploadError("Content-Range is out of bounds")
+        return cls(start, end, total)
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def header(self) -> str:
+        return f"bytes {self.start}-{self.end}/{self.total}"
+
+
+def new_file_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _bucket_collection() -> str:
+    """`query_cache` collection holding the bucket's file metadata."""
+    return f"bucket:{settings.appwrite_storage_id}"
+
+
+def _bucket_path(file_id: str = "") -> str:
+    if not settings.appwrite_storage_id:
+        raise RuntimeError("APPWRITE_STORAGE_ID must be set")
+    path = f"/storage/buckets/{settings.appwrite_storage_id}/files"
+    return f"{path}/{file_id}" if file_id else path
+
+
+async def rechunk(pieces: AsyncIterable[bytes], size: int) -> AsyncIterator[bytes]:
+    """Regroup a byte stream into `size`-byte chunks (the last may be shorter)."""
+    buffer = bytearray()
+    async for piece in pieces:
+        buffer += piece
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class _Parts:
+    """A request body sent as consecutive byte strings, replayable on retry."""
+
+    def __init__(self, *parts: bytes) -> None:
+        self.parts = parts
+
+    def __len__(self) -> int:
+        return sum(map(len, self.parts))
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for part in self.parts:
+            yield part
+
+    def release(self) -> None:
+        # httpx requests sit in reference cycles until the cycle collector
+        # runs; drop the chunk now rather than keep megabytes alive with them.
+        self.parts = ()
+
+
+def owner_permissions(user_id: str) -> tuple[str, ...]:
+    """Appwrite permissions giving `user_id` sole access to a new file."""
+    return (f'read("user:{user_id}")', f'write("user:{user_id}")')
+
+
+def _multipart(
+    file_id: str, name: str, content_type: str, chunk: bytes, permissions: tuple[str, ...] = ()
+) -> tuple[_Parts, str]:
+    """A multipart body (in parts, so the chunk is not copied) and its boundary."""
+    boundary = uuid.uuid4().hex
+    name = _UNSAFE_NAME.sub("_", name) or file_id
+    fields = [("fileId", file_id), *(("permissions[]", p) for p in permissions)]
+    head = (
+        "".join(f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n' for k, v in fields)
+        + f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n'
+        + f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    return _Parts(head, chunk, f"\r\n--{boundary}--\r\n".encode()), boundary
+
+
+async def file_info(file_id: str, jwt: str) -> dict[str, Any] | None:
+    """The file's Appwrite metadata plus `upload_offset`, or None if unknown
+    (or not readable by the JWT's user).
+    """
+    try:
+        info = await get_appwrite().get(_bucket_path(file_id), headers=user_headers(jwt))
+    except AppwriteError as e:
+        if e.status_code == 404:
+            return None
+        raise
+    uploaded = info.get("chunksUploaded", 0)
+    complete = uploaded >= info.get("chunksTotal", 1)
+    info["upload_offset"] = info.get("sizeOriginal", 0) if complete else uploaded * CHUNK_SIZE
+    info["upload_complete"] = complete
+    return info
+
+
+async def cached_file_info(file_id: str, jwt: str, user_id: str) -> dict[str, Any] | None:
+    """`file_info`, read through `query_cache` and cached per user.
+
+    The answer may be up to `query_cache_ttl` old (`query_cache_negative_ttl`
+    for a missing file); uploads through this process invalidate it at once.
+    """
+    key = (_bucket_collection(), "document", (file_id, user_id))
+    return await query_cache.read(key, lambda: file_info(file_id, jwt))
+
+
+async def upload(
+    file_id: str,
+    name: str,
+    content_type: str,
+    span: ByteRange,
+    body: AsyncIterable[bytes],
+    *,
+    jwt: str,
+    user_id: str,
+) -> dict[str, Any]:
+    """Stream `body` (bytes `span.start`..`span.end` of the file) to Appwrite
+    as the JWT's user, who becomes the file's owner.
+
+    `span` must start on a chunk boundary at the file's current upload
+    offset and end on a chunk boundary or at the end of the file. Returns
+    Appwrite's file document after the last chunk.
+
+    Raises:
+        UploadError: If the range does not line up or the body is the wrong length.
+    """
+    if span.start % CHUNK_SIZE or (span.end + 1 != span.total and (span.end + 1) % CHUNK_SIZE):
+        raise UploadError(f"ranges must start and end on {CHUNK_SIZE}-byte chunk boundaries")
+    if span.start:
+        info = await file_info(file_id, jwt)
+        offset = info["upload_offset"] if info else 0
+        if span.start != offset:
+            raise UploadError("upload must resume at the current offset", 409, upload_offset=offset)
+
+    client = get_appwrite()
+    permissions = owner_permissions(user_id)
+    position, document = span.start, None
+    async for chunk in rechunk(body, CHUNK_SIZE):
+        if position + len(chunk) > span.end + 1:
+            raise UploadError("body is longer than its Content-Range", upload_offset=position)
+        if len(chunk) < CHUNK_SIZE and position + len(chunk) != span.total:
+            break  # short body: reported below
+        body_parts, boundary = _multipart(file_id, name, content_type, chunk, permissions)
+        headers = {
+            **user_headers(jwt),
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(body_parts)),
+            "X-Appwrite-ID": file_id,
+        }
+        if span.total > CHUNK_SIZE:
+            headers["Content-Range"] = ByteRange(position, position + len(chunk) - 1, span.total).header()
+        try:
+            document = await client.post(_bucket_path(), content=body_parts, headers=headers)
+        finally:
+            body_parts.release()
+        position += len(chunk)
+    if position != span.end + 1:
+        raise UploadError("body is shorter than its Content-Range", upload_offset=position)
+    # Entries are per user, so drop the whole bucket's rather than one key.
+    query_cache.invalidate(_bucket_collection())
+    return document or {}
+
+
+async def open_download(file_id: str, jwt: str, range_header: str | None = None) -> httpx.Response:
+    """Start streaming the file's bytes as the JWT's user; the caller must
+    close the response.
+
+    A `Range` header is passed through, so partial content comes back as a
+    206 with Appwrite's `Content-Range`.
+    """
+    headers = user_headers(jwt)
+    if range_header:
+        headers["Range"] = range_header
+    return await get_appwrite().request("GET", f"{_bucket_path(file_id)}/download", headers=headers, stream=True)
+
+
+# Query parameters of Appwrite's file preview endpoint.
+PREVIEW_PARAMS = (
+    "width",
+    "height",
+    "gravity",
+    "quality",
+    "borderWidth",
+    "borderColor",
+    "borderRadius",
+    "opacity",
+    "rotation",
+    "background",
+    "output",
+)
+
+
+def preview_key(info: dict[str, Any], params: dict[str, str]) -> str:
+    """Cache key for a preview of the file described by `info`.
+
+    Appwrite never changes a stored file's bytes, but a file id can be
+    deleted and reused, so the key holds the file's creation time and
+    content signature along with the bucket, id and transform parameters.
+    """
+    return cache_key(
+        "preview",
+        settings.appwrite_storage_id,
+        info["$id"],
+        info.get("$createdAt"),
+        info.get("signature"),
+        params,
+    )
+
+
+async def fetch_preview(file_id: str, params: dict[str, str], dest: Path, jwt: str) -> str:
+    """Stream Appwrite's rendering of a preview into `dest`, fetched as the
+    JWT's user; returns its content type.
+
+    Raises:
+        AppwriteError: If Appwrite cannot produce the preview.
+    """
+    response = await get_appwrite().request(
+        "GET", f"{_bucket_path(file_id)}/preview", params=params, headers=user_headers(jwt), stream=True
+    )
+    try:
+        if response.is_error:
+            await response.aread()
+            body = response.json() if response.content else {}
+            message = body.get("message", response.reason_phrase) if isinstance(body, dict) else response.reason_phrase
+            raise AppwriteError(response.status_code, message)
+        # Previews are small: read the whole image, then write it off the loop.
+        await asyncio.to_thread(dest.write_bytes, await response.aread())
+        return response.headers.get("content-type", "application/octet-stream")
+    finally:
+        await response.aclose()
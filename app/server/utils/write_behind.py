@@ -0,0 +1,154 @@
+"""Debounced write-behind queue for persisting state changes off the hot path."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Writer = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """Coalesces writes per key and flushes them in bounded, concurrent batches.
+
+    `enqueue` only merges fields into an in-memory dict, so event handlers
+    never wait on the network. A key is flushed once it has been quiet for
+    `debounce` seconds (or has been dirty for `max_delay`), so a burst of
+    toggles becomes a single write carrying the final values.
+
+    A failed write is retried on later flushes, up to `max_attempts` times,
+    unless `is_permanent(error)` says retrying cannot help; then it is
+    dropped.
+    """
+
+    def __init__(
+        self,
+        writer: Writer,
+        *,
+        debounce: float = 2.0,
+        max_delay: float = 10.0,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        max_attempts: int = 10,
+        is_permanent: Callable[[Exception], bool] = lambda error: False,
+        name: str = "write_behind",
+    ) -> None:
+        self.writer = writer
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.is_permanent = is_permanent
+        self.name = name
+        # key -> (fields, first_dirty_at, last_dirty_at)
+        self._pending: dict[str, tuple[dict[str, Any], float, float]] = {}
+        self._attempts: dict[str, int] = {}  # failed writes per key since its last success
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+        self.writes = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, key: str, fields: dict[str, Any]) -> None:
+        """Merge `fields` into the pending write for `key`."""
+        now = time.monotonic()
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = (dict(fields), now, now)
+        else:
+            entry[0].update(fields)
+            self._pending[key] = (entry[0], entry[1], now)
+
+    def pending(self, key: str) -> dict[str, Any] | None:
+        """Fields for `key` that have not been written yet."""
+        entry = self._pending.get(key)
+        return dict(entry[0]) if entry else None
+
+    def _take_due(self, force: bool) -> list[tuple[str, dict[str, Any]]]:
+        now = time.monotonic()
+        due = []
+        for key, (fields, first, last) in self._pending.items():
+            if force or now - last >= self.debounce or now - first >= self.max_delay:
+                due.append((key, fields))
+                if len(due) >= self.batch_size:
+                    break
+        for key, _ in due:
+            del self._pending[key]
+        return due
+
+    def _requeue(self, key: str, fields: dict[str, Any]) -> None:
+        # Newer values that arrived meanwhile win over the failed ones.
+        newer = self._pending.pop(key, None)
+        self.enqueue(key, fields)
+        if newer is not None:
+            self.enqueue(key, newer[0])
+
+    async def _write(self, semaphore: asyncio.Semaphore, key: str, fields: dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                await self.writer(key, fields)
+            except asyncio.CancelledError:
+                self._requeue(key, fields)
+                raise
+            except Exception as e:
+                self.failures += 1
+                attempts = self._attempts[key] = self._attempts.get(key, 0) + 1
+                if self.is_permanent(e) or attempts >= self.max_attempts:
+                    self.dropped += 1
+                    del self._attempts[key]
+                    logger.error("%s: dropping write for %s after %d attempt(s)", self.name, key, attempts, exc_info=e)
+                    return
+                logger.warning(
+                    "%s: write for %s failed (%s); retry %d of %d", self.name, key, e, attempts, self.max_attempts - 1
+                )
+                self._requeue(key, fields)
+            else:
+                self.writes += 1
+                self._attempts.pop(key, None)
+
+    async def flush(self, force: bool = False) -> int:
+        """Write every due key (or all keys if `force`); returns keys attempted."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        written = 0
+        # One pass over what is pending now; failed keys wait for the next flush.
+        for _ in range(-(-len(self._pending) // self.batch_size)):
+            batch = self._take_due(force)
+            if not batch:
+                break
+            await asyncio.gather(*(self._write(semaphore, key, fields) for key, fields in batch))
+            written += len(batch)
+        return written
+
+    async def run(self) -> None:
+        """Flush loop; ticks at a fraction of the debounce window until stopped."""
+        interval = max(self.debounce / 4, 0.05)
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), interval)
+                return
+            if self._pending:
+                await self.flush()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        """Run the flush loop for the app's lifetime and drain on shutdown."""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run(), name=self.name)
+        try:
+            yield
+        finally:
+            # Let an in-flight flush finish (its batch is no longer pending),
+            # then write everything that is left.
+            self._stopping.set()
+            await self._task
+            await self.flush(force=True)
@@ -1,24 +1,23 @@
 """Base state shared across all pages."""
 
+from typing import Any
+
 import reflex as rx
+from reflex.event import EventHandler
 
-from app.config import settings
+from app.server.utils.metrics import instrument_handler
+from app.server.utils.profiling import handler_profiler
 
 
 class BaseState(rx.State):
     """Base state with shared functionality."""
 
-    # Sidebar
-    sidebar_collapsed: bool = settings.sidebar_default_collapsed
-
-    # Theme managed by Reflex's color_mode
-
-    @rx.event
-    def toggle_sidebar(self):
-        """Toggle sidebar collapsed state."""
-        self.sidebar_collapsed = not self.sidebar_collapsed
+    # Theme managed by Reflex's color_mode; sidebar collapse is a client-side
+    # preference (see app.components.shared.ui_prefs), not server state.
 
-    @rx.event
-    def set_sidebar_collapsed(self, collapsed: bool):
-        """Set sidebar collapsed state explicitly."""
-        self.sidebar_collapsed = collapsed
+    @classmethod
+    def _create_event_handler(cls, fn: Any, event_handler_cls: type[EventHandler] = EventHandler):
+        # Every handler on a page state records call counts and latency, and
+        # can be sampled by the profiler (off unless enabled in Settings).
+        fn = instrument_handler(handler_profiler.wrap(fn), cls.get_full_name())
+        return super()._create_event_handler(fn, event_handler_cls)
@@ -0,0 +1,76 @@
+"""Show that `AdminState` stays the same size as the user count grows.
+
+Pages through a stand-in Appwrite users API with 1k to 1M users and reports
+the serialized size of the admin state, next to what loading every user into
+state would cost. It fails if a session that has not entered the admin
+token gets any users.
+
+Usage:
+    python -m scripts.benchmarks.admin_users_state [--pages 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+
+import reflex as rx
+
+import app.app  # noqa: F401  (registers every state class)
+from app.config import settings
+from app.pages.admin.state import AdminState, _user_row
+from app.server.utils.appwrite import AppwriteClient, set_appwrite
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+TOTALS = (1_000, 10_000, 100_000, 1_000_000)
+
+
+async def _drain(handler, state: AdminState) -> None:
+    """Run an event handler generator to completion, ignoring chained events."""
+    async for _ in handler.fn(state):
+        pass
+
+
+def _admin_state() -> AdminState:
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(AdminState.get_full_name().split(".")[1:])
+
+
+async def main(pages: int) -> int:
+    os.environ["ADMIN_API_TOKEN"] = "bench-admin-token"
+    await settings.reload()
+    print(f"{'users':>10}  {'state bytes':>11}  {'delta bytes':>11}  {'load-all bytes':>14}")
+    for total in TOTALS:
+        async with AppwriteStub() as stub:
+            stub.seed_users(total)
+            client = AppwriteClient(stub.endpoint, "bench")
+            set_appwrite(client)
+
+            state = _admin_state()
+            await _drain(AdminState.load_users, state)
+            if state.users:
+                print("FAIL: users loaded before the admin token was entered")
+                return 1
+            AdminState.unlock_admin.fn(state, {"token": "bench-admin-token"})
+            await _drain(AdminState.load_users, state)
+            for _ in range(pages):
+                await _drain(AdminState.next_users_page, state)
+            state_bytes = len(state._serialize())
+            delta_bytes = len(json.dumps(state.get_delta(), default=str))
+
+            set_appwrite(None)
+            await client.aclose()
+
+        load_all = len(pickle.dumps([_user_row({"$id": f"user{i:08d}", "name": f"User {i}",
+                                                 "email": f"user{i}@example.com"}) for i in range(total)]))
+        print(f"{total:>10,}  {state_bytes:>11,}  {delta_bytes:>11,}  {load_all:>14,}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    raise SystemExit(asyncio.run(main(parser.parse_args().pages)))
@@ -0,0 +1,65 @@
+"""Benchmark the pooled Appwrite client against a local stand-in server.
+
+Compares the shared, pooled `AppwriteClient` with opening a fresh client per
+call (what each event handler would do without the shared pool).
+
+Usage:
+    python -m scripts.benchmarks.appwrite_client [--calls 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.server.utils.appwrite import AppwriteClient
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+CONCURRENCY = (1, 10, 100)
+
+
+async def _run(concurrency: int, calls: int, call) -> float:
+    """Run `calls` requests across `concurrency` workers; return calls/sec."""
+    remaining = calls
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return calls / (time.perf_counter() - start)
+
+
+async def main(calls: int) -> None:
+    async with AppwriteStub() as stub:
+        pooled = AppwriteClient(stub.endpoint, "bench", max_connections=100, max_keepalive=100)
+
+        async def pooled_call() -> None:
+            await pooled.get("/health")
+
+        async def fresh_call() -> None:
+            client = AppwriteClient(stub.endpoint, "bench")
+            try:
+                await client.get("/health")
+            finally:
+                await client.aclose()
+
+        print(f"{'concurrency':>11}  {'pooled calls/s':>15}  {'per-call client/s':>17}")
+        for concurrency in CONCURRENCY:
+            before = stub.connections
+            pooled_rate = await _run(concurrency, calls, pooled_call)
+            pooled_conns = stub.connections - before
+            fresh_rate = await _run(concurrency, calls, fresh_call)
+            print(f"{concurrency:>11}  {pooled_rate:>15,.0f}  {fresh_rate:>17,.0f}   (pooled opened {pooled_conns} connections)")
+
+        await pooled.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().calls))
@@ -0,0 +1,416 @@
+"""Minimal local stand-in for the Appwrite REST API.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to exercise
+the app's Appwrite client without a real Appwrite instance. Handlers are
+registered per method and path prefix and return ``(status, json_body)``;
+a `StreamBody` payload is written piece by piece instead. Websocket
+upgrades on `/v1/realtime` speak the Realtime protocol; `publish` sends an
+event to every socket subscribed to one of its channels.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import dataclasses
+import hashlib
+import hmac
+import json
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Ping, Request, TextMessage
+
+Handler = Callable[[str, str, dict[str, str], bytes], Awaitable[tuple[int, Any]]]
+
+# Stored files are not kept: their bytes are `pattern_bytes(0, size)`, which
+# the uploader sends and the stub checks by hash.
+_PATTERN = bytes(range(256)) * 4096
+
+
+def pattern_bytes(start: int, length: int) -> Iterator[bytes]:
+    """Bytes `start`..`start + length` of the endless 0..255 pattern, in pieces."""
+    while length > 0:
+        offset = start % 256
+        piece = _PATTERN[offset : offset + min(length, len(_PATTERN) - 256)]
+        yield piece
+        start += len(piece)
+        length -= len(piece)
+
+
+@dataclasses.dataclass
+class StreamBody:
+    """A response body produced in pieces, with its total length up front."""
+
+    length: int
+    pieces: AsyncIterator[bytes]
+    headers: dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+class AppwriteStub:
+    """Asyncio HTTP server that mimics a handful of Appwrite endpoints."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self._routes: list[tuple[str, str, Handler]] = []
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.port = 0
+        self.previews_rendered = 0
+        self.realtime_connections = 0
+        self.account_checks = 0
+        self.deleted_sessions: set[str] = set()
+        self._realtime: dict[asyncio.StreamWriter, tuple[WSConnection, frozenset[str]]] = {}
+
+        self.route("GET", "/v1/health", self._ok)
+        self.route("GET", "/v1/databases/", self._ok)
+        self.route("GET", "/v1/storage/buckets/", self._ok)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def route(self, method: str, prefix: str, handler: Handler) -> None:
+        """Register a handler; later registrations take precedence."""
+        self._routes.insert(0, (method, prefix, handler))
+
+    async def _ok(self, method: str, path: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+        return 200, {"status": "pass", "path": path}
+
+    def seed_users(self, count: int) -> None:
+        """Serve `count` synthetic users from `/v1/users` with cursor paging."""
+
+        def user(i: int) -> dict[str, Any]:
+            return {
+                "$id": f"user{i:08d}",
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "status": True,
+                "registration": "2026-01-01T00:00:00.000+00:00",
+            }
+
+        async def list_users(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            page_limit, start, end = 25, 0, None
+            for raw in parse_qs(urlsplit(target).query).get("queries[]", []):
+                query = json.loads(raw)
+                if query["method"] == "limit":
+                    page_limit = query["values"][0]
+                elif query["method"] == "cursorAfter":
+                    start = int(query["values"][0][4:]) + 1
+                elif query["method"] == "cursorBefore":
+                    end = int(query["values"][0][4:])
+            if end is not None:
+                start = max(0, end - page_limit)
+            else:
+                end = min(count, start + page_limit)
+            return 200, {"total": count, "users": [user(i) for i in range(start, end)]}
+
+        self.route("GET", "/v1/users", list_users)
+
+    def seed_storage(self, preview_latency: float = 0.0) -> dict[str, dict[str, Any]]:
+        """Serve Appwrite's chunked upload, ranged download and previews.
+
+        A preview takes `preview_latency` seconds to "render" (on top of the
+        stub's own latency) and is a fixed-size fake image.
+
+        Returns the file table (id -> metadata, including `sha256` of what
+        was uploaded) so callers can check the bytes that arrived.
+        """
+        files: dict[str, dict[str, Any]] = {}
+        hashers: dict[str, Any] = {}
+        chunk_size = 5 * 1024 * 1024
+
+        async def create(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            boundary = headers["content-type"].split("boundary=", 1)[1].encode()
+            fields: dict[str, bytes] = {}
+            for part in body.split(b"--" + boundary)[1:-1]:
+                head, _, value = part.partition(b"\r\n\r\n")
+                name = re.search(rb'name="([^"]+)"', head).group(1).decode()
+                fields[name] = value[:-2]  # trailing CRLF
+            file_id, chunk = fields["fileId"].decode(), fields["file"]
+            start, total = 0, len(chunk)
+            if "content-range" in headers:
+                match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)", headers["content-range"])
+                start, total = int(match[1]), int(match[3])
+            record = files.setdefault(file_id, {
+                "$id": file_id,
+                "name": re.search(rb'filename="([^"]*)"', body).group(1).decode(),
+                "sizeOriginal": total,
+                "chunksTotal": max(1, -(-total // chunk_size)),
+                "chunksUploaded": 0,
+            })
+            if start != record["chunksUploaded"] * chunk_size:
+                return 400, {"message": "chunk out of order", "code": 400, "type": "storage_invalid_content_range"}
+            hasher = hashers.setdefault(file_id, hashlib.sha256())
+            hasher.update(chunk)
+            record["chunksUploaded"] += 1
+            record["sha256"] = hasher.hexdigest()
+            return 201, record
+
+        async def get(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            parts = urlsplit(target).path.split("/")
+            record = files.get(parts[6]) if len(parts) > 6 else None
+            if record is None:
+                return 404, {"message": "File not found", "code": 404, "type": "storage_file_not_found"}
+            if len(parts) == 7:
+                return 200, record
+            if parts[7] == "preview":
+                await asyncio.sleep(preview_latency)
+                self.previews_rendered += 1
+                image = b"\x89PNG\r\n\x1a\n" + hashlib.sha256(target.encode()).digest() * 512
+
+                async def image_pieces() -> AsyncIterator[bytes]:
+                    yield image
+
+                return 200, StreamBody(len(image), image_pieces(), {"Content-Type": "image/png"})
+            size = record["sizeOriginal"]
+            start, end, status = 0, size - 1, 200
+            if match := re.fullmatch(r"bytes=(\d+)-(\d*)", headers.get("range", "")):
+                start, end, status = int(match[1]), min(int(match[2] or size - 1), size - 1), 206
+
+            async def pieces() -> AsyncIterator[bytes]:
+                for piece in pattern_bytes(start, end - start + 1):
+                    yield piece
+
+            extra = {"Content-Type": "application/octet-stream", "Accept-Ranges": "bytes"}
+            if status == 206:
+                extra["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return status, StreamBody(end - start + 1, pieces(), extra)
+
+        self.route("POST", "/v1/storage/buckets/", create)
+        self.route("GET", "/v1/storage/buckets/", get)
+        return files
+
+    def seed_documents(self, collections: dict[str, int]) -> dict[str, dict[str, Any]]:
+        """Serve database documents: gets, cursor-paged lists and (bulk) creates.
+
+        `collections` maps a collection id to a number of synthetic
+        documents (`doc000000000` onwards) to get and list. Documents written to any collection (one at a
+        time, or in bulk with POST/PUT) are recorded by id, without their
+        other attributes, in the returned table (collection -> id -> sha256
+        of the document). As in Appwrite, a bulk create with an id that
+        already exists fails as a whole with 409.
+        """
+        written: dict[str, dict[str, Any]] = {}
+
+        def document(collection: str, i: int) -> dict[str, Any]:
+            return {
+                "$id": f"doc{i:09d}",
+                "$collectionId": collection,
+                "$createdAt": "2026-01-01T00:00:00.000+00:00",
+                "$permissions": [],
+                "title": f"Document {i}",
+                "score": i % 1000,
+                "tags": ["bench", f"group{i % 7}"],
+            }
+
+        def collection_of(target: str) -> str | None:
+            parts = urlsplit(target).path.split("/")  # '', v1, databases, db, collections, c, documents
+            return parts[5] if len(parts) == 7 and parts[6] == "documents" else None
+
+        async def get_document(collection: str, document_id: str) -> tuple[int, Any]:
+            index = int(document_id[3:]) if re.fullmatch(r"doc\d{9}", document_id) else -1
+            if not 0 <= index < collections.get(collection, 0):
+                return 404, {"message": "Document not found", "code": 404, "type": "document_not_found"}
+            return 200, document(collection, index)
+
+        async def list_documents(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            parts = urlsplit(target).path.split("/")
+            if len(parts) == 8 and parts[6] == "documents":
+                return await get_document(parts[5], parts[7])
+            collection = collection_of(target)
+            if collection is None:
+                return 200, {"status": "pass"}
+            if collection not in collections:
+                return 404, {"message": "Collection not found", "code": 404, "type": "collection_not_found"}
+            page_limit, start = 25, 0
+            for raw in parse_qs(urlsplit(target).query).get("queries[]", []):
+                query = json.loads(raw)
+                if query["method"] == "limit":
+                    page_limit = query["values"][0]
+                elif query["method"] == "cursorAfter":
+                    start = int(query["values"][0][3:]) + 1
+            end = min(collections[collection], start + page_limit)
+            documents = [document(collection, i) for i in range(start, end)]
+            return 200, {"total": collections[collection], "documents": documents}
+
+        async def write_documents(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            collection = collection_of(target)
+            if collection is None:
+                return 404, {"message": "Route not found", "code": 404, "type": "general_route_not_found"}
+            payload = json.loads(body)
+            if "documents" in payload:
+                documents = payload["documents"]
+            else:
+                documents = [{**payload["data"], "$id": payload["documentId"]}]
+            table = written.setdefault(collection, {})
+            if method == "POST" and any(doc["$id"] in table for doc in documents):
+                return 409, {"message": "Document already exists", "code": 409, "type": "document_already_exists"}
+            for doc in documents:
+                table[doc["$id"]] = hashlib.sha256(json.dumps(doc, sort_keys=True).encode()).hexdigest()
+            return 201, {"total": len(documents), "documents": documents} if "documents" in payload else documents[0]
+
+        self.route("GET", "/v1/databases/", list_documents)
+        self.route("POST", "/v1/databases/", write_documents)
+        self.route("PUT", "/v1/databases/", write_documents)
+        return written
+
+    def seed_sessions(self, secret: str) -> Callable[[str, str, float], str]:
+        """Serve `GET /v1/account` for JWTs signed with `secret`.
+
+        Returns an issuer `(user_id, session_id, ttl) -> jwt` producing tokens
+        shaped like Appwrite's. Session ids added to `deleted_sessions` are
+        rejected with 401, as are tokens that are expired or badly signed.
+        """
+        key = secret.encode()
+
+        def b64(data: bytes) -> str:
+            return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+        def issue(user_id: str, session_id: str, ttl: float = 900.0) -> str:
+            header = b64(json.dumps({"typ": "JWT", "alg": "HS256"}).encode())
+            claims = b64(json.dumps({"userId": user_id, "sessionId": session_id, "exp": int(time.time() + ttl)}).encode())
+            signature = b64(hmac.new(key, f"{header}.{claims}".encode(), hashlib.sha256).digest())
+            return f"{header}.{claims}.{signature}"
+
+        async def account(method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+            unauthorized = 401, {"message": "User (role: guests) missing scope (account)", "code": 401, "type": "general_unauthorized_scope"}
+            token = headers.get("x-appwrite-jwt", "")
+            if token.count(".") != 2:
+                return unauthorized
+            header, claims, signature = token.split(".")
+            if not hmac.compare_digest(signature, b64(hmac.new(key, f"{header}.{claims}".encode(), hashlib.sha256).digest())):
+                return unauthorized
+            payload = json.loads(base64.urlsafe_b64decode(claims + "=" * (-len(claims) % 4)))
+            if payload["exp"] <= time.time() or payload["sessionId"] in self.deleted_sessions:
+                return unauthorized
+            self.account_checks += 1
+            return 200, {"$id": payload["userId"], "name": payload["userId"], "status": True}
+
+        self.route("GET", "/v1/account", account)
+        return issue
+
+    @property
+    def realtime_sockets(self) -> list[frozenset[str]]:
+        """Channel sets of the open Realtime sockets."""
+        return [channels for _, channels in self._realtime.values()]
+
+    async def publish(self, channels: list[str], events: list[str], payload: dict[str, Any]) -> int:
+        """Send an event to the Realtime sockets on any of `channels`; returns how many."""
+        message = {
+            "type": "event",
+            "data": {
+                "events": events,
+                "channels": channels,
+                "timestamp": f"2026-01-01T00:00:00.{self.requests:06d}+00:00",
+                "payload": payload,
+            },
+        }
+        self.requests += 1
+        text = json.dumps(message)
+        sent = 0
+        for writer, (ws, subscribed) in list(self._realtime.items()):
+            if subscribed.intersection(channels):
+                writer.write(ws.send(TextMessage(data=text)))
+                sent += 1
+        return sent
+
+    async def _serve_realtime(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, head: bytes) -> None:
+        ws = WSConnection(ConnectionType.SERVER)
+        ws.receive_data(head)
+        request = next(event for event in ws.events() if isinstance(event, Request))
+        channels = frozenset(parse_qs(urlsplit(request.target).query).get("channels[]", []))
+        writer.write(ws.send(AcceptConnection()))
+        connected = {"type": "connected", "data": {"channels": sorted(channels), "user": None}}
+        writer.write(ws.send(TextMessage(data=json.dumps(connected))))
+        self.realtime_connections += 1
+        self._realtime[writer] = (ws, channels)
+        try:
+            while data := await reader.read(65536):
+                ws.receive_data(data)
+                for event in ws.events():
+                    if isinstance(event, TextMessage) and json.loads(event.data).get("type") == "ping":
+                        writer.write(ws.send(TextMessage(data='{"type":"pong"}')))
+                    elif isinstance(event, Ping):
+                        writer.write(ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        writer.write(ws.send(event.response()))
+                        return
+        finally:
+            del self._realtime[writer]
+
+    async def start(self) -> AppwriteStub:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> AppwriteStub:
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._serve_realtime(reader, writer, head)
+                    break
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, payload = await self._dispatch(method, target, headers, body)
+
+                if isinstance(payload, StreamBody):
+                    extra = "".join(f"{k}: {v}\r\n" for k, v in payload.headers.items())
+                    writer.write(f"HTTP/1.1 {status} X\r\n{extra}Content-Length: {payload.length}\r\n\r\n".encode())
+                    async for piece in payload.pieces:
+                        writer.write(piece)
+                        await writer.drain()
+                else:
+                    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                    writer.write(
+                        f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                    )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[int, Any]:
+        path = target.split("?", 1)[0]
+        for route_method, prefix, handler in self._routes:
+            if route_method == method and path.startswith(prefix):
+                return await handler(method, target, headers, body)
+        return 404, {"message": f"Route not found: {method} {path}", "code": 404, "type": "general_route_not_found"}
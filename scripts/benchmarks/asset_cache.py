@@ -0,0 +1,103 @@
+"""Preview serving with and without the on-disk asset cache.
+
+Simulates a dashboard page of `--files` previews opened by `--viewers`
+concurrent users (each with a browser's six connections) against the local
+Appwrite stand-in, whose previews take `--render-ms` to produce. "Proxy" streams every request from Appwrite (what
+the page would cost without the cache); "cache" goes through the
+`/api/v1/files/{id}/preview` route. Reports upstream renders and
+throughput, cold (empty cache) and warm.
+
+Usage:
+    python -m scripts.benchmarks.asset_cache [--files 50] [--viewers 20] [--render-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+SECRET = "bench-openssl-key"
+
+
+# A browser opens at most this many HTTP/1.1 connections per host.
+BROWSER_CONNECTIONS = 6
+
+
+async def _page_views(client: httpx.AsyncClient, url: str, files: int, viewers: int) -> float:
+    """Every viewer loads every preview at once; returns requests/sec."""
+
+    async def view() -> None:
+        slots = asyncio.Semaphore(BROWSER_CONNECTIONS)
+
+        async def load(i: int) -> None:
+            async with slots:
+                response = await client.get(url.format(id=f"img{i}"), params={"width": "160", "output": "png"})
+                response.raise_for_status()
+
+        await asyncio.gather(*(load(i) for i in range(files)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(view() for _ in range(viewers)))
+    return files * viewers / (time.perf_counter() - start)
+
+
+async def main(files: int, viewers: int, render_ms: float) -> None:
+    async with AppwriteStub() as stub:
+        table = stub.seed_storage(preview_latency=render_ms / 1000)
+        for i in range(files):
+            table[f"img{i}"] = {"$id": f"img{i}", "sizeOriginal": 1, "chunksTotal": 1, "chunksUploaded": 1}
+        token = stub.seed_sessions(SECRET)("bench-user", "bench-session")
+        os.environ.update(
+            APPWRITE_ENDPOINT=stub.endpoint,
+            APPWRITE_PROJECT_ID="bench",
+            APPWRITE_STORAGE_ID="bench",
+            APPWRITE_JWT_SECRET=SECRET,
+            ASSET_CACHE_DIR=tempfile.mkdtemp(prefix="asset_cache_"),
+        )
+        from app.server.api.routes.v1 import register_file_routes
+        from app.server.utils import appwrite_lifespan, get_appwrite
+        from app.server.utils.asset_cache import asset_cache
+
+        async def proxy_preview(request: Request) -> StreamingResponse:
+            path = f"/storage/buckets/bench/files/{request.path_params['file_id']}/preview"
+            upstream = await get_appwrite().request("GET", path, params=dict(request.query_params), stream=True)
+            return StreamingResponse(upstream.aiter_raw(), media_type="image/png")
+
+        api = Starlette()
+        register_file_routes(api)
+        api.add_route("/proxy/{file_id}", proxy_preview, methods=["GET"])
+
+        async with appwrite_lifespan():
+            transport = httpx.ASGITransport(api)
+            headers = {"X-Appwrite-JWT": token}
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+                print(f"{files} previews x {viewers} viewers, {render_ms:.0f} ms per upstream render")
+                print(f"{'mode':<14}{'requests/s':>12}{'renders':>10}")
+                for label, url in (
+                    ("proxy", "/proxy/{id}"),
+                    ("cache, cold", "/api/v1/files/{id}/preview"),
+                    ("cache, warm", "/api/v1/files/{id}/preview"),
+                ):
+                    before = stub.previews_rendered
+                    rate = await _page_views(client, url, files, viewers)
+                    print(f"{label:<14}{rate:>12,.0f}{stub.previews_rendered - before:>10}")
+        print(f"cache: {len(await asset_cache._index())} entries, {asset_cache.total_bytes / 1024:.0f} KiB on disk")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--viewers", type=int, default=20)
+    parser.add_argument("--render-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.files, args.viewers, args.render_ms))
@@ -0,0 +1,171 @@
+"""Throughput and peak memory of the `/api/v1/db` NDJSON export/import routes.
+
+Runs the routes under Granian (embedded) in a child process, pointed at the
+local Appwrite stand-in with `--latency-ms` per request. It first checks
+import validation and per-batch error reports. Then, for each collection
+size, it pipes an export of one collection straight into an import of
+another, checks that every document arrived, and reads the child's peak
+RSS (VmHWM). Neither direction holds a collection in memory: the run
+fails if the peak grows by more than `--budget-mb` between the smallest
+and largest collection. For comparison it also times the one-request-per-
+document copy the routes replace.
+
+Usage:
+    python -m scripts.benchmarks.db_transfer [--counts 10000 100000] [--latency-ms 5] [--budget-mb 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.server.utils.appwrite import AppwriteClient
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+from scripts.benchmarks.file_transfer import ROOT, _free_port, _peak_rss_mb
+
+TOKEN = "bench"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+CHILD = """
+import asyncio, sys
+from granian.constants import Interfaces
+from granian.server.embed import Server
+from starlette.applications import Starlette
+from app.server.api.routes.v1 import register_db_routes
+from app.server.utils import appwrite_lifespan
+
+api = Starlette()
+register_db_routes(api)
+
+async def serve():
+    async with appwrite_lifespan():
+        await Server(api, port=int(sys.argv[1]), interface=Interfaces.ASGI, log_enabled=False).serve()
+
+asyncio.run(serve())
+"""
+
+
+async def _import(client: httpx.AsyncClient, collection: str, body: bytes, mode: str = "create") -> dict:
+    response = await client.post(f"/api/v1/db/{collection}/import", params={"mode": mode}, content=body)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _check_reports(client: httpx.AsyncClient) -> None:
+    rows = [
+        json.dumps({"$id": "a1", "title": "one", "$createdAt": "2026-01-01T00:00:00.000+00:00"}),
+        "not json",
+        json.dumps({"$id": "a2", "title": "two"}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"$id": "bad id!", "title": "three"}),
+        "",
+        json.dumps({"$id": "a3", "title": "four"}),
+    ]
+    body = "\n".join(rows).encode()
+    report = await _import(client, "reports", body)
+    assert (report["received"], report["imported"], report["invalid"]) == (6, 3, 3), report
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5], report
+    report = await _import(client, "reports", body)
+    assert report["failed_batches"] == 1 and report["failed"] == 3, report
+    assert report["errors"][-1]["lines"] == [1, 7] and report["errors"][-1]["status"] == 409, report
+    report = await _import(client, "reports", body, mode="upsert")
+    assert report["imported"] == 3 and report["failed"] == 0, report
+    missing = await client.get("/api/v1/db/missing/export")
+    assert missing.status_code == 404, missing.text
+
+
+async def _copy(client: httpx.AsyncClient, source: str, target: str) -> dict:
+    """Pipe an export of `source` into an import of `target`."""
+    async with client.stream("GET", f"/api/v1/db/{source}/export") as export:
+        export.raise_for_status()
+        response = await client.post(f"/api/v1/db/{target}/import", content=export.aiter_raw())
+    response.raise_for_status()
+    return response.json()
+
+
+async def _one_at_a_time(endpoint: str, count: int) -> float:
+    """Documents per second copying with one sequential request per document."""
+    client = AppwriteClient(endpoint, "bench", "bench")
+    path = "/databases/bench/collections/{}/documents"
+    start = time.perf_counter()
+    try:
+        for i in range(count):
+            document = await client.get(path.format("src_baseline"), params={"queries[]": [
+                json.dumps({"method": "limit", "values": [1]}),
+                *([json.dumps({"method": "cursorAfter", "values": [f"doc{i - 1:09d}"]})] if i else []),
+            ]})
+            data = {k: v for k, v in document["documents"][0].items() if not k.startswith("$")}
+            await client.post(path.format("dst_baseline"), json={"documentId": f"doc{i:09d}", "data": data})
+    finally:
+        await client.aclose()
+    return count / (time.perf_counter() - start)
+
+
+async def main(counts: list[int], latency_ms: float, baseline: int, budget_mb: float) -> int:
+    async with AppwriteStub(latency=latency_ms / 1000) as stub:
+        written = stub.seed_documents({**{f"src{n}": n for n in counts}, "src_baseline": baseline})
+        port = _free_port()
+        env = {
+            **os.environ,
+            "APPWRITE_ENDPOINT": stub.endpoint,
+            "APPWRITE_PROJECT_ID": "bench",
+            "APPWRITE_API_KEY": "bench",
+            "APPWRITE_DATABASE_ID": "bench",
+            "ADMIN_API_TOKEN": TOKEN,
+            "SETTINGS_RELOAD_INTERVAL": "0",
+        }
+        server = subprocess.Popen([sys.executable, "-c", CHILD, str(port)], cwd=ROOT, env=env)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", headers=AUTH, timeout=600) as client:
+                for _ in range(100):
+                    try:
+                        await client.get("/api/v1/db/none/export")
+                        break
+                    except httpx.TransportError:
+                        await asyncio.sleep(0.1)
+                await _check_reports(client)
+                print("validation and per-batch error reports: OK")
+
+                print(f"{latency_ms:.0f} ms per Appwrite request")
+                print(f"{'documents':>10}  {'docs/s':>8}  {'peak RSS MB':>11}")
+                peaks = []
+                for count in counts:
+                    start = time.perf_counter()
+                    report = await _copy(client, f"src{count}", f"dst{count}")
+                    elapsed = time.perf_counter() - start
+                    arrived = written.get(f"dst{count}", {})
+                    if report["imported"] != count or len(arrived) != count:
+                        print(f"FAIL: copied {len(arrived)} of {count} documents: {report}")
+                        return 1
+                    peaks.append(_peak_rss_mb(server.pid))
+                    print(f"{count:>10}  {count / elapsed:>8,.0f}  {peaks[-1]:>11.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+        rate = await _one_at_a_time(stub.endpoint, baseline)
+        print(f"one request per document ({baseline} documents): {rate:,.0f} docs/s")
+
+    growth = peaks[-1] - peaks[0]
+    if growth > budget_mb:
+        print(f"FAIL: peak RSS grew {growth:.1f} MB from {counts[0]} to {counts[-1]} documents")
+        return 1
+    print(f"OK: peak RSS grew {growth:.1f} MB (budget {budget_mb:.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--baseline", type=int, default=500)
+    parser.add_argument("--budget-mb", type=float, default=32.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(sorted(args.counts), args.latency_ms, args.baseline, args.budget_mb)))
@@ -0,0 +1,182 @@
+"""Peak memory of the `/api/v1/files` proxy as file size grows.
+
+Runs the file routes under Granian (embedded) in a child process, pointed at the local
+Appwrite stand-in (which keeps only a hash of what it receives). For each
+size it uploads a file, downloads it back and checks both hashes, then reads
+the child's peak RSS (VmHWM). Streaming keeps the peak flat: the run fails
+if it grows by more than `--budget-mb` between the smallest and largest
+file. It also checks a resumed upload and a ranged download.
+
+Usage:
+    python -m scripts.benchmarks.file_transfer [--sizes-mb 16 64 256] [--budget-mb 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub, pattern_bytes
+
+ROOT = Path(__file__).resolve().parents[2]
+MB = 1024 * 1024
+CHUNK = 5 * MB
+SECRET = "bench-openssl-key"
+
+CHILD = """
+import asyncio, sys
+from granian.constants import Interfaces
+from granian.server.embed import Server
+from starlette.applications import Starlette
+from app.server.api.routes.v1 import register_file_routes
+from app.server.utils import appwrite_lifespan
+
+api = Starlette()
+register_file_routes(api)
+
+async def serve():
+    async with appwrite_lifespan():
+        await Server(api, port=int(sys.argv[1]), interface=Interfaces.ASGI, log_enabled=False).serve()
+
+asyncio.run(serve())
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not available (Linux only)")
+
+
+def _expected_sha256(start: int, length: int) -> str:
+    h = hashlib.sha256()
+    for piece in pattern_bytes(start, length):
+        h.update(piece)
+    return h.hexdigest()
+
+
+async def _body(start: int, length: int) -> AsyncIterator[bytes]:
+    for piece in pattern_bytes(start, length):
+        yield piece
+
+
+async def _upload(client: httpx.AsyncClient, size: int) -> dict:
+    response = await client.post(
+        "/api/v1/files", params={"name": f"{size}.bin"}, content=_body(0, size),
+        headers={"Content-Length": str(size)},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def _download_sha256(client: httpx.AsyncClient, file_id: str, range_header: str | None = None) -> str:
+    h = hashlib.sha256()
+    headers = {"Range": range_header} if range_header else {}
+    async with client.stream("GET", f"/api/v1/files/{file_id}/download", headers=headers) as response:
+        response.raise_for_status()
+        async for piece in response.aiter_raw():
+            h.update(piece)
+    return h.hexdigest()
+
+
+async def _check_resume_and_range(client: httpx.AsyncClient, files: dict) -> None:
+    size = 3 * CHUNK + 12345
+    first = 2 * CHUNK
+    response = await client.put(
+        "/api/v1/files/resumed", content=_body(0, first),
+        headers={"Content-Length": str(first), "Content-Range": f"bytes 0-{first - 1}/{size}"},
+    )
+    assert response.status_code == 200, response.text
+    offset = (await client.get("/api/v1/files/resumed")).json()["upload_offset"]
+    assert offset == first, offset
+    rest = size - offset
+    response = await client.put(
+        "/api/v1/files/resumed", content=_body(offset, rest),
+        headers={"Content-Length": str(rest), "Content-Range": f"bytes {offset}-{size - 1}/{size}"},
+    )
+    assert response.status_code == 201, response.text
+    assert files["resumed"]["sha256"] == _expected_sha256(0, size), "resumed upload corrupted"
+    ranged = await _download_sha256(client, "resumed", f"bytes={CHUNK - 7}-{CHUNK + 99}")
+    assert ranged == _expected_sha256(CHUNK - 7, 107), "range download mismatch"
+
+
+async def main(sizes_mb: list[int], budget_mb: float) -> int:
+    async with AppwriteStub() as stub:
+        files = stub.seed_storage()
+        token = stub.seed_sessions(SECRET)("bench-user", "bench-session")
+        port = _free_port()
+        env = {
+            **os.environ,
+            "APPWRITE_ENDPOINT": stub.endpoint,
+            "APPWRITE_PROJECT_ID": "bench",
+            "APPWRITE_STORAGE_ID": "bench",
+            "APPWRITE_JWT_SECRET": SECRET,
+            "SETTINGS_RELOAD_INTERVAL": "0",
+        }
+        proxy = subprocess.Popen([sys.executable, "-c", CHILD, str(port)], cwd=ROOT, env=env)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", headers={"X-Appwrite-JWT": token}, timeout=120
+            ) as client:
+                for _ in range(100):
+                    try:
+                        await client.get("/api/v1/files/none")
+                        break
+                    except httpx.TransportError:
+                        await asyncio.sleep(0.1)
+                await _check_resume_and_range(client, files)
+                print("resumed upload and range download: OK")
+
+                print(f"{'size MB':>8}  {'upload MB/s':>11}  {'download MB/s':>13}  {'peak RSS MB':>11}")
+                peaks = []
+                for size_mb in sizes_mb:
+                    size = size_mb * MB
+                    start = time.perf_counter()
+                    document = await _upload(client, size)
+                    uploaded = time.perf_counter()
+                    digest = await _download_sha256(client, document["$id"])
+                    downloaded = time.perf_counter()
+                    expected = _expected_sha256(0, size)
+                    if files[document["$id"]]["sha256"] != expected or digest != expected:
+                        print(f"FAIL: {size_mb} MB file corrupted in transit")
+                        return 1
+                    peaks.append(_peak_rss_mb(proxy.pid))
+                    print(
+                        f"{size_mb:>8}  {size_mb / (uploaded - start):>11.0f}  "
+                        f"{size_mb / (downloaded - uploaded):>13.0f}  {peaks[-1]:>11.1f}"
+                    )
+        finally:
+            proxy.terminate()
+            proxy.wait()
+
+    growth = peaks[-1] - peaks[0]
+    if growth > budget_mb:
+        print(f"FAIL: peak RSS grew {growth:.1f} MB from {sizes_mb[0]} MB to {sizes_mb[-1]} MB files")
+        return 1
+    print(f"OK: peak RSS grew {growth:.1f} MB (budget {budget_mb:.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--budget-mb", type=float, default=32.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(sorted(args.sizes_mb), args.budget_mb)))
@@ -0,0 +1,140 @@
+"""Cold start and warm executions through the Appwrite Functions adapter.
+
+Runs the adapter in a fresh process, the way a Function container does, and
+sends it `--executions` requests shaped like Appwrite Function contexts.
+The requests are `/api/health`, `/ping` and `/api/health/ready`; readiness
+is uncached, so every one of those calls Appwrite (the local stand-in). The
+run reports the cold start and warm latency percentiles. For comparison it
+also reports a handler that builds and starts the app for every execution.
+It fails if the app is built more than once or if warm executions open new
+Appwrite connections. It also fails if warm p99 exceeds `--budget-ms` or
+any response is not 200.
+
+Usage:
+    python -m scripts.benchmarks.function_adapter [--executions 500] [--budget-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+from scripts.benchmarks.file_transfer import ROOT
+
+PATHS = ("/api/health", "/ping", "/api/health/ready")
+
+CHILD = """
+import asyncio, json, sys, time
+from types import SimpleNamespace
+
+from app.server.functions import FunctionAdapter, build_app
+
+mode, executions = sys.argv[1], int(sys.argv[2])
+paths = json.loads(sys.argv[3])
+builds = 0
+
+
+def factory():
+    global builds
+    builds += 1
+    return build_app()
+
+
+class Response:
+    def binary(self, body, status, headers):
+        return {"status": status, "headers": headers, "body": body}
+
+
+def context(path):
+    req = SimpleNamespace(
+        method="GET", scheme="https", host="fn.example.com", port=443, path=path, query_string="",
+        headers={"host": "fn.example.com", "x-forwarded-for": "203.0.113.9"}, body_binary=b"",
+    )
+    return SimpleNamespace(req=req, res=Response(), log=lambda message: None)
+
+
+async def main():
+    adapter = FunctionAdapter(factory)
+    timings, statuses, starts = [], [], []
+    for i in range(executions):
+        if mode == "rebuild":
+            adapter.stop()
+            adapter = FunctionAdapter(factory)
+        begin = time.perf_counter()
+        result = await adapter.handle(context(paths[i % len(paths)]))
+        timings.append(time.perf_counter() - begin)
+        statuses.append(result["status"])
+        starts.append(result["headers"]["x-function-start"])
+    adapter.stop()
+    print(json.dumps({"timings": timings, "statuses": statuses, "starts": starts, "builds": builds}))
+
+
+asyncio.run(main())
+"""
+
+
+async def _run(stub: AppwriteStub, mode: str, executions: int) -> dict:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", CHILD, mode, str(executions), json.dumps(PATHS),
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "APPWRITE_ENDPOINT": stub.endpoint,
+            "APPWRITE_PROJECT_ID": "bench",
+            "READINESS_CACHE_TTL": "0",
+            "SETTINGS_RELOAD_INTERVAL": "0",
+        },
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"{mode} run exited with {process.returncode}")
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+async def main(executions: int, budget_ms: float) -> int:
+    async with AppwriteStub() as stub:
+        reused = await _run(stub, "reuse", executions)
+        warm_connections = stub.connections
+        rebuilt = await _run(stub, "rebuild", max(3, executions // 50))
+
+    cold = reused["timings"][0] * 1000
+    warm = [t * 1000 for t in reused["timings"][1:]]
+    p = statistics.quantiles(warm, n=100)
+    rebuild = statistics.median(t * 1000 for t in rebuilt["timings"][1:])
+    print(f"{executions} executions over {', '.join(PATHS)}")
+    print(f"cold start (import, build, lifespan, first request): {cold:.0f} ms")
+    print(f"warm: p50 {p[49]:.2f} ms, p99 {p[98]:.2f} ms")
+    print(f"rebuilding the app per execution: median {rebuild:.0f} ms (imports already loaded)")
+    print(f"Appwrite connections opened by the reused app: {warm_connections}")
+
+    failures = []
+    if reused["builds"] != 1:
+        failures.append(f"app built {reused['builds']} times")
+    if reused["starts"][0] != "cold" or set(reused["starts"][1:]) != {"warm"}:
+        failures.append(f"X-Function-Start was {reused['starts'][:3]}...")
+    if any(status != 200 for status in reused["statuses"]):
+        failures.append(f"statuses {sorted(set(reused['statuses']))}")
+    if warm_connections > 3:  # one per concurrent readiness probe at most
+        failures.append(f"{warm_connections} Appwrite connections for one warm container")
+    if p[98] > budget_ms:
+        failures.append(f"warm p99 {p[98]:.2f} ms over {budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("one build per container, warm pool, cold/warm reported: OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=500)
+    parser.add_argument("--budget-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.executions, args.budget_ms)))
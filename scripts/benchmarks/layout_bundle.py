@@ -0,0 +1,52 @@
+"""Compiled page size report for the shared layout.
+
+Compiles the app in-process (no `.web` writes) and reports, per page, the
+size of the emitted page module, raw and gzipped, along with the shared
+memo-components and stateful-components modules that every page imports.
+The JS bundler is not run; these are the sources it is fed, so duplication
+shows up here one-for-one.
+
+Usage:
+    python -m scripts.benchmarks.layout_bundle
+"""
+
+from __future__ import annotations
+
+import gzip
+import time
+
+from reflex.compiler import utils as compiler_utils
+
+from app.app import app
+from app.pages.compile_cache import compiled_sources
+
+
+def _sizes(code: str) -> tuple[int, int]:
+    data = code.encode()
+    return len(data), len(gzip.compress(data, 9))
+
+
+def main() -> None:
+    start = time.perf_counter()
+    sources = compiled_sources(app)
+    elapsed = time.perf_counter() - start
+
+    pages = {route: sources[compiler_utils.get_page_path(route)] for route in sorted(app._pages)}
+    shared = {
+        "memo components": sources[compiler_utils.get_components_path()],
+        "stateful components": sources[compiler_utils.get_stateful_components_path()],
+    }
+    print(f"{'module':<22}{'bytes':>10}{'gzip':>10}")
+    totals = [0, 0]
+    for name, code in [*pages.items(), *shared.items()]:
+        raw, gz = _sizes(code)
+        totals[0] += raw
+        totals[1] += gz
+        print(f"{name:<22}{raw:>10}{gz:>10}")
+    page_raw = sum(_sizes(code)[0] for code in pages.values())
+    print(f"{'total':<22}{totals[0]:>10}{totals[1]:>10}")
+    print(f"pages: {len(pages)}, mean page module {page_raw / len(pages):.0f} bytes, compile {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
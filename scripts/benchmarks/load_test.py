@@ -0,0 +1,384 @@
+"""Concurrent-session load test for websocket events and API routes.
+
+For each session count in `--sessions`, starts a fresh backend with
+`reflex run --backend-only --env prod` against the local Appwrite
+stand-in. It then opens that many sessions at once. Each session connects
+to the event websocket (Engine.IO/Socket.IO, as the browser does) and
+hydrates `/settings`, sending back the on-load events the server returns.
+It then does `--rounds` rounds of `SettingsState.toggle_email_alerts`,
+`GET /api/health` and `GET /api/health/ready` on its own keep-alive
+connection, pausing up to `--think-ms` before each round. Sidebar toggling is
+a client-side script now (`toggle_sidebar` sends nothing to the server), so
+it is not part of the load.
+
+Per session count, the run reports throughput, p50/p99 latency per
+operation, errors, and the backend's peak RSS, also per session above the
+idle baseline. It fails, for CI, if any count goes past the `load_test_*`
+thresholds in Settings; `--report` writes the numbers as JSON.
+
+Usage:
+    python -m scripts.benchmarks.load_test [--sessions 100,500,1000] [--rounds 5] [--think-ms 200] [--workers 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Ping, RejectConnection, Request, TextMessage
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+from scripts.benchmarks.file_transfer import ROOT, _free_port
+
+NAMESPACE = "/_event"
+TIMEOUT = 60.0
+HYDRATE = "reflex___state____state.hydrate"
+ROUTER_DATA = {"pathname": "/settings", "query": {}, "asPath": "/settings"}
+
+
+class LoadError(Exception):
+    """A session operation failed or timed out."""
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection, like a browser tab's."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str) -> None:
+        self.reader, self.writer, self.host = reader, writer, host
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> HttpConnection:
+        return cls(*await asyncio.open_connection(host, port), f"{host}:{port}")
+
+    async def get(self, path: str) -> int:
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+        headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if ": " in line)
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:  # chunked
+            while size := int((await self.reader.readuntil(b"\r\n")).strip(), 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readuntil(b"\r\n")
+        return int(head.split(" ", 2)[1])
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ReflexSession:
+    """A browser tab's event websocket: Socket.IO over Engine.IO over wsproto."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, token: str) -> None:
+        self.reader, self.writer, self.token = reader, writer, token
+        self.ws = WSConnection(ConnectionType.CLIENT)
+        self.connected = asyncio.Event()
+        self.updates: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self._text: list[str] = []
+        self._pump: asyncio.Task[None] | None = None
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> ReflexSession:
+        token = str(uuid.uuid4())
+        session = cls(*await asyncio.open_connection(host, port), token)
+        target = f"{NAMESPACE}/?EIO=4&transport=websocket&token={token}"
+        session.writer.write(session.ws.send(Request(host=f"{host}:{port}", target=target)))
+        session._pump = asyncio.create_task(session._read())
+        await asyncio.wait_for(session.connected.wait(), TIMEOUT)
+        return session
+
+    def _send(self, text: str) -> None:
+        self.writer.write(self.ws.send(TextMessage(data=text)))
+
+    async def _read(self) -> None:
+        try:
+            while data := await self.reader.read(65536):
+                self.ws.receive_data(data)
+                for event in self.ws.events():
+                    if isinstance(event, AcceptConnection):
+                        continue
+                    if isinstance(event, RejectConnection):
+                        raise LoadError(f"websocket rejected with HTTP {event.status_code}")
+                    if isinstance(event, Ping):
+                        self.writer.write(self.ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        return
+                    elif isinstance(event, TextMessage):
+                        self._text.append(event.data)
+                        if event.message_finished:
+                            self._packet("".join(self._text))
+                            self._text.clear()
+        finally:
+            self.updates.put_nowait(None)
+
+    def _packet(self, packet: str) -> None:
+        if packet[0] == "0":  # Engine.IO open: join the event namespace
+            self._send(f"40{NAMESPACE},")
+        elif packet == "2":  # Engine.IO ping
+            self._send("3")
+        elif packet.startswith(f"40{NAMESPACE},"):
+            self.connected.set()
+        elif packet.startswith(f"42{NAMESPACE},"):
+            name, *args = json.loads(packet[len(NAMESPACE) + 3 :])
+            if name == "event":
+                self.updates.put_nowait(args[0])
+            elif name == "reload":
+                raise LoadError("server asked the session to reload")
+
+    async def call(self, name: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        """Send one event and wait for its final update; returns events the server chained."""
+        event = {"name": name, "payload": payload, "router_data": ROUTER_DATA, "token": self.token}
+        self._send(f"42{NAMESPACE}," + json.dumps(["event", event]))
+        chained: list[dict[str, Any]] = []
+        async with asyncio.timeout(TIMEOUT):
+            while True:
+                update = await self.updates.get()
+                if update is None:
+                    raise LoadError("websocket closed")
+                chained += [e for e in update.get("events", []) if not e["name"].startswith("_")]
+                if update.get("final", True):
+                    return chained
+
+    async def close(self) -> None:
+        if self._pump is not None:
+            self._pump.cancel()
+        self.writer.close()
+
+
+def _process_tree(root: int) -> list[int]:
+    """`root` and all its live descendants (Linux)."""
+    children: dict[int, list[int]] = defaultdict(list)
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            ppid = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError):
+            continue
+        children[ppid].append(int(stat.parent.name))
+    tree, stack = [], [root]
+    while stack:
+        tree.append(pid := stack.pop())
+        stack.extend(children[pid])
+    return tree
+
+
+def _tree_rss_mb(root: int) -> float:
+    """Resident memory of `root` and all its descendants."""
+    total = 0
+    for pid in _process_tree(root):
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            continue
+        total += next((int(line.split()[1]) for line in status.splitlines() if line.startswith("VmRSS:")), 0)
+    return total / 1024
+
+
+async def _start_backend(stub: AppwriteStub, workers: int) -> tuple[subprocess.Popen, int]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "reflex", "run", "--backend-only", "--env", "prod", "--backend-port", str(port)],
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "APPWRITE_ENDPOINT": stub.endpoint,
+            "APPWRITE_PROJECT_ID": "bench",
+            "APPWRITE_DATABASE_ID": "bench",
+            "SETTINGS_RELOAD_INTERVAL": "0",
+            "GRANIAN_WORKERS": str(workers),
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    async with httpx.AsyncClient() as client:
+        deadline = time.monotonic() + 180
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"http://127.0.0.1:{port}/ping")).status_code == 200:
+                    return process, port
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None:
+                break
+            await asyncio.sleep(0.5)
+    _stop_backend(process)
+    raise RuntimeError("backend did not start")
+
+
+def _stop_backend(process: subprocess.Popen) -> None:
+    # Granian's workers can outlive `reflex run` and its process group, and
+    # may ignore SIGTERM, so signal the whole tree and escalate.
+    tree = _process_tree(process.pid)
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        for pid in tree:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, sig)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            process.poll()  # reap our own child
+            if not any(Path(f"/proc/{pid}").exists() for pid in tree):
+                return
+            time.sleep(0.1)
+
+
+async def _session(port: int, rounds: int, think: float, toggle: str, record) -> None:
+    session = http = None
+    try:
+        start = time.perf_counter()
+        session = await ReflexSession.connect("127.0.0.1", port)
+        http = await HttpConnection.open("127.0.0.1", port)
+        record("connect", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pending = await session.call(HYDRATE, {})
+        while pending:  # on-load handlers, sent back the way the frontend does
+            event = pending.pop(0)
+            pending += await session.call(event["name"], event.get("payload", {}))
+        record("hydrate", time.perf_counter() - start)
+
+        for n in range(rounds):
+            await asyncio.sleep(random.uniform(0, think))
+            start = time.perf_counter()
+            await session.call(toggle, {"value": n % 2 == 0})
+            record("event", time.perf_counter() - start)
+            for route, path in (("health", "/api/health"), ("ready", "/api/health/ready")):
+                start = time.perf_counter()
+                status = await asyncio.wait_for(http.get(path), TIMEOUT)
+                if status != 200:
+                    raise LoadError(f"{path} returned {status}")
+                record(route, time.perf_counter() - start)
+    except (LoadError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+        record("error", 0.0, detail=f"{type(e).__name__}: {e}")
+    finally:
+        if session is not None:
+            await session.close()
+        if http is not None:
+            http.close()
+
+
+async def _stage(stub: AppwriteStub, sessions: int, args: argparse.Namespace, toggle: str) -> dict[str, Any]:
+    process, port = await _start_backend(stub, args.workers)
+    try:
+        await asyncio.sleep(1.0)
+        idle = _tree_rss_mb(process.pid)
+        peak = idle
+        samples: dict[str, list[float]] = defaultdict(list)
+        errors: list[str] = []
+
+        def record(op: str, seconds: float, detail: str = "") -> None:
+            if op == "error":
+                errors.append(detail)
+            else:
+                samples[op].append(seconds * 1000)
+
+        async def sample_rss() -> None:
+            nonlocal peak
+            while True:
+                peak = max(peak, _tree_rss_mb(process.pid))
+                await asyncio.sleep(0.5)
+
+        sampler = asyncio.create_task(sample_rss())
+        start = time.perf_counter()
+        await asyncio.gather(*(_session(port, args.rounds, args.think_ms / 1000, toggle, record) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+        peak = max(peak, _tree_rss_mb(process.pid))
+    finally:
+        _stop_backend(process)
+
+    operations = sum(len(v) for v in samples.values())
+    latency = {
+        op: {"p50": statistics.median(v), "p99": statistics.quantiles(v, n=100)[98] if len(v) > 1 else v[0]}
+        for op, v in samples.items()
+    }
+    return {
+        "sessions": sessions,
+        "operations_per_s": operations / elapsed,
+        "latency_ms": latency,
+        "errors": len(errors),
+        "error_rate": len(errors) / sessions,
+        "first_errors": errors[:3],
+        "rss_idle_mb": idle,
+        "rss_peak_mb": peak,
+        "rss_per_session_kb": (peak - idle) * 1024 / sessions,
+    }
+
+
+def _failures(result: dict[str, Any], limits: dict[str, float]) -> list[str]:
+    n, latency, failures = result["sessions"], result["latency_ms"], []
+    for op in ("hydrate", "event"):
+        if op in latency and latency[op]["p99"] > limits["event_p99_ms"]:
+            failures.append(f"{n} sessions: {op} p99 {latency[op]['p99']:.0f} ms > {limits['event_p99_ms']:.0f} ms")
+    for op in ("health", "ready"):
+        if op in latency and latency[op]["p99"] > limits["http_p99_ms"]:
+            failures.append(f"{n} sessions: {op} p99 {latency[op]['p99']:.0f} ms > {limits['http_p99_ms']:.0f} ms")
+    if result["rss_per_session_kb"] > limits["rss_per_session_kb"]:
+        failures.append(f"{n} sessions: {result['rss_per_session_kb']:.0f} KB RSS per session")
+    if result["error_rate"] > limits["max_error_rate"]:
+        failures.append(f"{n} sessions: {result['errors']} failed sessions, e.g. {result['first_errors']}")
+    return failures
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.config import settings
+    from app.pages.settings.state import SettingsState
+
+    toggle = f"{SettingsState.get_full_name()}.toggle_email_alerts"
+    limits = {
+        "event_p99_ms": settings.load_test_event_p99_ms,
+        "http_p99_ms": settings.load_test_http_p99_ms,
+        "rss_per_session_kb": settings.load_test_rss_per_session_kb,
+        "max_error_rate": settings.load_test_max_error_rate,
+    }
+    results = []
+    async with AppwriteStub() as stub:
+        stub.seed_documents({settings.settings_collection_id: 0})
+        print(f"{args.rounds} rounds per session, think time up to {args.think_ms:.0f} ms, {args.workers} worker(s)")
+        print(
+            f"{'sessions':>8}{'ops/s':>9}{'hydrate p50/p99':>18}{'event p50/p99':>16}"
+            f"{'health p99':>12}{'ready p99':>11}{'RSS MB':>8}{'KB/sess':>9}{'errors':>8}"
+        )
+        for sessions in args.sessions:
+            result = await _stage(stub, sessions, args, toggle)
+            results.append(result)
+            lat = defaultdict(lambda: {"p50": float("nan"), "p99": float("nan")}, result["latency_ms"])
+            print(
+                f"{sessions:>8}{result['operations_per_s']:>9,.0f}"
+                f"{lat['hydrate']['p50']:>9.1f}/{lat['hydrate']['p99']:<8.1f}"
+                f"{lat['event']['p50']:>7.1f}/{lat['event']['p99']:<8.1f}"
+                f"{lat['health']['p99']:>12.1f}{lat['ready']['p99']:>11.1f}"
+                f"{result['rss_peak_mb']:>8.0f}{result['rss_per_session_kb']:>9.0f}{result['errors']:>8}"
+            )
+    if args.report:
+        Path(args.report).write_text(json.dumps({"limits": limits, "results": results}, indent=2))
+    failures = [failure for result in results for failure in _failures(result, limits)]
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("within load_test_* thresholds at every session count: OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=lambda s: [int(n) for n in s.split(",")], default=[100, 500, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--think-ms", type=float, default=200.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--report", help="write the results as JSON to this path")
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
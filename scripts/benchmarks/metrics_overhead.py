@@ -0,0 +1,58 @@
+"""Micro-benchmark for metrics recording cost.
+
+Measures one histogram observation, one counter increment, and the full
+per-call overhead the event-handler wrapper adds (in-flight gauge, latency
+histogram, call counter) against the unwrapped function.
+
+Usage:
+    python -m scripts.benchmarks.metrics_overhead [--calls 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from app.server.utils.metrics import MetricsRegistry, instrument_handler
+
+BUDGET_US = 1.0
+
+
+def _per_call_us(fn: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def main(calls: int) -> int:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_seconds", "bench", ("route",))
+    counter = registry.counter("bench_total", "bench", ("route", "status"))
+
+    baseline = _per_call_us(lambda: None, calls)
+    observe = _per_call_us(lambda: histogram.observe(0.0042, "/api/v1/tools/{name}"), calls) - baseline
+    inc = _per_call_us(lambda: counter.inc("/api/v1/tools/{name}", "200"), calls) - baseline
+
+    def handler(state: object) -> None:
+        return None
+
+    wrapped = instrument_handler(handler, "bench_state")
+    plain = _per_call_us(lambda: handler(None), calls)
+    overhead = _per_call_us(lambda: wrapped(None), calls) - plain
+
+    print(f"histogram.observe: {observe:.3f} us")
+    print(f"counter.inc:       {inc:.3f} us")
+    print(f"handler wrapper:   {overhead:.3f} us/call (3 observations)")
+
+    if max(observe, inc) > BUDGET_US:
+        print(f"FAIL: a single observation exceeds {BUDGET_US} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    raise SystemExit(main(parser.parse_args().calls))
@@ -0,0 +1,114 @@
+"""Database reads with and without the read-through query cache.
+
+`--sessions` concurrent sessions each handle `--events` events. Every
+event reads the same reference data the way a page state does: a list
+query, one document, and one document that does not exist. The reads go to
+the local Appwrite stand-in, which takes `--latency-ms` per request. The
+run reports event throughput, latency percentiles and upstream requests,
+uncached and through `query_cache`. It then checks that a write
+invalidation refetches exactly the affected reads, and that "not found" is
+cached.
+
+Usage:
+    python -m scripts.benchmarks.query_cache [--sessions 50] [--events 20] [--latency-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+COLLECTION = "reference"
+
+
+async def _run(sessions: int, events: int, event: Callable[[], Awaitable[None]]) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def session() -> None:
+        for _ in range(events):
+            start = time.perf_counter()
+            await event()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return sessions * events / (time.perf_counter() - start), latencies
+
+
+async def main(sessions: int, events: int, latency_ms: float) -> int:
+    async with AppwriteStub(latency=latency_ms / 1000) as stub:
+        stub.seed_documents({COLLECTION: 500})
+        os.environ.update(
+            APPWRITE_ENDPOINT=stub.endpoint,
+            APPWRITE_PROJECT_ID="bench",
+            APPWRITE_DATABASE_ID="bench",
+            SETTINGS_RELOAD_INTERVAL="0",
+        )
+        from app.server.utils import appwrite_lifespan, get_appwrite, queries
+        from app.server.utils.appwrite import AppwriteError
+        from app.server.utils.documents import documents_path, get_document, list_documents
+        from app.server.utils.query_cache import query_cache
+
+        path = documents_path(COLLECTION)
+
+        async def uncached() -> None:
+            client = get_appwrite()
+
+            async def document(document_id: str) -> None:
+                try:
+                    await client.get(f"{path}/{document_id}")
+                except AppwriteError as e:
+                    if e.status_code != 404:
+                        raise
+
+            await asyncio.gather(
+                client.get(path, params=queries.params(queries.limit(25))),
+                document("doc000000001"),
+                document("missing"),
+            )
+
+        async def cached() -> None:
+            await asyncio.gather(
+                list_documents(COLLECTION, queries.limit(25)),
+                get_document(COLLECTION, "doc000000001"),
+                get_document(COLLECTION, "missing"),
+            )
+
+        async with appwrite_lifespan():
+            print(f"{sessions} sessions x {events} events, {latency_ms:.0f} ms per Appwrite request")
+            print(f"{'mode':<10}{'events/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'upstream':>10}")
+            for label, event in (("uncached", uncached), ("cached", cached)):
+                before = stub.requests
+                rate, latencies = await _run(sessions, events, event)
+                p = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{label:<10}{rate:>10,.0f}{p[49] * 1000:>9.2f}{p[98] * 1000:>9.2f}"
+                    f"{stub.requests - before:>10}"
+                )
+            total = query_cache.hits + query_cache.misses
+            print(f"hit ratio: {query_cache.hits / total:.1%} ({query_cache.hits} hits, {query_cache.misses} misses)")
+
+            before = stub.requests
+            query_cache.invalidate(COLLECTION, "doc000000001")
+            await cached()
+            refetched = stub.requests - before
+            if refetched != 2:  # the document and the list; "missing" stays cached
+                print(f"FAIL: invalidating one document caused {refetched} upstream reads, expected 2")
+                return 1
+            print("invalidation and negative caching: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.sessions, args.events, args.latency_ms)))
@@ -0,0 +1,57 @@
+"""Micro-benchmark for `/api/health/ready` served from the readiness cache.
+
+Usage:
+    python -m scripts.benchmarks.readiness [--calls 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+from app.config import settings
+from app.server.api.health import readiness_cache, readiness_check
+from app.server.utils.appwrite import AppwriteClient, set_appwrite
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+BUDGET_MS = 1.0
+
+
+async def main(calls: int) -> int:
+    async with AppwriteStub(latency=0.02) as stub:
+        # Probes are skipped unless Appwrite is configured.
+        os.environ.update(APPWRITE_ENDPOINT=stub.endpoint, APPWRITE_PROJECT_ID="bench")
+        await settings.reload()
+        client = AppwriteClient(stub.endpoint, "bench")
+        set_appwrite(client)
+        readiness_cache.ttl = 60.0
+        readiness_cache.invalidate()
+
+        start = time.perf_counter()
+        response = await readiness_check(None)  # type: ignore[arg-type]
+        cold_ms = (time.perf_counter() - start) * 1000
+        print(f"cold (probes upstream): {cold_ms:.2f} ms -> {response.body.decode()}")
+
+        upstream_before = stub.requests
+        start = time.perf_counter()
+        for _ in range(calls):
+            await readiness_check(None)  # type: ignore[arg-type]
+        per_call_ms = (time.perf_counter() - start) * 1000 / calls
+        print(f"cached: {per_call_ms * 1000:.1f} us/call over {calls} calls, "
+              f"{stub.requests - upstream_before} upstream requests")
+
+        set_appwrite(None)
+        await client.aclose()
+
+    if per_call_ms > BUDGET_MS:
+        print(f"FAIL: cached readiness exceeds {BUDGET_MS} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    raise SystemExit(asyncio.run(main(parser.parse_args().calls)))
@@ -0,0 +1,136 @@
+"""Fan-out through the shared Appwrite Realtime bridge.
+
+Opens `--sessions` subscriptions, each to 1-3 of `--channels` collection
+channels, against the local Appwrite stand-in. Then it publishes `--events`
+events and measures, per delivery, the time from publish to the session
+reading it. It checks that every session got exactly the events on its
+channels over a single upstream socket, and that none are lost or repeated
+while a new channel forces a resubscribe. Finally it closes every session
+on the first half of the channels, then all of them, and checks that the
+upstream subscription shrinks to the channels still in use and then closes.
+
+Usage:
+    python -m scripts.benchmarks.realtime [--sessions 2000] [--channels 20] [--events 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+
+def _channel(i: int) -> str:
+    return f"databases.bench.collections.c{i}.documents"
+
+
+async def _until(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def main(sessions: int, channels: int, events: int) -> int:
+    rng = random.Random(0)
+    async with AppwriteStub() as stub:
+        os.environ.update(APPWRITE_ENDPOINT=stub.endpoint, APPWRITE_PROJECT_ID="bench", SETTINGS_RELOAD_INTERVAL="0")
+        from app.server.utils.realtime import realtime_bridge
+
+        realtime_bridge.resubscribe_delay = 0.05
+        async with realtime_bridge.lifespan():
+            subscriptions = [
+                realtime_bridge.subscribe(
+                    _channel(i) for i in rng.sample(range(channels), rng.randint(1, 3))
+                )
+                for _ in range(sessions)
+            ]
+            received = [0] * sessions
+            latencies: list[float] = []
+
+            async def consume(index: int) -> None:
+                subscription = subscriptions[index]
+                while True:
+                    batch = await subscription.next_batch(timeout=1.0)
+                    now = time.perf_counter()
+                    received[index] += len(batch)
+                    latencies.extend(now - event.payload["sent_at"] for event in batch)
+
+            consumers = [asyncio.create_task(consume(i)) for i in range(sessions)]
+            union = realtime_bridge.channels
+            if not await _until(lambda: stub.realtime_sockets == [union]):
+                print(f"FAIL: upstream sockets {stub.realtime_sockets}, wanted one on {len(union)} channels")
+                return 1
+
+            expected = [0] * sessions
+            start = time.perf_counter()
+            for n in range(events):
+                channel = _channel(rng.randrange(channels))
+                for i, subscription in enumerate(subscriptions):
+                    expected[i] += channel in subscription.channels
+                await stub.publish([channel], [f"{channel}.doc{n}.update"], {"$id": f"doc{n}", "sent_at": time.perf_counter()})
+                if n % 10 == 9:
+                    await asyncio.sleep(0)
+            delivered = sum(expected)
+            await _until(lambda: sum(received) >= delivered, timeout=30.0)
+            elapsed = time.perf_counter() - start
+            for task in consumers:
+                task.cancel()
+
+            p = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+            print(f"{sessions} sessions on {len(union)} channels, {events} events")
+            print(f"upstream sockets: {len(stub.realtime_sockets)} (opened {stub.realtime_connections} in total)")
+            print(f"deliveries: {sum(received):,} in {elapsed:.2f}s ({sum(received) / elapsed:,.0f}/s)")
+            print(f"publish -> session latency: p50 {p[49] * 1000:.2f} ms, p99 {p[98] * 1000:.2f} ms")
+            if received != expected:
+                wrong = sum(r != e for r, e in zip(received, expected))
+                print(f"FAIL: {wrong} sessions got the wrong number of events")
+                return 1
+
+            # A new channel forces a resubscribe; events keep flowing through it.
+            with realtime_bridge.subscribe([_channel(0)]) as watcher:
+                with realtime_bridge.subscribe([_channel(channels)]):
+                    sent, before = 0, stub.realtime_connections
+                    while sent < 100 or stub.realtime_sockets != [realtime_bridge.channels]:
+                        await stub.publish([_channel(0)], [f"{_channel(0)}.x{sent}.update"], {"$id": f"x{sent}"})
+                        sent += 1
+                        await asyncio.sleep(0.002)
+                    await asyncio.sleep(0.1)
+                    got = len(await watcher.next_batch(timeout=1.0))
+            if got != sent or stub.realtime_connections != before + 1:
+                print(f"FAIL: {got} of {sent} events arrived across a resubscribe")
+                return 1
+            print(f"resubscribe while publishing: {got} of {sent} events, none lost or repeated: OK")
+
+            leaving = {_channel(i) for i in range(channels // 2)}
+            for subscription in subscriptions:
+                if subscription.channels & leaving:
+                    subscription.close()
+            remaining = realtime_bridge.channels
+            if remaining & leaving or not await _until(lambda: stub.realtime_sockets == [remaining]):
+                print(f"FAIL: after sessions left, upstream is on {stub.realtime_sockets}")
+                return 1
+            print(f"sessions on the first {len(leaving)} channels closed: upstream now on {len(remaining)} channels")
+            for subscription in subscriptions:
+                subscription.close()
+            if not await _until(lambda: not stub.realtime_sockets):
+                print("FAIL: upstream socket still open with no sessions")
+                return 1
+            print("all sessions closed: upstream socket closed: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.sessions, args.channels, args.events)))
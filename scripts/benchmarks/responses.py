@@ -0,0 +1,218 @@
+"""Requests per second and allocation per request for the API response layer.
+
+Drives a Starlette app in-process over ASGI, so only routing, handler,
+body decoding and response encoding are measured. Each case is served two
+ways: Starlette's `JSONResponse` with `request.json()` and hand-written
+checks (the path before `app.server.api.responses`), and the app's current
+handlers. The cases are:
+
+- `/api/health`, a constant payload, now preencoded;
+- `/api/admin/sessions/revoke`, a small body validated into a model;
+- a `--documents`-long document list, now streamed in batches.
+
+Allocation is the tracemalloc peak above the starting level, averaged over
+requests. Old and new are timed in alternating rounds and the best rate
+of each is kept, which evens out warm-up and noise. The run fails if the
+new path serves fewer requests per second than the old one in any case, or
+if the streamed list peaks higher than the buffered one.
+
+Usage:
+    python -m scripts.benchmarks.responses [--requests 5000] [--documents 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Any
+
+from starlette import responses as starlette_responses
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+
+from app.server.api.health import health_check
+from app.server.api.responses import JSONListResponse
+from app.server.api.sessions import revoke_sessions
+from app.server.utils.auth import session_verifier
+
+REVOKE_BODY = b'{"user_id":"65f1c2a9e4b0c7d8a1f2"}'
+
+# Old and new are timed alternately this many times; the best of each counts.
+ROUNDS = 5
+
+
+def _documents(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "$id": f"doc{i:08d}",
+            "$createdAt": "2024-05-01T12:00:00.000+00:00",
+            "$permissions": ['read("any")'],
+            "title": f"Document {i}",
+            "tags": ["alpha", "beta"],
+            "score": i * 0.5,
+            "active": i % 2 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def _app(documents: list[dict[str, Any]]) -> Starlette:
+    async def old_health(_: Request) -> starlette_responses.Response:
+        return starlette_responses.JSONResponse({"status": "ok", "message": "API is running"})
+
+    async def old_revoke(request: Request) -> starlette_responses.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            return starlette_responses.JSONResponse({"error": "invalid JSON body"}, status_code=400)
+        if not isinstance(body, dict):
+            return starlette_responses.JSONResponse({"error": "expected a JSON object"}, status_code=400)
+        revokers = {
+            "token": session_verifier.revoke,
+            "session_id": session_verifier.revoke_session,
+            "user_id": session_verifier.revoke_user,
+        }
+        given = [k for k in revokers if k in body]
+        if len(given) != 1 or not isinstance(body[given[0]], str) or not body[given[0]]:
+            return starlette_responses.JSONResponse(
+                {"error": "give one of token, session_id or user_id"}, status_code=400
+            )
+        dropped = revokers[given[0]](body[given[0]])
+        return starlette_responses.JSONResponse({"revoked": given[0], "cached_tokens_dropped": dropped})
+
+    async def old_documents(_: Request) -> starlette_responses.Response:
+        return starlette_responses.JSONResponse({"total": len(documents), "documents": documents})
+
+    async def new_documents(_: Request) -> starlette_responses.Response:
+        return JSONListResponse(documents, field="documents", extra={"total": len(documents)})
+
+    return Starlette(
+        routes=[
+            Route("/old/health", old_health),
+            Route("/new/health", health_check),
+            Route("/old/revoke", old_revoke, methods=["POST"]),
+            # The admin guard is the same either way; measure the handler behind it.
+            Route("/new/revoke", revoke_sessions.__wrapped__, methods=["POST"]),
+            Route("/old/documents", old_documents),
+            Route("/new/documents", new_documents),
+        ]
+    )
+
+
+async def _request(app: Starlette, method: str, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    status, size = 0, 0
+    sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        else:
+            size += len(message.get("body", b""))  # a server writes each chunk out and drops it
+
+    await app(scope, receive, send)
+    if status != 200 or not size:
+        raise RuntimeError(f"{method} {path} returned {status} with {size} bytes")
+    return size
+
+
+async def _rate(app: Starlette, method: str, path: str, body: bytes, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _request(app, method, path, body)
+    return requests / (time.perf_counter() - start)
+
+
+async def _allocation(app: Starlette, method: str, path: str, body: bytes, requests: int) -> float:
+    """Mean tracemalloc peak, in bytes, above the level before each request."""
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(requests):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await _request(app, method, path, body)
+        peaks += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return peaks / requests
+
+
+async def _compare(app: Starlette, method: str, path: str, body: bytes, requests: int) -> dict[str, float]:
+    """Best requests/s of each path over alternating rounds, then allocation per request."""
+    paths = (f"/old/{path}", f"/new/{path}")
+    for each in paths:
+        await _rate(app, method, each, body, min(100, requests))
+    rates = {each: 0.0 for each in paths}
+    for round_ in range(ROUNDS):
+        for each in paths[:: 1 if round_ % 2 else -1]:
+            rates[each] = max(rates[each], await _rate(app, method, each, body, requests))
+    samples = max(10, requests // 20)
+    return {
+        "old_rate": rates[paths[0]],
+        "new_rate": rates[paths[1]],
+        "old_alloc": await _allocation(app, method, paths[0], body, samples),
+        "new_alloc": await _allocation(app, method, paths[1], body, samples),
+    }
+
+
+def _size(n: float) -> str:
+    return f"{n / 1024 / 1024:.1f} MB" if n >= 1024 * 1024 else f"{n / 1024:.1f} KB"
+
+
+async def main(requests: int, documents: int) -> int:
+    app = _app(_documents(documents))
+    cases = [
+        ("health", "GET", "health", b"", requests),
+        ("revoke body", "POST", "revoke", REVOKE_BODY, requests),
+        (f"{documents} documents", "GET", "documents", b"", max(10, requests // 500)),
+    ]
+    print(f"{'case':<18}{'old req/s':>11}{'new req/s':>11}{'speedup':>9}{'old alloc':>12}{'new alloc':>12}")
+    failures = []
+    for name, method, path, body, count in cases:
+        r = await _compare(app, method, path, body, count)
+        print(
+            f"{name:<18}{r['old_rate']:>11,.0f}{r['new_rate']:>11,.0f}{r['new_rate'] / r['old_rate']:>8.2f}x"
+            f"{_size(r['old_alloc']):>12}{_size(r['new_alloc']):>12}"
+        )
+        if r["new_rate"] < r["old_rate"]:
+            failures.append(f"{name}: {r['new_rate']:,.0f} req/s, down from {r['old_rate']:,.0f}")
+        if path == "documents" and r["new_alloc"] >= r["old_alloc"]:
+            failures.append(
+                f"{name}: streaming peaked at {_size(r['new_alloc'])}, buffered at {_size(r['old_alloc'])}"
+            )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("faster on every case, streamed list bounded: OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--documents", type=int, default=10_000)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.requests, args.documents)))
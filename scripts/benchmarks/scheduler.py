@@ -0,0 +1,168 @@
+"""Leader election for background jobs across worker processes.
+
+Starts `--workers` processes, each with its own scheduler on a shared
+`FileLease`, running one leader-only job every `--interval` seconds. Each
+run appends its worker's pid to a shared log. Halfway through, the leader is
+killed with SIGKILL. The run reports how many times the job ran, against
+the same workers without election, and how long the failover took. It fails
+if two workers ran the job in the same period, if the failover takes longer
+than `--lease-interval` plus one job interval (with slack), or if the cron
+schedules, timeouts and run metrics do not behave as expected.
+
+Usage:
+    python -m scripts.benchmarks.scheduler [--workers 4] [--seconds 6] [--interval 0.1] [--lease-interval 0.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SLACK = 0.5
+
+
+def _worker(directory: str, interval: float, lease_interval: float, leader_only: bool, ready) -> None:
+    from app.server.utils.scheduler import FileLease, Scheduler
+
+    log = Path(directory) / "runs.log"
+
+    async def tick() -> None:
+        fd = os.open(log, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, f"{os.getpid()} {time.time():.6f}\n".encode())
+        finally:
+            os.close(fd)
+
+    async def main() -> None:
+        scheduler = Scheduler(FileLease(Path(directory) / "leader.lock"), lease_interval=lease_interval)
+        scheduler.add("tick", tick, every=interval, leader_only=leader_only)
+        async with scheduler.lifespan():
+            ready.set()
+            await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _runs(directory: str) -> list[tuple[int, float]]:
+    lines = (Path(directory) / "runs.log").read_text().split()
+    return [(int(pid), float(at)) for pid, at in zip(lines[::2], lines[1::2])]
+
+
+def _cluster(workers: int, seconds: float, interval: float, lease_interval: float, leader_only: bool):
+    """Run the workers for `seconds`, killing the leader halfway if electing."""
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        events = [context.Event() for _ in range(workers)]
+        processes = [
+            context.Process(target=_worker, args=(directory, interval, lease_interval, leader_only, ready))
+            for ready in events
+        ]
+        for process in processes:
+            process.start()
+        for ready in events:
+            ready.wait(60)
+        started = time.time()
+        killed = None
+        time.sleep(seconds / 2)
+        if leader_only:
+            killed = int((Path(directory) / "leader.lock").read_text())
+            os.kill(killed, signal.SIGKILL)
+        time.sleep(seconds / 2)
+        for process in processes:
+            process.kill()
+            process.join()
+        return [run for run in _runs(directory) if run[1] >= started], killed
+
+
+def _check_cron() -> list[str]:
+    from app.server.utils.scheduler import CronSchedule
+
+    saturday = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    cases = {
+        "0 8 * * 1": datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc),
+        "*/15 * * * *": datetime(2026, 10, 17, 12, 15, tzinfo=timezone.utc),
+        "0 0 29 2 *": datetime(2028, 2, 29, 0, 0, tzinfo=timezone.utc),
+        "30 9 1 * 7": datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc),  # 1st of the month or a Sunday
+    }
+    return [
+        f"{expression!r} next {got}, expected {want}"
+        for expression, want in cases.items()
+        if (got := CronSchedule(expression).next_after(saturday)) != want
+    ]
+
+
+async def _check_outcomes() -> list[str]:
+    from app.server.utils.metrics import metrics
+    from app.server.utils.scheduler import FileLease, Scheduler
+
+    async def slow() -> None:
+        await asyncio.sleep(1)
+
+    async def broken() -> None:
+        raise RuntimeError("boom")
+
+    logging.getLogger("app.server.utils.scheduler").disabled = True  # the failures are on purpose
+    with tempfile.TemporaryDirectory() as directory:
+        scheduler = Scheduler(FileLease(Path(directory) / "leader.lock"))
+        results = [
+            await scheduler.run_job(scheduler.add("bench_slow", slow, every=60, timeout=0.05)),
+            await scheduler.run_job(scheduler.add("bench_broken", broken, every=60)),
+        ]
+    rendered = metrics.render()
+    problems = [] if results == ["timeout", "error"] else [f"outcomes {results}"]
+    for line in (
+        'scheduler_job_runs_total{job="bench_slow",result="timeout"} 1',
+        'scheduler_job_duration_seconds_count{job="bench_broken"} 1',
+    ):
+        if line not in rendered:
+            problems.append(f"missing metric {line}")
+    return problems
+
+
+def main(workers: int, seconds: float, interval: float, lease_interval: float) -> int:
+    expected = seconds / interval
+    print(f"{workers} workers, one job every {interval}s for {seconds}s (~{expected:.0f} periods)")
+    unelected, _ = _cluster(workers, seconds, interval, lease_interval, leader_only=False)
+    runs, killed = _cluster(workers, seconds, interval, lease_interval, leader_only=True)
+    print(f"job runs without election: {len(unelected)} ({len(unelected) / expected:.1f} per period)")
+    print(f"job runs with a leader:    {len(runs)} ({len(runs) / expected:.1f} per period)")
+
+    failures = []
+    order = [pid for pid, _ in sorted(runs, key=lambda run: run[1])]
+    leaders = [pid for i, pid in enumerate(order) if i == 0 or pid != order[i - 1]]
+    if len(leaders) != 2 or leaders[0] != killed:
+        failures.append(f"leaders in order {leaders}, killed {killed}")
+    else:
+        last_old = max(at for pid, at in runs if pid == leaders[0])
+        first_new = min(at for pid, at in runs if pid == leaders[1])
+        gap = first_new - last_old
+        print(f"leader killed: pid {leaders[1]} took over after {gap:.2f}s")
+        if gap > lease_interval + interval + SLACK:
+            failures.append(f"failover took {gap:.2f}s")
+    if len(runs) > expected * 1.2:
+        failures.append(f"{len(runs)} runs for {expected:.0f} periods")
+    failures += _check_cron()
+    failures += asyncio.run(_check_outcomes())
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("one leader at a time, failover, cron schedules, timeouts and metrics: OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--lease-interval", type=float, default=0.5)
+    args = parser.parse_args()
+    raise SystemExit(main(args.workers, args.seconds, args.interval, args.lease_interval))
@@ -0,0 +1,105 @@
+"""Session checks through the JWT verification cache.
+
+Issues `--sessions` Appwrite-style JWTs and checks each one `--checks`
+times, the way an event handler would on every click. It runs once with
+upstream verification (`GET /account` on the local Appwrite stand-in, which
+takes `--latency-ms` per request) and once with the signing secret for
+local verification. The run reports the cost of a first check and of a
+cached one, plus upstream calls. It fails if a cached check is slower than
+`--budget-us`, if a token costs more than one upstream call (even with
+concurrent first checks), or if a revoked, expired or tampered token gets
+through.
+
+Usage:
+    python -m scripts.benchmarks.session_auth [--sessions 1000] [--checks 100] [--latency-ms 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from scripts.benchmarks.appwrite_stub import AppwriteStub
+
+SECRET = "bench-openssl-key"
+BURST = 50
+
+
+async def main(sessions: int, checks: int, latency_ms: float, budget_us: float) -> int:
+    async with AppwriteStub(latency=latency_ms / 1000) as stub:
+        issue = stub.seed_sessions(SECRET)
+        os.environ.update(APPWRITE_ENDPOINT=stub.endpoint, APPWRITE_PROJECT_ID="bench", SETTINGS_RELOAD_INTERVAL="0")
+        from app.server.utils import appwrite_lifespan
+        from app.server.utils.auth import AuthError, SessionVerifier
+
+        tokens = [issue(f"user{i % 100}", f"session{i}", 900.0) for i in range(sessions)]
+
+        async def rejects(verifier: SessionVerifier, token: str) -> bool:
+            try:
+                await verifier.verify(token)
+            except AuthError:
+                return True
+            return False
+
+        async with appwrite_lifespan():
+            print(f"{sessions} sessions x {checks} checks, {latency_ms:.0f} ms per Appwrite request")
+            print(f"{'mode':<10}{'first ms':>10}{'cached us':>11}{'p99 us':>9}{'upstream':>10}")
+            for label, secret in (("upstream", None), ("local", SECRET)):
+                verifier = SessionVerifier(secret, max_entries=sessions)
+                before = stub.account_checks
+                start = time.perf_counter()
+                # Sessions arrive in bursts, each checking twice at once: concurrent
+                # misses must share one call.
+                for i in range(0, sessions, BURST):
+                    burst = tokens[i : i + BURST]
+                    await asyncio.gather(*(verifier.verify(t) for t in burst + burst))
+                first = (time.perf_counter() - start) * 1000
+                upstream = stub.account_checks - before
+
+                samples: list[float] = []
+                for token in tokens:
+                    start = time.perf_counter()
+                    for _ in range(checks):
+                        await verifier.verify(token)
+                    samples.append((time.perf_counter() - start) / checks * 1e6)
+                p = statistics.quantiles(samples, n=100)
+                print(f"{label:<10}{first:>10.1f}{p[49]:>11.2f}{p[98]:>9.2f}{upstream:>10}")
+                if p[49] > budget_us:
+                    print(f"FAIL: cached check took {p[49]:.2f} us, budget {budget_us:.0f} us")
+                    return 1
+                if upstream != (sessions if secret is None else 0):
+                    print(f"FAIL: {upstream} upstream calls for {sessions} tokens")
+                    return 1
+
+                checked = stub.account_checks
+                verifier.revoke_session("session0")
+                verifier.revoke_user("user1")
+                header, claims, signature = tokens[2].split(".")
+                bad = [
+                    tokens[0],
+                    tokens[1],
+                    issue("user2", "session-old", -60.0),
+                    f"{header}.{claims}.{signature[::-1]}",
+                    f"{header}.{claims[:-4]}AAAA.{signature}",
+                ]
+                if secret is None:
+                    bad = bad[:3]  # a tampered token is the stand-in's to reject
+                results = [await rejects(verifier, token) for token in bad]
+                if not all(results) or await rejects(verifier, tokens[2]) or stub.account_checks != checked:
+                    print(f"FAIL: revoked/expired/tampered tokens rejected: {results}")
+                    return 1
+            print("single upstream call per token, revocation, expiry and signature checks: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.sessions, args.checks, args.latency_ms, args.budget_us)))
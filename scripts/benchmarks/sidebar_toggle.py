@@ -0,0 +1,127 @@
+"""Compare server-side vs client-side sidebar toggling across many sessions.
+
+"Before" replays the old `BaseState.toggle_sidebar` event through Reflex's
+event pipeline (state lock, handler, delta) for every simulated session.
+That is server time only; a browser would add a websocket round trip.
+
+"After" is the client-side preference: the toggle is a `_call_script`
+frontend event, so the backend sees nothing. Its compiled script is timed
+in Node, `eval`ed as Reflex's frontend runs it, against a minimal
+`document`/`localStorage` stand-in. That covers the handler itself, not
+React's re-render or the browser's restyle and paint. Without `node` on
+PATH only the server side is measured.
+
+Usage:
+    python -m scripts.benchmarks.sidebar_toggle [--sessions 1000] [--toggles 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import shutil
+import statistics
+import subprocess
+import time
+import uuid
+
+import reflex as rx
+from reflex.app import process
+from reflex.event import Event, get_hydrate_event
+
+from app.app import app
+from app.components.shared import toggle_sidebar
+from app.states.base import BaseState
+
+
+CLIENT_BENCH = """
+const code = %s, toggles = %d;
+const stored = new Map();
+globalThis.document = {documentElement: {dataset: {sidebar: "expanded"}}};
+globalThis.localStorage = {setItem: (k, v) => stored.set(k, String(v)), getItem: (k) => stored.get(k) ?? null};
+for (let i = 0; i < 1000; i++) eval(code);  // warm up the JIT
+const times = [];
+for (let i = 0; i < toggles; i++) {
+  const start = process.hrtime.bigint();
+  eval(code);
+  times.push(Number(process.hrtime.bigint() - start) / 1e6);
+}
+console.log(JSON.stringify({times, sidebar: document.documentElement.dataset.sidebar, stored: [...stored]}));
+"""
+
+
+class LegacySidebarState(BaseState):
+    """The pre-change server-side sidebar flag, kept here for comparison."""
+
+    sidebar_collapsed: bool = False
+
+    @rx.event
+    def toggle_sidebar(self):
+        self.sidebar_collapsed = not self.sidebar_collapsed
+
+
+async def _session(toggles: int, latencies: list[float]) -> int:
+    token = str(uuid.uuid4())
+    router_data = {"pathname": "/dashboard", "query": {}, "asPath": "/dashboard"}
+    events = 0
+    hydrate = Event(token, get_hydrate_event(app._state), dict(router_data))
+    async for _ in process(app, hydrate, token, {}, "127.0.0.1"):
+        pass
+    handler = f"{LegacySidebarState.get_full_name()}.toggle_sidebar"
+    for _ in range(toggles):
+        start = time.perf_counter()
+        async for _ in process(app, Event(token, handler, dict(router_data)), token, {}, "127.0.0.1"):
+            pass
+        latencies.append(time.perf_counter() - start)
+        events += 1
+    return events
+
+
+def _client_latencies(toggles: int) -> list[float] | None:
+    """Per-toggle milliseconds of the compiled `toggle_sidebar` script, or None without Node."""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    code = dict((str(name), value) for name, value in toggle_sidebar().args)["javascript_code"]
+    out = subprocess.run([node, "-e", CLIENT_BENCH % (code, toggles)], capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout)
+    expected = "expanded" if toggles % 2 == 0 else "collapsed"
+    if result["sidebar"] != expected or ["ui.sidebar", expected] not in result["stored"]:
+        raise RuntimeError(f"toggle script left sidebar={result['sidebar']!r}, stored={result['stored']}")
+    return sorted(result["times"])
+
+
+def _percentiles(latencies: list[float], scale: float) -> str:
+    return (
+        f"p50={statistics.median(latencies) * scale:.4f} ms "
+        f"p99={latencies[max(int(len(latencies) * 0.99) - 1, 0)] * scale:.4f} ms"
+    )
+
+
+async def main(sessions: int, toggles: int) -> None:
+    app._enable_state()
+    latencies: list[float] = []
+    start = time.perf_counter()
+    events = sum(await asyncio.gather(*(_session(toggles, latencies) for _ in range(sessions))))
+    wall = time.perf_counter() - start
+    latencies.sort()
+
+    client = _client_latencies(sessions * toggles)
+    print(f"sessions={sessions} toggles/session={toggles}")
+    print(
+        f"before: {events} backend events, {_percentiles(latencies, 1000)} "
+        f"(server time, excludes network RTT), wall={wall:.2f}s"
+    )
+    if client is None:
+        print("after:  0 backend events; client script not timed (node not found)")
+    else:
+        print(f"after:  0 backend events, {_percentiles(client, 1)} (compiled script in Node, excludes re-render)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--toggles", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.toggles))
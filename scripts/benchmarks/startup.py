@@ -0,0 +1,102 @@
+"""Cold-start benchmark for importing the app and running `create_app`.
+
+Each run is a fresh interpreter with `-X importtime`. It reports total import
+time (sum of every module's self time), the heaviest top-level packages,
+wall time to import `app.app` (which builds the app), and wall time for one
+more `create_app()` call with imports warm. Exits non-zero if the median
+cold import exceeds `Settings.startup_budget_ms` (or `--budget-ms`).
+
+Usage:
+    python -m scripts.benchmarks.startup [--runs 5] [--budget-ms 4000] [--top 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import app.app
+imported = time.perf_counter()
+app.app.create_app()
+rebuilt = time.perf_counter()
+from app.config import settings
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (rebuilt - imported) * 1000,
+    "budget_ms": settings.startup_budget_ms,
+    "page_modules": sorted(m for m in __import__("sys").modules if m.startswith("app.pages.")),
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> tuple[float, Counter[str]]:
+    """Total self time (ms) and self time per top-level package."""
+    total = 0.0
+    per_package: Counter[str] = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        total += int(self_us) / 1000
+        per_package[name.split(".")[0]] += int(self_us) / 1000
+    return total, per_package
+
+
+def _run() -> tuple[dict, float, Counter[str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    total, per_package = _parse_importtime(proc.stderr)
+    return result, total, per_package
+
+
+def main(runs: int, budget_ms: float | None, top: int) -> int:
+    results, totals, packages = [], [], Counter()
+    for _ in range(runs):
+        result, total, per_package = _run()
+        results.append(result)
+        totals.append(total)
+        packages.update(per_package)
+
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    create_ms = statistics.median(r["create_app_ms"] for r in results)
+    budget = budget_ms if budget_ms is not None else results[0]["budget_ms"]
+
+    print(f"runs={runs} (medians)")
+    print(f"importtime total (self): {statistics.median(totals):.0f} ms")
+    print(f"import app.app (cold, includes create_app): {import_ms:.0f} ms")
+    print(f"create_app() (warm imports): {create_ms:.1f} ms")
+    print(f"page modules imported at startup: {results[0]['page_modules'] or 'none'}")
+    print(f"top {top} packages by import self time:")
+    for name, ms in packages.most_common(top):
+        print(f"  {name:<24} {ms / runs:8.1f} ms")
+
+    if import_ms > budget:
+        print(f"FAIL: cold start {import_ms:.0f} ms exceeds budget {budget:.0f} ms")
+        return 1
+    print(f"OK: within {budget:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    raise SystemExit(main(args.runs, args.budget_ms, args.top))
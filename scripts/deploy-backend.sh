@@ -11,6 +11,7 @@ print_header "Deploying Backend to Appwrite Functions"
 check_env_var "APPWRITE_ENDPOINT"
 check_env_var "APPWRITE_PROJECT_ID"
 check_env_var "APPWRITE_FUNCTION_ID"
+check_command "uv" "curl -LsSf https://astral.sh/uv/install.sh | sh"
 
 # Create deployment package
 print_step "Preparing backend for deployment..."
@@ -20,20 +21,22 @@ DEPLOY_DIR=$(mktemp -d)
 print_info "Using temporary directory: $DEPLOY_DIR"
 
 # Copy backend files
-cp -r backend/* "$DEPLOY_DIR/"
-cp requirements.txt "$DEPLOY_DIR/"
+cp -r app "$DEPLOY_DIR/"
+find "$DEPLOY_DIR/app" -name "__pycache__" -type d -prune -exec rm -rf {} +
+# Pinned runtime dependencies from uv.lock (the function build pip-installs these)
+uv export --frozen --no-hashes --no-dev --no-emit-project > "$DEPLOY_DIR/requirements.txt"
 cp rxconfig.py "$DEPLOY_DIR/" 2>/dev/null || true
 
-# Create function entry point
+# Create function entry point. The app is built on the first execution and
+# reused by every later one in the same container (app/server/functions).
 cat > "$DEPLOY_DIR/main.py" << 'EOF'
-"""Appwrite Function entry point for Reflex backend."""
-import os
-from reflex.app import app
-
-def main(req, res):
-    """Appwrite Function handler."""
-    # Reflex app is available as 'app'
-    return res.json({"status": "healthy"})
+"""Appwrite Function entry point for the Reflex backend."""
+from app.server.functions import function_adapter
+
+
+async def main(context):
+    """Serve one execution through the app, built once per container."""
+    return await function_adapter.handle(context)
 EOF
 
 print_success "Backend package prepared"
@@ -12,17 +12,24 @@ check_env_var "APPWRITE_ENDPOINT"
 check_env_var "APPWRITE_PROJECT_ID"
 check_env_var "APPWRITE_WEBSITE_ID"
 
-# Build frontend
-print_step "Building Reflex frontend..."
-reflex export --frontend-only
-
-if [ ! -d ".web/_static" ]; then
-    print_error "Build failed: .web/_static directory not found"
-    exit 1
+# Build frontend (skipped when no generated source or build input changed
+# since the last successful build; see app/pages/compile_cache.py)
+print_step "Checking compile cache..."
+if python -m app.pages.compile_cache check; then
+    print_info "Frontend unchanged; reusing existing .web/_static"
+else
+    print_step "Building Reflex frontend..."
+    reflex export --frontend-only
+
+    if [ ! -d ".web/_static" ]; then
+        print_error "Build failed: .web/_static directory not found"
+        exit 1
+    fi
+
+    python -m app.pages.compile_cache record
+    print_success "Frontend built successfully"
 fi
 
-print_success "Frontend built successfully"
-
 # Deploy to Appwrite Sites
 print_step "Deploying to Appwrite Sites..."
 